@@ -1,4 +1,5 @@
 from modules.interfaceCamera.interfaceCamera import InterfaceCamera
 
 interfaceCamera : InterfaceCamera = InterfaceCamera()
+interfaceCamera.registerTraceSignal()
 interfaceCamera.captureVideos()
\ No newline at end of file
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 
 from modules.bash.bash import Bash
 from modules.interfaceCamera.interfaceCamera import InterfaceCamera
+from modules.interfaceDatabase.asyncInterfaceDatabase import AsyncInterfaceDatabase
 from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
 from modules.predictor.predictor import Predictor
 
@@ -9,8 +10,16 @@ from modules.predictor.predictor import Predictor
 interfaceCamera : InterfaceCamera = InterfaceCamera()
 bash : Bash = Bash()
 interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+asyncInterfaceDatabase : AsyncInterfaceDatabase = AsyncInterfaceDatabase()
 app = FastAPI()
 
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Method to close the connections of the database
+    """
+    await asyncInterfaceDatabase.close()
+
 @app.post("/cameraCapture/{status}")
 def cameraCapture(status : str):
     """
@@ -21,6 +30,13 @@ def cameraCapture(status : str):
     elif status == "stop":
         bash.stopBashScript("camera")
 
+@app.get("/cameraCapture/health")
+def cameraCaptureHealth() -> dict:
+    """
+    Method to get the last health reported by every camera
+    """
+    return interfaceCamera.getCamerasHealth()
+
 @app.post("/reset")
 def reset():
     """
@@ -28,6 +44,7 @@ def reset():
     """
     bash.stopBashScript("camera")
     bash.stopBashScript("predictor")
+    bash.stopBashScript("retention")
     bash.deleteCameraImages()
     interfaceDatabase.resetDatabase()
     interfaceDatabase.writeParams({})
@@ -40,4 +57,44 @@ def predictor(status : str):
     if status == "start":
         bash.startPredictorScript()
     elif status == "stop":
-        bash.stopBashScript("predictor")
\ No newline at end of file
+        bash.stopBashScript("predictor")
+
+@app.post("/retention/{status}")
+def retention(status : str):
+    """
+    Method to delete periodically the frames older than their time to live
+    """
+    if status == "start":
+        bash.startRetentionScript()
+    elif status == "stop":
+        bash.stopBashScript("retention")
+
+@app.get("/cameras")
+async def cameras() -> list:
+    """
+    Method to get the cameras with frames stored
+    """
+    return await asyncInterfaceDatabase.getCameras()
+
+@app.get("/progress")
+async def progress() -> dict:
+    """
+    Method to get the first frame not yet person detected
+    """
+    return {
+        "personDetectionWatermark" : await asyncInterfaceDatabase.getPersonDetectionWatermark(),
+    }
+
+@app.get("/persons/active")
+async def activePersons() -> list:
+    """
+    Method to get the state of the active persons
+    """
+    return await asyncInterfaceDatabase.getActivePersonsState()
+
+@app.get("/persons/{personId}/coordinates")
+async def personCoordinates(personId : int) -> list:
+    """
+    Method to get the boxes of a person
+    """
+    return await asyncInterfaceDatabase.getCoordinatesByPersonId(personId)
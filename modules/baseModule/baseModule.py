@@ -31,14 +31,21 @@ class BaseModule(object):
             "tmp" : os.path.join(rootPath, "data", "tmp"),
             "logs" : os.path.join(rootPath, "data", "logs"),
             "params" : os.path.join(rootPath, "data", "params"),
+            "database" : os.path.join(rootPath, "data", "database"),
+            "frameNotifier" : os.path.join(rootPath, "data", "tmp", "frameNotifier"),
         }
 
         files = {
             "systemLog" : os.path.join(rootPath, "data", "logs", "log.txt"),
             "databaseParams" : os.path.join(rootPath, "data", "params", "params.yaml"),
             "yoloWeights" : os.path.join(rootPath, "data", "params", self.__config["yolo"]["checkpoint"] + ".pt"),
+            "yoloOnnx" : os.path.join(rootPath, "data", "params", self.__config["yolo"]["checkpoint"] + ".onnx"),
+            "sqliteDatabase" : os.path.join(rootPath, "data", "database", self.__config["database"]["database"] + ".db"),
+            "camerasHealth" : os.path.join(rootPath, "data", "logs", "camerasHealth.yaml"),
+            "quantizationReport" : os.path.join(rootPath, "data", "logs", "quantizationReport.yaml"),
             "predictorScript" : os.path.join(rootPath, "predictorScript.py"),
             "cameraScript" : os.path.join(rootPath, "cameraScript.py"),
+            "retentionScript" : os.path.join(rootPath, "retentionScript.py"),
         }
 
         return {
@@ -9,17 +9,20 @@ class Bash(BaseModule):
     def __init__(self):
         super().__init__()
         self.__processes : dict = {
-            "camera" : None,
-            "predictor" : None,
+            "camera" : list(),
+            "predictor" : list(),
+            "retention" : list(),
         }
 
         self.__executable : str = self.getConfig()["bash"]["executable"]
+        self.__workersConfig : dict = self.getConfig()["prediction"]["workers"]
 
         self.__paths : dict = self.getPaths()
 
         self.__scripts : dict = {
             "camera" : self.__paths["files"]["cameraScript"],
             "predictor" : self.__paths["files"]["predictorScript"],
+            "retention" : self.__paths["files"]["retentionScript"],
         }
 
     def deleteCameraImages(self):
@@ -39,15 +42,18 @@ class Bash(BaseModule):
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
                 self.writeLog("Process could not be killed: " + str(e), "WARNING")
 
-    def startBashScript(self, executable : str, process : str):
+    def startBashScript(self, executable : str, process : str, argumentsList : list = None):
         """
-        Method to start bash script
+        Method to start bash script, one process per arguments of argumentsList
         """
         if process is not None:
             self.stopBashScript(process)
-        command : str = executable + " " + self.__scripts[process] + " &"
+        if argumentsList is None:
+            argumentsList = [""]
 
-        self.__processes[process] = subprocess.Popen(command, shell=True)
+        for arguments in argumentsList:
+            command : str = executable + " " + self.__scripts[process] + " " + arguments + " &"
+            self.__processes[process].append(subprocess.Popen(command, shell=True))
 
     def stopBashScript(self, processName : str):
         """
@@ -55,16 +61,21 @@ class Bash(BaseModule):
         """
         if self.__processes[processName]:
             self.__killProcessByScript(self.__scripts[processName])
-            self.__processes[processName].kill()
-            self.__processes[processName].wait()
-            self.__processes[processName] = None
+            for process in self.__processes[processName]:
+                process.kill()
+                process.wait()
+            self.__processes[processName] = list()
 
     def startPredictorScript(self):
         """
-        Start predictor script
+        Start predictor script, with prediction.workers.enabled several person detection processes
+        and one action prediction process
         """
         executable : str = self.__executable
-        self.startBashScript(executable, "predictor")
+        argumentsList : list = None
+        if self.__workersConfig["enabled"]:
+            argumentsList = ["detector"] * self.__workersConfig["detectors"] + ["association"]
+        self.startBashScript(executable, "predictor", argumentsList)
 
     def startCameraScript(self):
         """
@@ -74,6 +85,13 @@ class Bash(BaseModule):
         executable : str = self.__executable
         self.startBashScript(executable, "camera")
 
+    def startRetentionScript(self):
+        """
+        Start retention script
+        """
+        executable : str = self.__executable
+        self.startBashScript(executable, "retention")
+
     def executeBashCommand(self, command : str):
         """
         Method to execute bash command
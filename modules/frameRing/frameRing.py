@@ -0,0 +1,168 @@
+import threading
+import cv2
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+class FrameRing(object):
+    """
+    Class to share the raw frames of the cameras with the predictor through a ring of slots in shared memory,
+    the slot of a frame is its frame id modulo the number of slots, every slot is protected by a sequence
+    lock, the writer makes the sequence odd while it writes and even again when it finishes, a reader copies
+    the frame and only accepts it if the sequence was even and did not change, so a frame overwritten while
+    it is read is never returned, a frame not in the ring has to be read from disk
+    """
+    __headerSize : int = 64
+
+    def __init__(self, name : str, numberSlots : int, maxWidth : int, maxHeight : int):
+        self.__name : str = name
+        self.__numberSlots : int = numberSlots
+        self.__frameBytes : int = maxWidth * maxHeight * 3
+        self.__slotBytes : int = FrameRing.__headerSize + self.__frameBytes
+        self.__sharedMemory : shared_memory.SharedMemory = None
+        self.__writeLock : threading.Lock = threading.Lock()
+        self.__stats : dict = {
+            "hits" : 0,
+            "misses" : 0,
+        }
+
+    def __untrack(self):
+        """
+        Tool to keep the shared memory when the process exits, the resource tracker would remove it with the
+        first process which used it, while the other processes still use it
+        """
+        resource_tracker.unregister(self.__sharedMemory._name, "shared_memory")
+
+    def __unlinkSharedMemory(self):
+        """
+        Tool to remove the shared memory, unlink also removes it from the resource tracker so it is tracked again
+        """
+        resource_tracker.register(self.__sharedMemory._name, "shared_memory")
+        self.__sharedMemory.unlink()
+
+    def __getRingHeader(self) -> np.ndarray:
+        """
+        Tool to get the header of the ring, number of slots and bytes per slot
+        """
+        return np.ndarray((2,), dtype=np.int64, buffer=self.__sharedMemory.buf)
+
+    def __getSlotHeader(self, slot : int) -> np.ndarray:
+        """
+        Tool to get the header of a slot, sequence, frame id, height and width
+        """
+        return np.ndarray((4,), dtype=np.int64, buffer=self.__sharedMemory.buf, offset=FrameRing.__headerSize + slot * self.__slotBytes)
+
+    def __getSlotFrame(self, slot : int, height : int, width : int) -> np.ndarray:
+        """
+        Tool to get a view of the pixels of a slot
+        """
+        return np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.__sharedMemory.buf, offset=FrameRing.__headerSize * 2 + slot * self.__slotBytes)
+
+    def create(self):
+        """
+        Method to create the ring or reuse the ring of a previous run with the same size, the frames of a
+        previous run are removed since the frame ids may have been reset
+        """
+        size : int = FrameRing.__headerSize + self.__numberSlots * self.__slotBytes
+        try:
+            self.__sharedMemory = shared_memory.SharedMemory(name=self.__name)
+            self.__untrack()
+            if self.__sharedMemory.size < size or list(self.__getRingHeader()) != [self.__numberSlots, self.__slotBytes]:
+                self.__unlinkSharedMemory()
+                self.__sharedMemory.close()
+                self.__sharedMemory = None
+        except FileNotFoundError:
+            self.__sharedMemory = None
+
+        if self.__sharedMemory is None:
+            self.__sharedMemory = shared_memory.SharedMemory(name=self.__name, create=True, size=size)
+            self.__untrack()
+            self.__getRingHeader()[:] = [self.__numberSlots, self.__slotBytes]
+
+        for slot in range(self.__numberSlots):
+            self.__getSlotHeader(slot)[:] = [0, -1, 0, 0]
+
+    def __attach(self) -> bool:
+        """
+        Tool to attach to the ring created by the cameras, return False if it does not exist or has another size
+        """
+        if self.__sharedMemory is not None:
+            return True
+
+        try:
+            sharedMemory : shared_memory.SharedMemory = shared_memory.SharedMemory(name=self.__name)
+        except FileNotFoundError:
+            return False
+        self.__sharedMemory = sharedMemory
+        self.__untrack()
+        if list(self.__getRingHeader()) != [self.__numberSlots, self.__slotBytes]:
+            self.__sharedMemory.close()
+            self.__sharedMemory = None
+            return False
+
+        return True
+
+    def write(self, frameId : int, imageNumpy : np.ndarray, bgr : bool = False) -> bool:
+        """
+        Method to write the frame of a frame id, stored as RGB, bgr if the channels of the image are in the
+        order of OpenCV, return False if the frame does not fit in a slot
+        """
+        height, width = imageNumpy.shape[:2]
+        if len(imageNumpy.shape) != 3 or imageNumpy.shape[2] != 3 or height * width * 3 > self.__frameBytes:
+            return False
+
+        slot : int = frameId % self.__numberSlots
+        with self.__writeLock:
+            slotHeader : np.ndarray = self.__getSlotHeader(slot)
+            slotHeader[0] += 1
+            slotHeader[1:] = [frameId, height, width]
+            slotFrame : np.ndarray = self.__getSlotFrame(slot, height, width)
+            if bgr:
+                cv2.cvtColor(imageNumpy, cv2.COLOR_BGR2RGB, dst=slotFrame)
+            else:
+                slotFrame[:] = imageNumpy
+            slotHeader[0] += 1
+
+        return True
+
+    def read(self, frameId : int) -> np.ndarray:
+        """
+        Method to read a copy of the RGB frame of a frame id, None if the frame is not in the ring
+        """
+        if not self.__attach():
+            self.__stats["misses"] += 1
+            return None
+
+        slotHeader : np.ndarray = self.__getSlotHeader(frameId % self.__numberSlots)
+        sequence : int = int(slotHeader[0])
+        storedFrameId, height, width = [int(value) for value in slotHeader[1:]]
+        imageNumpy : np.ndarray = None
+        if sequence % 2 == 0 and storedFrameId == frameId:
+            imageNumpy = self.__getSlotFrame(frameId % self.__numberSlots, height, width).copy()
+            if int(slotHeader[0]) != sequence:
+                imageNumpy = None
+
+        self.__stats["hits" if imageNumpy is not None else "misses"] += 1
+
+        return imageNumpy
+
+    def getStats(self) -> dict:
+        """
+        Method to get the frames read from the ring and the frames not found
+        """
+        return dict(self.__stats)
+
+    def close(self):
+        """
+        Method to detach from the ring, the ring is kept for the other processes
+        """
+        if self.__sharedMemory is not None:
+            self.__sharedMemory.close()
+            self.__sharedMemory = None
+
+    def unlink(self):
+        """
+        Method to remove the ring, the processes attached keep it until they detach
+        """
+        if self.__attach():
+            self.__unlinkSharedMemory()
+            self.close()
@@ -0,0 +1,50 @@
+import os
+import unittest
+import numpy as np
+from modules.frameRing.frameRing import FrameRing
+
+class FrameRingTest(unittest.TestCase):
+    """
+    Frame Ring Unit Tests
+    """
+    def setUp(self):
+        self.__name : str = "frameRingTest" + str(os.getpid())
+        self.__writer : FrameRing = FrameRing(self.__name, 4, 8, 6)
+        self.__reader : FrameRing = FrameRing(self.__name, 4, 8, 6)
+
+    def tearDown(self):
+        self.__reader.close()
+        self.__writer.unlink()
+
+    def test_read(self):
+        """
+        Test read Method, the frames are read as RGB until their slot is overwritten
+        """
+        self.assertIsNone(self.__reader.read(1))
+        self.__writer.create()
+        imageNumpy : np.ndarray = np.random.randint(0, 255, (6, 8, 3), dtype=np.uint8)
+
+        self.assertTrue(self.__writer.write(1, imageNumpy[:, :, ::-1], bgr=True))
+        self.assertTrue(self.__writer.write(2, imageNumpy[:4, :4]))
+
+        np.testing.assert_array_equal(self.__reader.read(1), imageNumpy)
+        np.testing.assert_array_equal(self.__reader.read(2), imageNumpy[:4, :4])
+        self.assertTrue(self.__writer.write(5, imageNumpy))
+        self.assertIsNone(self.__reader.read(1))
+        self.assertIsNone(self.__reader.read(3))
+        self.assertEqual(self.__reader.getStats(), {"hits" : 2, "misses" : 3})
+
+    def test_write(self):
+        """
+        Test write Method, the frames larger than a slot are not written and create removes the previous frames
+        """
+        self.__writer.create()
+
+        self.assertFalse(self.__writer.write(1, np.zeros((7, 8, 3), dtype=np.uint8)))
+        self.assertTrue(self.__writer.write(2, np.zeros((6, 8, 3), dtype=np.uint8)))
+        self.__writer.create()
+
+        self.assertIsNone(self.__reader.read(2))
+
+if __name__ == '__main__':
+    unittest.main()
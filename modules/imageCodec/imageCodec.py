@@ -0,0 +1,68 @@
+import os
+import cv2
+import numpy as np
+
+class ImageCodec(object):
+    """
+    Class to write and read the images of the cameras, the format of an image is given by the extension of its
+    path, so the images written with a previous codec are still read, png, jpg and webp are compressed with
+    OpenCV, npy stores the raw pixels which costs no encoding but takes the most space
+    """
+    extensions : dict = {
+        "png" : ".png",
+        "jpg" : ".jpg",
+        "webp" : ".webp",
+        "npy" : ".npy",
+    }
+
+    def __init__(self, codec : str, quality : int):
+        if codec not in ImageCodec.extensions:
+            raise Exception("Image codec " + str(codec) + " is not supported")
+        self.__codec : str = codec
+        self.__quality : int = quality
+
+    def getExtension(self) -> str:
+        """
+        Method to get the extension of the images written with the codec
+        """
+        return ImageCodec.extensions[self.__codec]
+
+    def __getParameters(self, extension : str) -> list:
+        """
+        Tool to get the OpenCV parameters of the quality of an extension, png is lossless
+        """
+        if extension == ".jpg":
+            return [cv2.IMWRITE_JPEG_QUALITY, self.__quality]
+        elif extension == ".webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, self.__quality]
+
+        return []
+
+    def write(self, path : str, imageNumpy : np.ndarray, bgr : bool = False):
+        """
+        Method to write an image in the format of the extension of path, bgr if the channels of the image are
+        in the order of OpenCV, otherwise RGB
+        """
+        extension : str = os.path.splitext(path)[1]
+        if extension == ".npy":
+            with open(path, "wb") as imageFile:
+                np.save(imageFile, cv2.cvtColor(imageNumpy, cv2.COLOR_BGR2RGB) if bgr else imageNumpy)
+            return
+
+        if not bgr:
+            imageNumpy = cv2.cvtColor(imageNumpy, cv2.COLOR_RGB2BGR)
+        if not cv2.imwrite(path, imageNumpy, self.__getParameters(extension)):
+            raise Exception("Image " + path + " could not be written")
+
+    def read(self, path : str) -> np.ndarray:
+        """
+        Method to read an image of any of the formats as RGB
+        """
+        if os.path.splitext(path)[1] == ".npy":
+            return np.load(path)
+
+        imageNumpy : np.ndarray = cv2.imread(path, cv2.IMREAD_COLOR)
+        if imageNumpy is None:
+            raise Exception("Image " + path + " could not be read")
+
+        return cv2.cvtColor(imageNumpy, cv2.COLOR_BGR2RGB)
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from modules.imageCodec.imageCodec import ImageCodec
+
+class ImageCodecTest(unittest.TestCase):
+    """
+    Image Codec Unit Tests
+    """
+    def test_read(self):
+        """
+        Test read Method, the images written with every codec are read as RGB
+        """
+        imageNumpy : np.ndarray = np.zeros((16, 24, 3), dtype=np.uint8)
+        imageNumpy[:, :, 0] = 200
+        with tempfile.TemporaryDirectory() as folder:
+            for codec in list(ImageCodec.extensions.keys()):
+                imageCodec : ImageCodec = ImageCodec(codec, 95)
+                path : str = os.path.join(folder, "01-01-2024_00:00:00.000000" + imageCodec.getExtension())
+                imageCodec.write(path, imageNumpy[:, :, ::-1].copy(), bgr=True)
+
+                imageRead : np.ndarray = imageCodec.read(path)
+
+                self.assertEqual(imageRead.shape, imageNumpy.shape)
+                self.assertLessEqual(int(np.abs(imageRead.astype(int) - imageNumpy).max()), 8)
+
+    def test_codec(self):
+        """
+        Test a codec not supported is rejected
+        """
+        with self.assertRaises(Exception):
+            ImageCodec("bmp", 95)
+
+if __name__ == '__main__':
+    unittest.main()
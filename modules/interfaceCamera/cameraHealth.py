@@ -0,0 +1,70 @@
+class CameraHealth(object):
+    """
+    Class to count the frames kept, the frames dropped and the reconnections of a camera worker, a report
+    gives the frames per second achieved since the previous report and the totals since the worker started
+    """
+    def __init__(self, camera : str, timestamp : float):
+        self.__camera : str = camera
+        self.__timestampReport : float = timestamp
+        self.__framesReport : int = 0
+        self.__frames : int = 0
+        self.__drops : int = 0
+        self.__reconnects : int = 0
+        self.__connections : int = 0
+        self.__connected : bool = False
+
+    def addFrame(self):
+        """
+        Method to count a frame kept
+        """
+        self.__frames += 1
+
+    def getFrames(self) -> int:
+        """
+        Method to get the number of frames kept
+        """
+        return self.__frames
+
+    def addDrop(self):
+        """
+        Method to count a frame which could not be decoded
+        """
+        self.__drops += 1
+
+    def addConnection(self, connected : bool):
+        """
+        Method to count an attempt to open the stream, every attempt after the first one is a reconnection
+        """
+        self.__reconnects += 1 if self.__connections > 0 else 0
+        self.__connections += 1
+        self.__connected = connected
+
+    def setDisconnected(self):
+        """
+        Method to set the stream as lost
+        """
+        self.__connected = False
+
+    def isReportDue(self, timestamp : float, interval : float) -> bool:
+        """
+        Method to check if interval seconds have passed since the previous report
+        """
+        return timestamp - self.__timestampReport >= interval
+
+    def report(self, timestamp : float) -> dict:
+        """
+        Method to get the health of the camera and start a new period of the frames per second
+        """
+        elapsed : float = timestamp - self.__timestampReport
+        health : dict = {
+            "camera" : self.__camera,
+            "connected" : self.__connected,
+            "fps" : (self.__frames - self.__framesReport) / elapsed if elapsed > 0 else 0.0,
+            "frames" : self.__frames,
+            "drops" : self.__drops,
+            "reconnects" : self.__reconnects,
+        }
+        self.__timestampReport = timestamp
+        self.__framesReport = self.__frames
+
+        return health
@@ -0,0 +1,55 @@
+import concurrent.futures
+import threading
+
+class EncoderPool(object):
+    """
+    Class to encode and store the frames of the cameras in background threads, the frames of a camera always
+    go to the same thread so they are stored in capture order, a frame submitted while maxPending frames are
+    waiting is rejected so a slow disk drops frames instead of filling the memory
+    """
+    def __init__(self, numberThreads : int, maxPending : int):
+        self.__executors : list = [
+            concurrent.futures.ThreadPoolExecutor(max_workers=1) for index in range(numberThreads)
+        ]
+        self.__slots : threading.BoundedSemaphore = threading.BoundedSemaphore(maxPending)
+        self.__keys : dict = dict()
+        self.__keysLock : threading.Lock = threading.Lock()
+
+    def __getExecutor(self, key : str) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Tool to get the thread of a key, the keys are assigned to the threads in turns
+        """
+        with self.__keysLock:
+            if key not in self.__keys:
+                self.__keys.update({
+                    key : len(self.__keys) % len(self.__executors),
+                })
+
+            return self.__executors[self.__keys[key]]
+
+    def __run(self, function : callable, arguments : tuple):
+        """
+        Tool to run a task and free its slot
+        """
+        try:
+            function(*arguments)
+        finally:
+            self.__slots.release()
+
+    def submit(self, key : str, function : callable, *arguments) -> bool:
+        """
+        Method to run function with arguments in the thread of key, return False if the task is rejected
+        because maxPending tasks are waiting
+        """
+        if not self.__slots.acquire(blocking=False):
+            return False
+        self.__getExecutor(key).submit(self.__run, function, arguments)
+
+        return True
+
+    def shutdown(self):
+        """
+        Method to wait for the pending tasks and stop the threads
+        """
+        for executor in self.__executors:
+            executor.shutdown(wait=True)
@@ -0,0 +1,24 @@
+class FrameSampler(object):
+    """
+    Class to select the frames of a stream to keep at framesPerSecond from their timestamps, a frame is kept
+    when its timestamp reaches the time of the next sample, so the frames kept do not depend on the frame rate
+    announced by the stream, which is often wrong or 0 for IP cameras
+    """
+    def __init__(self, framesPerSecond : float):
+        self.__interval : float = 1 / framesPerSecond
+        self.__nextTimestamp : float = None
+
+    def isDue(self, timestamp : float) -> bool:
+        """
+        Method to check if the frame of timestamp in seconds must be kept, the next sample is scheduled one
+        interval later, or one interval after timestamp if the stream has fallen behind more than an interval
+        """
+        if self.__nextTimestamp is not None and timestamp < self.__nextTimestamp:
+            return False
+
+        if self.__nextTimestamp is None or timestamp - self.__nextTimestamp >= self.__interval:
+            self.__nextTimestamp = timestamp + self.__interval
+        else:
+            self.__nextTimestamp += self.__interval
+
+        return True
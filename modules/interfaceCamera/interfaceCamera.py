@@ -2,10 +2,16 @@ import os
 import cv2
 import multiprocessing
 import numpy as np
+import queue
+import threading
 import time
 from datetime import datetime
-from PIL import Image
 from modules.baseModule.baseModule import BaseModule
+from modules.interfaceCamera.cameraHealth import CameraHealth
+from modules.interfaceCamera.encoderPool import EncoderPool
+from modules.interfaceCamera.frameSampler import FrameSampler
+from modules.frameRing.frameRing import FrameRing
+from modules.imageCodec.imageCodec import ImageCodec
 from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
 
 class InterfaceCamera(BaseModule):
@@ -19,100 +25,297 @@ class InterfaceCamera(BaseModule):
         self.__cameraConfig : dict = self.getConfig()["cameras"]
         self.__interfaceCameraConfig : dict = self.getConfig()["interfaceCamera"]
         self.__dateTimeFormat : str = self.getConfig()["interfaceCamera"]["dateTimeFormat"]
-        self.__imageFormat : str = self.getConfig()["interfaceCamera"]["imageFormat"]
+        self.__imageCodec : ImageCodec = ImageCodec(
+            self.getConfig()["interfaceCamera"]["imageCodec"],
+            self.getConfig()["interfaceCamera"]["imageQuality"],
+        )
         self.__cameraImagesFolder : str = self.getPaths()["folders"]["imagesDatabase"]
         self.__processes : dict = dict()
         self.__cameraProcess : multiprocessing.Process
         self.__interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
         self.__runningProcess : bool = False
+        self.__stopEvent : multiprocessing.Event = multiprocessing.Event()
+        self.__healthQueue : multiprocessing.Queue = multiprocessing.Queue()
+        self.__camerasHealth : dict = dict()
+        self.__encoderPools : dict = dict()
+        self.__encoderPoolsLock : threading.Lock = threading.Lock()
+        self.__frameRing : FrameRing = None
+        if self.getConfig()["frameRing"]["enabled"]:
+            self.__frameRing = FrameRing(
+                self.getConfig()["frameRing"]["name"],
+                self.getConfig()["frameRing"]["slots"],
+                self.getConfig()["frameRing"]["maxWidth"],
+                self.getConfig()["frameRing"]["maxHeight"],
+            )
 
     #def __del__(self):
     #    if self.__runningProcess:
     #        if self.__cameraProcess.is_alive():
     #            self.stopCaptureVideos()
 
-    def __saveImage(self, frame : np.ndarray, camera : str):
+    def __storeImage(self, frame : np.ndarray, imageName : str):
+        """
+        Tool to encode an image, save it in folder and store it in database, run by the encoder pool, with
+        frameRing.enabled the frame id of the ring slot is known after the insert, so the frame is inserted as
+        not ready, written in the frame ring, set ready and the image is saved after the predictor is notified,
+        so the encoding is not in the way of the detection and a frame is never claimed before it is readable
+        """
+        if self.__frameRing is None:
+            try:
+                self.__imageCodec.write(imageName, frame, bgr=True)
+                with self.__interfaceDatabase.traceStage("saveImage"):
+                    frameId : int = self.__interfaceDatabase.storeNewFrame(imageName)
+                self.__interfaceDatabase.publishFrame(frameId)
+            except Exception as e:
+                self.writeLog("Image " + imageName + " could not be stored: " + str(e), "ERROR")
+            return
+
+        frameId = None
+        try:
+            with self.__interfaceDatabase.traceStage("saveImage"):
+                frameId = self.__interfaceDatabase.storeNewFrame(imageName, ready=False)
+            imageSaved : bool = False
+            if not self.__frameRing.write(frameId, frame, bgr=True):
+                self.__imageCodec.write(imageName, frame, bgr=True)
+                imageSaved = True
+            self.__interfaceDatabase.setFrameReady(frameId)
+        except Exception as e:
+            self.writeLog("Image " + imageName + " could not be stored: " + str(e), "ERROR")
+            if frameId is not None:
+                self.__interfaceDatabase.deleteFrames([frameId])
+            return
+        self.__interfaceDatabase.publishFrame(frameId)
+
+        try:
+            if not imageSaved:
+                self.__imageCodec.write(imageName, frame, bgr=True)
+        except Exception as e:
+            self.writeLog("Image " + imageName + " could not be saved: " + str(e), "ERROR")
+
+    def __getEncoderPool(self) -> EncoderPool:
         """
-        Tool to save image in folder
+        Tool to get the encoder pool of the current process, shared by the cameras captured by the process,
+        the camera threads ask for it at the same time so it is created under a lock
+        """
+        processId : int = os.getpid()
+        with self.__encoderPoolsLock:
+            if processId not in self.__encoderPools:
+                self.__encoderPools = {
+                    processId : EncoderPool(
+                        self.__interfaceCameraConfig["encoderThreads"],
+                        self.__interfaceCameraConfig["encoderQueueSize"],
+                    ),
+                }
+
+            return self.__encoderPools[processId]
+
+    def __saveImage(self, frame : np.ndarray, camera : str, cameraHealth : CameraHealth):
+        """
+        Tool to name an image with the time of capture and give it to the encoder pool, the image is dropped
+        if the encoder pool is full
         """
         self.createFolderRecursively(os.path.join(self.__cameraImagesFolder, camera))
         imageName : str = os.path.join(
             self.__cameraImagesFolder,
             camera,
-            datetime.now().strftime(self.__dateTimeFormat) + self.__imageFormat,
+            datetime.now().strftime(self.__dateTimeFormat) + self.__imageCodec.getExtension(),
         )
 
-        self.__interfaceDatabase.storeNewFrame(imageName)
+        if self.__getEncoderPool().submit(camera, self.__storeImage, frame, imageName):
+            cameraHealth.addFrame()
+        else:
+            cameraHealth.addDrop()
 
-        Image.fromarray(frame).save(imageName)
+    def __getCameraUrl(self, camera : str) -> str:
+        """
+        Tool to get the url of a camera, configured directly as url or as a dictionary with url and roi
+        """
+        cameraConfig : any = self.__cameraConfig[camera]
+        if isinstance(cameraConfig, dict):
+            return cameraConfig["url"]
+
+        return cameraConfig
+
+    def __reportHealth(self, cameraHealth : CameraHealth, force : bool = False):
+        """
+        Tool to send the health of a camera to the supervisor every interfaceCamera.healthInterval seconds
+        """
+        timestamp : float = time.monotonic()
+        if force or cameraHealth.isReportDue(timestamp, self.__interfaceCameraConfig["healthInterval"]):
+            self.__healthQueue.put(cameraHealth.report(timestamp))
 
-    def captureVideo(self, camera : str):
+    def __captureVideoRead(self, capture : cv2.VideoCapture, camera : str, cameraHealth : CameraHealth):
         """
-        Method to get Images from Camera
+        Tool to capture one frame out of the frames per second of the stream over framesPerSecond, every
+        frame is decoded
         """
-        capture : cv2.VideoCapture = cv2.VideoCapture(self.__cameraConfig[camera])
-        fps : int = capture.get(cv2.CAP_PROP_FPS)
-        frameIndexToCapture = int(fps / self.__interfaceCameraConfig["framesPerSecond"])
+        fps : float = capture.get(cv2.CAP_PROP_FPS)
+        frameIndexToCapture : int = max(1, int(fps / self.__interfaceCameraConfig["framesPerSecond"]))
 
         videoIndex : int = 0
-        while(True):
+        while not self.__stopEvent.is_set():
             ret , frame = capture.read()
+            if not ret:
+                break
             if videoIndex % frameIndexToCapture == 0:
-                if ret:
-                    self.__saveImage(
-                        cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
-                        camera,
-                    )
-                else:
-                    break
+                self.__saveImage(frame, camera, cameraHealth)
+            videoIndex += 1
+            self.__reportHealth(cameraHealth)
+
+    def __getFrameTimestamp(self, capture : cv2.VideoCapture, streamClock : bool) -> float:
+        """
+        Tool to get the timestamp in seconds of the last frame grabbed, the position of the stream if it
+        reports one, otherwise the time of arrival
+        """
+        if streamClock:
+            return capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
 
-                if self.getProcessesState("interfaceCameraSubProcess" + camera) == "terminate":
-                    break
+        return time.monotonic()
 
-    def captureVideos(self):
+    def __captureVideoGrab(self, capture : cv2.VideoCapture, camera : str, cameraHealth : CameraHealth):
+        """
+        Tool to capture framesPerSecond frames per second of the stream time, every frame is grabbed from
+        the stream but only the frames kept are decoded, a frame which can not be decoded is dropped
+        """
+        frameSampler : FrameSampler = FrameSampler(self.__interfaceCameraConfig["framesPerSecond"])
+        streamClock : bool = None
+        while not self.__stopEvent.is_set():
+            if not capture.grab():
+                break
+            self.__reportHealth(cameraHealth)
+            if streamClock is None:
+                streamClock = capture.get(cv2.CAP_PROP_POS_MSEC) > 0
+            if not frameSampler.isDue(self.__getFrameTimestamp(capture, streamClock)):
+                continue
+
+            ret , frame = capture.retrieve()
+            if not ret:
+                cameraHealth.addDrop()
+                continue
+            self.__saveImage(frame, camera, cameraHealth)
+
+    def captureVideo(self, camera : str, cameraHealth : CameraHealth):
+        """
+        Method to get Images from Camera until the stream is lost or the capture is stopped,
+        interfaceCamera.captureMode grab decodes only the frames kept, read decodes every frame
+        """
+        capture : cv2.VideoCapture = cv2.VideoCapture(self.__getCameraUrl(camera))
+        cameraHealth.addConnection(capture.isOpened())
+        if capture.isOpened():
+            if self.__interfaceCameraConfig["captureMode"] == "grab":
+                self.__captureVideoGrab(capture, camera, cameraHealth)
+            else:
+                self.__captureVideoRead(capture, camera, cameraHealth)
+        cameraHealth.setDisconnected()
+        capture.release()
+
+    def __getBackoff(self, failures : int) -> float:
+        """
+        Tool to get the seconds to wait before reconnecting a stream, doubled after every failed connection
+        up to interfaceCamera.reconnectBackoff.max
         """
-        Method to capture videos from cameras
-        """
-        cameras : list = list(self.__cameraConfig.keys())
-        for index in range(len(cameras)):
-            self.__processes.update({
-                index : multiprocessing.Process(target=self.captureVideo, args=[cameras[index]])
-            })
-
-        index : int = 0
-        firstCycleFinished : bool = False
-        while(True):
-            if index == len(self.__processes):
-                index = 0
-                firstCycleFinished = True
-                time.sleep(self.__interfaceCameraConfig["recordingRatePerSecond"])
-            if firstCycleFinished is False:
-                self.updateProcessesState({
-                    "interfaceCameraSubProcess" + cameras[index] : "running",
-                })
-                self.__processes[index].start()
-            if firstCycleFinished:
-                if self.__processes[index].is_alive():
-                    self.updateProcessesState({
-                        "interfaceCameraSubProcess" + cameras[index] : "terminate",
-                    })
-                    self.__processes[index].join()
-                self.__processes.pop(index)
-                self.__processes[index] = multiprocessing.Process(target=self.captureVideo, args=[cameras[index]])
-                self.__processes[index].start()
-            index += 1
-
-            if self.getProcessesState("interfaceCamera") == "terminate":
+        backoffConfig : dict = self.__interfaceCameraConfig["reconnectBackoff"]
+
+        return min(backoffConfig["max"], backoffConfig["initial"] * 2 ** min(failures, 32))
+
+    def __cameraWorker(self, camera : str):
+        """
+        Tool to capture a camera while the capture is not stopped, the stream is kept open and reopened
+        with exponential backoff when it is lost, the backoff restarts once the stream delivers frames again
+        """
+        cameraHealth : CameraHealth = CameraHealth(camera, time.monotonic())
+        failures : int = 0
+        while not self.__stopEvent.is_set():
+            framesBefore : int = cameraHealth.getFrames()
+            self.captureVideo(camera, cameraHealth)
+            if self.__stopEvent.is_set():
                 break
 
+            failures = 0 if cameraHealth.getFrames() > framesBefore else failures + 1
+            backoff : float = self.__getBackoff(failures)
+            self.writeLog("Camera " + camera + " stream lost, reconnecting in " + str(backoff) + " seconds", "WARNING")
+            self.__reportHealth(cameraHealth, True)
+            self.__stopEvent.wait(backoff)
+
+        if self.__interfaceCameraConfig["engine"] == "processes":
+            self.__getEncoderPool().shutdown()
+
+    def __startCameraWorker(self, camera : str):
+        """
+        Tool to start the worker of a camera, a thread of the current process with interfaceCamera.engine
+        threads, so the configuration, the database connections and the encoder pool are shared by all the
+        cameras, or a process with interfaceCamera.engine processes
+        """
+        if self.__interfaceCameraConfig["engine"] == "threads":
+            worker : any = threading.Thread(target=self.__cameraWorker, args=[camera], name="camera-" + camera, daemon=True)
+        else:
+            worker = multiprocessing.Process(target=self.__cameraWorker, args=[camera])
+        self.__processes.update({
+            camera : worker,
+        })
+        worker.start()
+
+    def __updateCamerasHealth(self, health : dict):
+        """
+        Tool to store the last health reported by a camera, written in the cameras health file for the API
+        """
+        self.__camerasHealth.update({
+            health["camera"] : health,
+        })
+        healthPath : str = self.getPaths()["files"]["camerasHealth"]
+        BaseModule.writeYaml(healthPath + ".tmp", self.__camerasHealth)
+        os.replace(healthPath + ".tmp", healthPath)
+
+    def getCamerasHealth(self) -> dict:
+        """
+        Method to get the last health reported by every camera, fps achieved, frames kept, frames dropped
+        and reconnections
+        """
+        healthPath : str = self.getPaths()["files"]["camerasHealth"]
+        if not os.path.exists(healthPath):
+            return dict()
+
+        return BaseModule.readYaml(healthPath) or dict()
+
+    def registerTraceSignal(self):
+        """
+        Method to dump the query trace of the process and of the camera workers forked later when they receive SIGUSR1
+        """
+        self.__interfaceDatabase.registerTraceSignal()
+
+    def captureVideos(self):
+        """
+        Method to capture videos from cameras, one persistent worker per camera supervised until the capture
+        is stopped, a worker which dies is started again
+        """
+        if self.__frameRing is not None:
+            self.__frameRing.create()
+            self.__interfaceDatabase.deleteFramesNotReady()
+        for camera in list(self.__cameraConfig.keys()):
+            self.__startCameraWorker(camera)
+
+        while not self.__stopEvent.is_set():
+            try:
+                self.__updateCamerasHealth(self.__healthQueue.get(timeout=self.__interfaceCameraConfig["healthInterval"]))
+            except queue.Empty:
+                pass
+
+            for camera in list(self.__processes.keys()):
+                if not self.__processes[camera].is_alive() and not self.__stopEvent.is_set():
+                    self.writeLog("Camera " + camera + " worker exited, starting it again", "ERROR")
+                    self.__startCameraWorker(camera)
+
+        for camera in list(self.__processes.keys()):
+            self.__processes[camera].join()
+        if self.__interfaceCameraConfig["engine"] == "threads":
+            self.__getEncoderPool().shutdown()
+
     def startCaptureVideos(self):
         """
         Method to capture videos from cameras in the background
         """
+        self.__stopEvent.clear()
         self.__cameraProcess = multiprocessing.Process(target=self.captureVideos)
-        self.updateProcessesState({
-            "interfaceCamera" : "running",
-        })
         self.__runningProcess = True
         self.__cameraProcess.start()
 
@@ -120,8 +323,6 @@ class InterfaceCamera(BaseModule):
         """
         Method to stop videos capture
         """
-        self.updateProcessesState({
-            "interfaceCamera" : "terminate",
-        })
+        self.__stopEvent.set()
         self.__runningProcess = False
         self.__cameraProcess.join()
@@ -0,0 +1,34 @@
+import unittest
+from modules.interfaceCamera.cameraHealth import CameraHealth
+
+class CameraHealthTest(unittest.TestCase):
+    """
+    Camera Health Unit Tests
+    """
+    def test_report(self):
+        """
+        Test report Method
+        """
+        cameraHealth : CameraHealth = CameraHealth("camera1", 0)
+        cameraHealth.addConnection(True)
+        for index in range(20):
+            cameraHealth.addFrame()
+        cameraHealth.addDrop()
+        cameraHealth.setDisconnected()
+        cameraHealth.addConnection(False)
+        cameraHealth.addConnection(True)
+
+        self.assertFalse(cameraHealth.isReportDue(5, 10))
+        self.assertTrue(cameraHealth.isReportDue(10, 10))
+        self.assertEqual(cameraHealth.report(10), {
+            "camera" : "camera1",
+            "connected" : True,
+            "fps" : 2.0,
+            "frames" : 20,
+            "drops" : 1,
+            "reconnects" : 2,
+        })
+        self.assertEqual(cameraHealth.report(20)["fps"], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
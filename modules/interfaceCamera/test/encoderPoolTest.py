@@ -0,0 +1,38 @@
+import threading
+import unittest
+from modules.interfaceCamera.encoderPool import EncoderPool
+
+class EncoderPoolTest(unittest.TestCase):
+    """
+    Encoder Pool Unit Tests
+    """
+    def test_submit(self):
+        """
+        Test submit Method, the tasks of a key run in order
+        """
+        encoderPool : EncoderPool = EncoderPool(2, 100)
+        results : dict = {"camera1" : list(), "camera2" : list()}
+
+        for index in range(20):
+            self.assertTrue(encoderPool.submit("camera1", results["camera1"].append, index))
+            self.assertTrue(encoderPool.submit("camera2", results["camera2"].append, index))
+        encoderPool.shutdown()
+
+        self.assertEqual(results["camera1"], list(range(20)))
+        self.assertEqual(results["camera2"], list(range(20)))
+
+    def test_submitRejected(self):
+        """
+        Test submit Method, a task is rejected while maxPending tasks are waiting
+        """
+        encoderPool : EncoderPool = EncoderPool(1, 2)
+        blocked : threading.Event = threading.Event()
+
+        self.assertTrue(encoderPool.submit("camera1", blocked.wait))
+        self.assertTrue(encoderPool.submit("camera1", blocked.wait))
+        self.assertFalse(encoderPool.submit("camera1", blocked.wait))
+        blocked.set()
+        encoderPool.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from modules.interfaceCamera.frameSampler import FrameSampler
+
+class FrameSamplerTest(unittest.TestCase):
+    """
+    Frame Sampler Unit Tests
+    """
+    def test_isDue(self):
+        """
+        Test isDue Method, a 25 fps stream sampled at 1 fps keeps one frame of 25
+        """
+        frameSampler : FrameSampler = FrameSampler(1)
+
+        framesKept : list = [index for index in range(100) if frameSampler.isDue(index / 25)]
+
+        self.assertEqual(framesKept, [0, 25, 50, 75])
+
+    def test_isDueBehind(self):
+        """
+        Test isDue Method, after a gap of the stream the samples restart from the first frame after the gap
+        """
+        frameSampler : FrameSampler = FrameSampler(2)
+
+        framesKept : list = [timestamp for timestamp in [0, 0.2, 0.5, 3.1, 3.3, 3.6, 3.7] if frameSampler.isDue(timestamp)]
+
+        self.assertEqual(framesKept, [0, 0.5, 3.1, 3.6])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+from modules.baseModule.baseModule import BaseModule
+from modules.interfaceDatabase import schemas
+from modules.interfaceDatabase.backends import AsyncDatabaseBackend, AsyncMySqlBackend, AsyncSqliteBackend
+
+class AsyncInterfaceDatabase(BaseModule):
+    """
+    Class to read the databases from asyncio code as the handlers of the API, the queries do not block the
+    event loop while they wait for the database, the tables are created and migrated by InterfaceDatabase
+    which is still used by the worker scripts
+    """
+    def __init__(self):
+        super().__init__()
+        self.__config = self.getConfig()["database"]
+        self.__backend : AsyncDatabaseBackend = self.__setupBackend()
+        self.__tables, migrations = schemas.getSchemas(self.__backend.name)
+
+    def __setupBackend(self) -> AsyncDatabaseBackend:
+        """
+        Tool to setup the asyncio backend of database.backend
+        """
+        if self.__config["backend"] == "sqlite":
+            return AsyncSqliteBackend(self.__config, self.getPaths()["files"]["sqliteDatabase"])
+        elif self.__config["backend"] == "mysql":
+            return AsyncMySqlBackend(self.__config)
+
+        raise Exception("Database backend " + str(self.__config["backend"]) + " is not supported")
+
+    async def close(self):
+        """
+        Method to close the connections of the backend
+        """
+        await self.__backend.close()
+
+    async def __executeQuery(self, query : str, parameters : tuple = ()) -> list:
+        """
+        Tool to perform query, a query failing because the connection was lost is retried
+        """
+        retries : int = 0
+        while True:
+            try:
+                rows : list = await self.__backend.execute(query, parameters)
+                break
+            except self.__backend.connectionErrors as e:
+                if retries >= self.__config["retriesDatabase"]:
+                    raise
+                retries += 1
+                self.writeLog("Database connection lost, retrying query: " + str(e), "WARNING")
+                await asyncio.sleep(self.__config["sleepDatabase"])
+
+        return self.__fetchResults(rows)
+
+    def __fetchResults(self, rows : list) -> list:
+        """
+        Tool to format the rows of a query, a single element per row for single column queries
+        """
+        results : list = list()
+        if rows is None:
+            return results
+
+        for queryResult in rows:
+            if len(queryResult) > 1:
+                results.append(list(queryResult))
+            else:
+                results.append(queryResult[0])
+
+        return results
+
+    async def getCameras(self) -> list:
+        """
+        Method to get the cameras with frames stored
+        """
+        return await self.__executeQuery(self.__tables["frames"]["getCameras"])
+
+    async def getPersonDetectionWatermark(self) -> int:
+        """
+        Method to get the first frame id not yet person detected, all previous frames are person detected
+        """
+        resultQuery : list = await self.__executeQuery(self.__tables["frames"]["getFrameIdPersonDetectionWatermark"])
+
+        return int(resultQuery[0])
+
+    async def getActivePersonsState(self) -> list:
+        """
+        Method to get the state of the active persons, each row contains personId, last box, last frameId,
+        last timestamp, number of frames and idle clasification
+        """
+        return await self.__executeQuery(self.__tables["persons"]["getActivePersonsState"])
+
+    async def getCoordinatesByPersonId(self, personId : int) -> list:
+        """
+        Method to get coordinates by person id
+        """
+        return await self.__executeQuery(self.__tables["objects"]["getCoordinatesByPersonId"], (personId,))
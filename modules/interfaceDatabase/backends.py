@@ -0,0 +1,435 @@
+import asyncio
+import contextlib
+import fcntl
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from modules.interfaceDatabase import schemas
+
+class DatabaseBackend(ABC):
+    """
+    Class interface of the storage backends of InterfaceDatabase, a backend owns the connections and runs
+    the queries of schemas.py, written with %s parameters, returning the rows and the last id inserted
+    """
+    name : str = None
+    connectionErrors : tuple = ()
+
+    @abstractmethod
+    def createDatabase(self):
+        """
+        Method to create the database if does not exist
+        """
+
+    @abstractmethod
+    def getConnection(self) -> any:
+        """
+        Method to get a connection
+        """
+
+    @abstractmethod
+    def releaseConnection(self, connection : any):
+        """
+        Method to give back a connection got with getConnection
+        """
+
+    @abstractmethod
+    def isConnected(self, connection : any) -> bool:
+        """
+        Method to check if a connection is alive
+        """
+
+    def discardConnection(self, connection : any):
+        """
+        Method to forget the state kept for a connection which has been lost
+        """
+        pass
+
+    @abstractmethod
+    def execute(self, connection : any, query : str, parameters : any, prepared : bool, many : bool) -> tuple:
+        """
+        Method to perform a query, many performs the query with every parameters of a list, return the rows,
+        None if the query does not return rows, and the first id inserted
+        """
+
+    @abstractmethod
+    def migrationLock(self) -> contextlib.AbstractContextManager:
+        """
+        Method to get the lock held by a process while it creates and migrates the tables
+        """
+
+class MySqlBackend(DatabaseBackend):
+    """
+    Class to store the database in a MySQL server, the connections are taken from a pool shared by all
+    the instances of a process, a pool is never shared with a forked process because the sockets of the
+    parent can not be used by the child
+    """
+    name : str = "mysql"
+    __pools : dict = dict()
+    __poolsSlots : dict = dict()
+    __poolsLock : threading.Lock = threading.Lock()
+    __preparedCursors : dict = dict()
+
+    def __init__(self, config : dict):
+        from mysql.connector import errors
+
+        self.__config : dict = config
+        self.connectionErrors = (errors.OperationalError, errors.InterfaceError)
+
+    def createDatabase(self):
+        """
+        Method to create the database if does not exist
+        """
+        import mysql.connector
+
+        connector : mysql.connector = mysql.connector.connect(
+            user=self.__config["user"],
+            password=self.__config["password"],
+            host=self.__config["host"],
+        )
+        cursor : any = connector.cursor()
+
+        cursor.execute(schemas.database["checkDatabase"])
+
+        databases : list = [row[0] for row in cursor]
+
+        if self.__config["database"] not in databases:
+            cursor.execute(schemas.database["createDatabase"] + self.__config["database"])
+            connector.commit()
+        cursor.close()
+        connector.close()
+
+    def __getPool(self) -> tuple:
+        """
+        Tool to get the connection pool of the current process and the semaphore of its free connections,
+        created on first use
+        """
+        from mysql.connector import pooling
+
+        processId : int = os.getpid()
+        with MySqlBackend.__poolsLock:
+            if processId not in MySqlBackend.__pools:
+                MySqlBackend.__preparedCursors = dict()
+                MySqlBackend.__poolsSlots = {
+                    processId : threading.BoundedSemaphore(self.__config["poolSize"]),
+                }
+                MySqlBackend.__pools = {
+                    processId : pooling.MySQLConnectionPool(
+                        pool_name="interfaceDatabase" + str(processId),
+                        pool_size=self.__config["poolSize"],
+                        pool_reset_session=False,
+                        user=self.__config["user"],
+                        password=self.__config["password"],
+                        host=self.__config["host"],
+                        database=self.__config["database"],
+                    ),
+                }
+
+            return MySqlBackend.__pools[processId], MySqlBackend.__poolsSlots[processId]
+
+    def getConnection(self) -> any:
+        """
+        Method to get a connection from the pool, the pool checks the connection is alive and reconnects it
+        if not, while all the connections are in use the caller waits on the semaphore of the pool until one
+        is released, the pool raises instead of waiting
+        """
+        pool, slots = self.__getPool()
+        slots.acquire()
+        try:
+            return pool.get_connection()
+        except BaseException:
+            slots.release()
+            raise
+
+    def releaseConnection(self, connection : any):
+        """
+        Method to give back a connection to the pool
+        """
+        pool, slots = self.__getPool()
+        try:
+            connection.close()
+        finally:
+            slots.release()
+
+    def isConnected(self, connection : any) -> bool:
+        """
+        Method to check if a connection is alive
+        """
+        return connection.is_connected()
+
+    def __getPooledConnection(self, connection : any) -> any:
+        """
+        Tool to get the connection kept by the pool behind the connection given by getConnection, the pool
+        gives a new wrapper on every getConnection around the same connection
+        """
+        return getattr(connection, "_cnx", connection)
+
+    def discardConnection(self, connection : any):
+        """
+        Method to forget the prepared cursors of a connection which has been lost
+        """
+        MySqlBackend.__preparedCursors.pop(self.__getPooledConnection(connection), None)
+
+    def __getPreparedCursor(self, connection : any, query : str) -> any:
+        """
+        Tool to get the prepared cursor of a query in a connection, a prepared cursor keeps its statement
+        prepared in the server while it executes the same query, so every query is prepared once per connection,
+        the cursors are indexed by the connection of the pool so there are at most prepared cursors for
+        database.poolSize connections, they are dropped when the connection id of the server changes because
+        the pool reconnected the connection and its statements were lost
+        """
+        pooledConnection : any = self.__getPooledConnection(connection)
+        if MySqlBackend.__preparedCursors.get(pooledConnection, dict()).get("connectionId") != connection.connection_id:
+            MySqlBackend.__preparedCursors.update({
+                pooledConnection : {
+                    "connectionId" : connection.connection_id,
+                    "cursors" : dict(),
+                },
+            })
+
+        connectionCursors : dict = MySqlBackend.__preparedCursors[pooledConnection]["cursors"]
+        if query not in connectionCursors:
+            connectionCursors.update({
+                query : connection.cursor(prepared=True),
+            })
+
+        return connectionCursors[query]
+
+    def execute(self, connection : any, query : str, parameters : any, prepared : bool, many : bool) -> tuple:
+        """
+        Method to perform a query, prepared binds the parameters in a server side prepared statement, many
+        sends a multi-row insert, otherwise the query is sent as text for statements that can not be prepared
+        """
+        if prepared:
+            cursor : any = self.__getPreparedCursor(connection, query)
+            cursor.execute(query, parameters)
+        elif many:
+            cursor = connection.cursor()
+            cursor.executemany(query, parameters)
+        else:
+            cursor = connection.cursor()
+            cursor.execute(query)
+
+        rows : list = cursor.fetchall() if cursor.with_rows else None
+        lastRowId : int = cursor.lastrowid
+        if not prepared:
+            cursor.close()
+
+        return rows, lastRowId
+
+    @contextlib.contextmanager
+    def migrationLock(self):
+        """
+        Method to hold a named lock of MySQL, released when the connection holding it is closed
+        """
+        connection : any = self.getConnection()
+        cursor : any = connection.cursor()
+        try:
+            cursor.execute(schemas.database["lockMigration"])
+            cursor.fetchall()
+            yield
+        finally:
+            cursor.execute(schemas.database["unlockMigration"])
+            cursor.fetchall()
+            cursor.close()
+            self.releaseConnection(connection)
+
+class SqliteBackend(DatabaseBackend):
+    """
+    Class to store the database in an embedded SQLite file in WAL mode, readers do not block the writer so
+    the camera, predictor and API processes can share the file, every thread keeps its own connection and
+    SQLite caches the compiled statements of each connection
+    """
+    name : str = "sqlite"
+    connectionErrors : tuple = (sqlite3.OperationalError,)
+    __connections : threading.local = threading.local()
+
+    def __init__(self, config : dict, databasePath : str):
+        self.__config : dict = config
+        self.__databasePath : str = databasePath
+
+    def createDatabase(self):
+        """
+        Method to create the folder of the database file, the file is created on the first connection
+        """
+        os.makedirs(os.path.dirname(self.__databasePath), exist_ok=True)
+
+    def getConnection(self) -> sqlite3.Connection:
+        """
+        Method to get the connection of the current thread, created on first use
+        """
+        connections : dict = getattr(SqliteBackend.__connections, "connections", None)
+        if connections is None or SqliteBackend.__connections.processId != os.getpid():
+            connections = dict()
+            SqliteBackend.__connections.connections = connections
+            SqliteBackend.__connections.processId = os.getpid()
+
+        if self.__databasePath not in connections:
+            connection : sqlite3.Connection = sqlite3.connect(
+                self.__databasePath,
+                timeout=self.__config["sqliteTimeout"],
+                cached_statements=256,
+            )
+            connection.execute("PRAGMA journal_mode = WAL;")
+            connection.execute("PRAGMA synchronous = NORMAL;")
+            connection.execute("PRAGMA foreign_keys = ON;")
+            connections.update({
+                self.__databasePath : connection,
+            })
+
+        return connections[self.__databasePath]
+
+    def releaseConnection(self, connection : sqlite3.Connection):
+        """
+        Method to give back a connection, the connection is kept open for the next query of the thread
+        """
+        pass
+
+    def isConnected(self, connection : sqlite3.Connection) -> bool:
+        """
+        Method to check if a connection is alive, an embedded connection is never lost
+        """
+        return True
+
+    def execute(self, connection : sqlite3.Connection, query : str, parameters : any, prepared : bool, many : bool) -> tuple:
+        """
+        Method to perform a query, many inserts the rows one by one in the same transaction since there is
+        no round trip to save, the ids of the rows are consecutive while the transaction holds the write lock
+        """
+        query = query.replace("%s", "?")
+        lastRowId : int = None
+        if many:
+            for rowParameters in parameters:
+                cursor : sqlite3.Cursor = connection.execute(query, rowParameters)
+                if lastRowId is None:
+                    lastRowId = cursor.lastrowid
+        else:
+            cursor = connection.execute(query, parameters)
+            lastRowId = cursor.lastrowid
+
+        rows : list = cursor.fetchall() if cursor.description is not None else None
+
+        return rows, lastRowId
+
+    @contextlib.contextmanager
+    def migrationLock(self):
+        """
+        Method to hold an exclusive lock on a file next to the database
+        """
+        with open(self.__databasePath + ".lock", "w") as lockFile:
+            fcntl.flock(lockFile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+class AsyncDatabaseBackend(ABC):
+    """
+    Class interface of the asyncio backends of AsyncInterfaceDatabase, a query waits for the database
+    without blocking the event loop so a single process serves many concurrent requests
+    """
+    name : str = None
+    connectionErrors : tuple = ()
+
+    @abstractmethod
+    async def execute(self, query : str, parameters : tuple) -> list:
+        """
+        Method to perform a query, return the rows, None if the query does not return rows
+        """
+
+    async def close(self):
+        """
+        Method to close the connections
+        """
+        pass
+
+class AsyncMySqlBackend(AsyncDatabaseBackend):
+    """
+    Class to query a MySQL server with the asyncio driver aiomysql, the pool of connections is created on
+    the first query since it belongs to the event loop running it
+    """
+    name : str = "mysql"
+
+    def __init__(self, config : dict):
+        import pymysql
+
+        self.__config : dict = config
+        self.__poolTask : asyncio.Task = None
+        self.connectionErrors = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+    async def __createPool(self) -> any:
+        """
+        Tool to create the pool of connections, autocommit so every read sees the last rows committed
+        """
+        import aiomysql
+
+        return await aiomysql.create_pool(
+            minsize=1,
+            maxsize=self.__config["asyncPoolSize"],
+            user=self.__config["user"],
+            password=self.__config["password"],
+            host=self.__config["host"],
+            db=self.__config["database"],
+            autocommit=True,
+        )
+
+    async def __getPool(self) -> any:
+        """
+        Tool to get the pool of connections, the coroutines querying while the pool is created wait for
+        the same creation
+        """
+        if self.__poolTask is None:
+            self.__poolTask = asyncio.ensure_future(self.__createPool())
+        try:
+            return await self.__poolTask
+        except Exception:
+            self.__poolTask = None
+            raise
+
+    async def execute(self, query : str, parameters : tuple) -> list:
+        """
+        Method to perform a query in a connection of the pool
+        """
+        pool : any = await self.__getPool()
+        async with pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, parameters)
+                rows : list = await cursor.fetchall() if cursor.description is not None else None
+
+        return rows
+
+    async def close(self):
+        """
+        Method to close the connections of the pool
+        """
+        if self.__poolTask is None:
+            return
+        pool : any = await self.__poolTask
+        self.__poolTask = None
+        pool.close()
+        await pool.wait_closed()
+
+class AsyncSqliteBackend(AsyncDatabaseBackend):
+    """
+    Class to query the embedded SQLite file without blocking the event loop, SQLite has no asynchronous
+    interface so the queries run in the threads of the default executor, each thread with its connection
+    """
+    name : str = "sqlite"
+    connectionErrors : tuple = SqliteBackend.connectionErrors
+
+    def __init__(self, config : dict, databasePath : str):
+        self.__backend : SqliteBackend = SqliteBackend(config, databasePath)
+
+    def __execute(self, query : str, parameters : tuple) -> list:
+        """
+        Tool to perform a query in the connection of the executor thread
+        """
+        rows, lastRowId = self.__backend.execute(self.__backend.getConnection(), query, parameters, True, False)
+
+        return rows
+
+    async def execute(self, query : str, parameters : tuple) -> list:
+        """
+        Method to perform a query in a thread of the executor
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.__execute, query, parameters)
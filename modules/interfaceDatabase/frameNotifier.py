@@ -0,0 +1,127 @@
+import os
+import select
+import socket
+import time
+
+class FrameNotifier(object):
+    """
+    Class to notify the processes of the same machine that a frame has been stored or updated, a process
+    waiting for frames listens in an UDP port of localhost registered as a file in the registry folder,
+    the publishers send the frame id to every registered port. A notification only wakes up the waiting
+    process which then reads the database, a lost notification delays the frame until the timeout of wait
+    """
+    def __init__(self, registryFolder : str, refreshInterval : float):
+        self.__registryFolder : str = registryFolder
+        self.__refreshInterval : float = refreshInterval
+        self.__publisher : socket.socket = None
+        self.__subscriber : socket.socket = None
+        self.__processId : int = None
+        self.__ports : list = list()
+        self.__timeLastRefresh : float = 0
+
+    def __setupSockets(self):
+        """
+        Tool to create the sockets of the current process, the sockets of a parent process are not reused
+        after a fork
+        """
+        if self.__processId == os.getpid():
+            return
+
+        self.__processId = os.getpid()
+        self.__publisher = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__subscriber = None
+        self.__timeLastRefresh = 0
+
+    def __getRegistryPath(self) -> str:
+        """
+        Tool to get the file of the registry of the subscriber, named by process id and notifier id
+        """
+        return os.path.join(self.__registryFolder, str(self.__processId) + "-" + str(id(self)) + ".port")
+
+    def __subscribe(self):
+        """
+        Tool to listen in a free port of localhost and register it
+        """
+        self.__subscriber = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.__subscriber.bind(("127.0.0.1", 0))
+        self.__subscriber.setblocking(False)
+
+        registryPath : str = self.__getRegistryPath()
+        with open(registryPath + ".tmp", "w") as registryFile:
+            registryFile.write(str(self.__subscriber.getsockname()[1]))
+        os.replace(registryPath + ".tmp", registryPath)
+
+    def __isProcessAlive(self, processId : int) -> bool:
+        """
+        Tool to check if a process is running
+        """
+        try:
+            os.kill(processId, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+        return True
+
+    def __refreshPorts(self):
+        """
+        Tool to read the ports registered, the files of finished processes are removed
+        """
+        timeNow : float = time.time()
+        if timeNow - self.__timeLastRefresh < self.__refreshInterval:
+            return
+        self.__timeLastRefresh = timeNow
+
+        ports : list = list()
+        for fileName in os.listdir(self.__registryFolder):
+            name, extension = os.path.splitext(fileName)
+            processId : str = name.split("-")[0]
+            if extension != ".port" or not processId.isdigit():
+                continue
+            if not self.__isProcessAlive(int(processId)):
+                try:
+                    os.remove(os.path.join(self.__registryFolder, fileName))
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                with open(os.path.join(self.__registryFolder, fileName)) as registryFile:
+                    ports.append(int(registryFile.read()))
+            except (FileNotFoundError, ValueError):
+                continue
+
+        self.__ports = ports
+
+    def publish(self, frameId : int):
+        """
+        Method to notify the registered processes that a frame has been stored or updated
+        """
+        self.__setupSockets()
+        self.__refreshPorts()
+        for port in self.__ports:
+            try:
+                self.__publisher.sendto(str(frameId).encode(), ("127.0.0.1", port))
+            except OSError:
+                continue
+
+    def wait(self, timeout : float) -> bool:
+        """
+        Method to wait until a notification arrives or timeout seconds pass, return True if notified, the
+        notifications queued while the process was not waiting are consumed at once
+        """
+        self.__setupSockets()
+        if self.__subscriber is None:
+            self.__subscribe()
+
+        readable, writable, exceptional = select.select([self.__subscriber], [], [], timeout)
+        if len(readable) == 0:
+            return False
+
+        while True:
+            try:
+                self.__subscriber.recv(64)
+            except BlockingIOError:
+                break
+
+        return True
@@ -1,18 +1,37 @@
+import contextlib
+import os
+import signal
+import threading
 import time
 from datetime import datetime
-import mysql.connector
 from modules.baseModule.baseModule import BaseModule
 from modules.interfaceDatabase import schemas
+from modules.interfaceDatabase.backends import DatabaseBackend, MySqlBackend, SqliteBackend
+from modules.interfaceDatabase.frameNotifier import FrameNotifier
+from modules.interfaceDatabase.lruCache import LruCache
+from modules.interfaceDatabase.queryTracer import QueryTracer
 
 class InterfaceDatabase(BaseModule):
     """
-    Class to manage interface to the databases
+    Class to manage interface to the databases, the storage is a MySQL server or an embedded SQLite file
+    selected by database.backend
     """
+    __queryTracers : dict = dict()
+    __queryTracersLock : threading.Lock = threading.Lock()
+
     def __init__(self):
         super().__init__()
         self.__config = self.getConfig()["database"]
+        self.__transaction : threading.local = threading.local()
         self.__dateTimeFormat : str = self.getConfig()["interfaceCamera"]["dateTimeFormat"]
-        self.__createDatabase()
+        self.__backend : DatabaseBackend = self.__setupBackend()
+        self.__tables, self.__migrations = self.__initSchemas()
+        self.__queryNames : dict = self.__initQueryNames()
+        self.__cache : LruCache = LruCache(self.__config["cacheSize"])
+        self.__frameNotifier : FrameNotifier = None
+        if self.__config["notifications"]["enabled"]:
+            self.__frameNotifier = FrameNotifier(self.getPaths()["folders"]["frameNotifier"], refreshInterval=1)
+        self.__backend.createDatabase()
         self.__initTables()
         self.__timestampRef : float = self.__initParams()
 
@@ -35,122 +54,345 @@ class InterfaceDatabase(BaseModule):
 
         return timestampRef
 
-    def __initTables(self):
+    def __setupBackend(self) -> DatabaseBackend:
         """
-        Tool to init tables if they do not exist
+        Tool to setup the storage backend of database.backend
         """
-        connection : mysql.connector = self.__getConnection()
-        cursor : mysql.connector.cursor = connection.cursor()
-        for table in list(schemas.tables.keys()):
-            cursor.execute(schemas.tables[table]["checkTable"])
-            if cursor.fetchone() is None:
-                cursor.execute(schemas.tables[table]["createTable"])
+        if self.__config["backend"] == "sqlite":
+            return SqliteBackend(self.__config, self.getPaths()["files"]["sqliteDatabase"])
+        elif self.__config["backend"] == "mysql":
+            return MySqlBackend(self.__config)
 
-        connection.commit()
-        cursor.close()
-        connection.close()
+        raise Exception("Database backend " + str(self.__config["backend"]) + " is not supported")
 
-    def __createDatabase(self):
+    def __initSchemas(self) -> tuple:
         """
-        Method to create database
+        Tool to get the queries and migrations of the backend, the queries of the dialect of the backend
+        replace the ones of schemas.tables
         """
-        connector : mysql.connector = mysql.connector.connect(
-            user=self.__config["user"],
-            password=self.__config["password"],
-            host=self.__config["host"],
-        )
-        cursor : any = connector.cursor()
+        return schemas.getSchemas(self.__backend.name)
 
-        cursor.execute(schemas.database["checkDatabase"])
+    def __initQueryNames(self) -> dict:
+        """
+        Tool to index the names of the queries, table.name, by their text
+        """
+        queryNames : dict = dict()
+        for table in list(self.__tables.keys()):
+            for name in list(self.__tables[table].keys()):
+                queryNames.update({
+                    self.__tables[table][name] : table + "." + name,
+                })
 
-        databases : list = [row[0] for row in cursor]
+        return queryNames
 
-        if self.__config["database"] not in databases:
-            cursor.execute(schemas.database["createDatabase"] + self.__config["database"])
-            connector.commit()
-            cursor.close()
-            connector.close()
-    
-    def __getConnection(self) -> mysql.connector:
+    def __getQueryTracer(self) -> QueryTracer:
         """
-        Method to get a connection
+        Tool to get the query tracer of the current process, shared by all the instances so a stage records
+        the queries of every instance
         """
-        connector = mysql.connector.connect(
-            user=self.__config["user"],
-            password=self.__config["password"],
-            host=self.__config["host"],
-            database=self.__config["database"],
-        )
+        processId : int = os.getpid()
+        with InterfaceDatabase.__queryTracersLock:
+            if processId not in InterfaceDatabase.__queryTracers:
+                InterfaceDatabase.__queryTracers = {
+                    processId : QueryTracer(self.__config["traceSamples"]),
+                }
+
+            return InterfaceDatabase.__queryTracers[processId]
+
+    def traceStage(self, name : str) -> contextlib.AbstractContextManager:
+        """
+        Method to record the queries performed inside a block as the stage name
+        """
+        return self.__getQueryTracer().stage(name)
+
+    def getQueryTrace(self) -> dict:
+        """
+        Method to get count, total and p50/p99 latency in ms of the queries per query name and per stage
+        """
+        return self.__getQueryTracer().getStats()
+
+    def resetQueryTrace(self):
+        """
+        Method to remove the queries recorded
+        """
+        self.__getQueryTracer().reset()
+
+    def dumpQueryTrace(self) -> str:
+        """
+        Method to write the query trace of the process in data/logs/queryTrace.<pid>.yaml, return the path
+        """
+        tracePath : str = os.path.join(self.getPaths()["folders"]["logs"], "queryTrace." + str(os.getpid()) + ".yaml")
+        BaseModule.writeYaml(tracePath, self.getQueryTrace())
+
+        return tracePath
+
+    def registerTraceSignal(self):
+        """
+        Method to dump the query trace of the process when it receives SIGUSR1, called once from the main
+        thread by the worker scripts, the processes forked later keep the handler and dump their own trace
+        """
+        signal.signal(signal.SIGUSR1, lambda signalNumber, frame: self.dumpQueryTrace())
+
+    def __initTables(self):
+        """
+        Tool to init tables if they do not exist and migrate them to the last version of the schema, the
+        migration runs under a lock of the backend since several processes start at the same time
+        """
+        with self.__backend.migrationLock():
+            for table in list(self.__tables.keys()):
+                if len(self.__executeQuery(self.__tables[table]["checkTable"], prepared = False)) == 0:
+                    self.__executeQuery(self.__tables[table]["createTable"], prepared = False)
+                    if table == "schemaVersion":
+                        self.__executeQuery(self.__tables["schemaVersion"]["insertVersion"])
+
+            self.__migrateTables()
+
+    def __isMigrationQueryApplied(self, migrationQuery : dict) -> bool:
+        """
+        Tool to check if the column or the index created by a query of a migration already exists
+        """
+        if "column" in migrationQuery:
+            return len(self.__executeQuery(self.__tables["schemaVersion"]["checkColumn"], migrationQuery["column"])) > 0
+        if "index" in migrationQuery:
+            return len(self.__executeQuery(self.__tables["schemaVersion"]["checkIndex"], migrationQuery["index"])) > 0
+
+        return False
+
+    def __migrateTables(self):
+        """
+        Tool to apply the migrations newer than the version of the database, in place without losing data,
+        the queries whose column or index already exists are skipped so an interrupted migration is completed
+        """
+        version : int = int(self.__executeQuery(self.__tables["schemaVersion"]["getVersion"])[0])
+        for migration in self.__migrations:
+            if migration["version"] <= version:
+                continue
+
+            for migrationQuery in migration["queries"]:
+                if not self.__isMigrationQueryApplied(migrationQuery):
+                    self.__executeQuery(migrationQuery["query"], prepared = False)
+
+            self.__executeQuery(self.__tables["schemaVersion"]["updateVersion"], (migration["version"],))
+            version = migration["version"]
+            self.writeLog("Database migrated to schema version " + str(version), "INFO")
 
-        return connector
-    
     def deleteTable(self, table : str):
         """
         Method to delete a table
         """
-        self.__executeQuery("DROP TABLE " + table + ";")
+        self.__executeQuery("DROP TABLE " + table + ";", prepared = False)
 
     def resetDatabase(self):
         """
         Method to reset database
         """
-        tables : list = list(schemas.tables.keys())
+        tables : list = list(self.__tables.keys())
         numberKeys : int = len(tables) - 1
         while numberKeys >= 0:
             self.deleteTable(tables[numberKeys])
             numberKeys -= 1
         self.__initTables()
+        self.__cache.invalidate()
         params : dict = self.getParams()
         timestampRefKey : str = "timestampRef"
         params.pop(timestampRefKey)
         self.writeParams(params)
         self.__timestampRef : float = self.__initParams()
 
-    def storeNewFrame(self, imagePath : str):
+    def publishFrame(self, frameId : int):
         """
-        Method to store new frame in database
+        Method to notify the processes waiting for frames that a frame has been stored or updated
+        """
+        if self.__frameNotifier is not None:
+            self.__frameNotifier.publish(frameId)
+
+    def waitNewFrames(self):
+        """
+        Method to wait until a frame is published or database.notifications.timeout seconds pass, without
+        notifications waits database.sleepDatabase seconds
+        """
+        if self.__frameNotifier is not None:
+            self.__frameNotifier.wait(self.__config["notifications"]["timeout"])
+        else:
+            time.sleep(self.__config["sleepDatabase"])
+
+    def storeNewFrame(self, imagePath : str, ready : bool = True) -> int:
         """
-        timestampStrf : str = imagePath.split("/")[-1].split(".png")[0]
+        Method to store new frame in database, return the frame id, a frame not ready is not claimed for person
+        detection until setFrameReady, so it can be inserted before its image is readable
+        """
+        timestampStrf : str = os.path.splitext(os.path.basename(imagePath))[0]
         timestampMilliseconds : int = int(datetime.strptime(timestampStrf, self.__dateTimeFormat).timestamp() - self.__timestampRef)
 
-        self.__executeQuery(schemas.tables["frames"]["insertNewFrame"].format(
-            timestamp = timestampMilliseconds,
-            timestampStrf = timestampStrf,
-            pathImage = imagePath,
-            personDetection = 0,
-            actionDetection = 0,
+        return self.__executeInsert(self.__tables["frames"]["insertNewFrame"], (
+            timestampMilliseconds,
+            timestampStrf,
+            imagePath,
+            os.path.basename(os.path.dirname(imagePath)),
+            0,
+            0,
+            1 if ready else 0,
         ))
 
-    def __executeQuery(self, query : str) -> list:
+    def setFrameReady(self, frameId : int):
         """
-        Tool to perform query
+        Method to set the image of a frame as readable, the frame can be claimed for person detection
         """
-        connection : mysql.connector = self.__getConnection()
-        cursor : any = connection.cursor()
-        cursor.execute(query)
+        self.__executeQuery(self.__tables["frames"]["updateFrameReadyFromFrameId"], (frameId,))
 
-        results : list = list()
+    def deleteFramesNotReady(self):
+        """
+        Method to delete the frames whose image was never written, left by a capture stopped between the
+        insert of the frame and the write of its image
+        """
+        self.deleteFrames(self.__executeQuery(self.__tables["frames"]["getFrameIdsNotReady"]))
+
+    def __executeQuery(self, query : str, parameters : tuple = (), prepared : bool = True) -> list:
+        """
+        Tool to perform query, the parameters are bound to the %s of the query in a server side prepared
+        statement, prepared False sends the query as text for statements that can not be prepared as DDL
+        """
+        results, lastRowId = self.__execute(query, parameters, prepared, False)
+
+        return results
+
+    def __executeInsert(self, query : str, parameters : any, many : bool = False) -> int:
+        """
+        Tool to perform an insert and get the id generated, many inserts the list of parameters in a single
+        multi-row insert and the id generated is the one of the first row, the ids of a multi-row insert are consecutive
+        """
+        results, lastRowId = self.__execute(query, parameters, not many, many)
+
+        return lastRowId
+
+    def __executeQueryCached(self, query : str, parameters : tuple) -> list:
+        """
+        Tool to perform a query of rows which never change once written through the cache, empty results
+        are not cached since the rows may be written later
+        """
+        resultQuery : list = self.__cache.get((query, parameters), lambda: self.__executeQuery(query, parameters) or None)
+
+        return resultQuery if resultQuery is not None else list()
 
+    def getCacheStats(self) -> dict:
+        """
+        Method to get the hits, misses and entries of the cache of immutable rows
+        """
+        return self.__cache.getStats()
+
+    def __executeMany(self, query : str, parametersList : list):
+        """
+        Tool to perform a query once per parameters of a list
+        """
+        self.__execute(query, parametersList, False, True)
+
+    def __execute(self, query : str, parameters : any, prepared : bool, many : bool) -> tuple:
+        """
+        Tool to perform query, retried on a new connection up to database.retriesDatabase times if the
+        connection is lost, inside a transaction the query is not retried since the transaction is lost
+        """
+        retries : int = 0
         while True:
-            queryResult : tuple = cursor.fetchone()
-            if queryResult is not None:
-                if len(queryResult) > 1:
-                    elements : list = list()
-                    for element in queryResult:
-                        elements.append(element)
-                    results.append(
-                        elements
-                    )
-                else:
-                    results.append(
-                        queryResult[0]  
-                    )
-            else:
-                break
+            timeStart : float = time.perf_counter()
+            try:
+                result : tuple = self.__executeQueryConnection(query, parameters, prepared, many)
+            except self.__backend.connectionErrors as e:
+                self.__traceQuery(query, timeStart)
+                if self.__getTransactionConnection() is not None or retries >= self.__config["retriesDatabase"]:
+                    raise
+                retries += 1
+                self.writeLog("Database connection lost, retrying query: " + str(e), "WARNING")
+                time.sleep(self.__config["sleepDatabase"])
+                continue
+            self.__traceQuery(query, timeStart)
+
+            return result
+
+    def __traceQuery(self, query : str, timeStart : float):
+        """
+        Tool to record a query in the query trace, the queries which are not in schemas are recorded as text
+        """
+        self.__getQueryTracer().record(self.__queryNames.get(query, "text"), (time.perf_counter() - timeStart) * 1000)
+
+    def __getTransactionConnection(self) -> any:
+        """
+        Tool to get the connection of the transaction open in the current thread, None if there is not
+        """
+        return getattr(self.__transaction, "connection", None)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Method to perform all the queries of a block in a single transaction of the current thread, committed
+        at the end of the block or rolled back if the block raises, a nested block joins the open transaction
+        """
+        if self.__getTransactionConnection() is not None:
+            yield
+            return
+
+        connection : any = self.__backend.getConnection()
+        self.__transaction.connection = connection
+        try:
+            yield
+            connection.commit()
+        except Exception:
+            self.__rollback(connection)
+            raise
+        finally:
+            self.__transaction.connection = None
+            self.__backend.releaseConnection(connection)
+
+    def __rollback(self, connection : any):
+        """
+        Tool to rollback the open transaction of a connection, a lost connection is discarded
+        """
+        if self.__backend.isConnected(connection):
+            connection.rollback()
+        else:
+            self.__backend.discardConnection(connection)
+
+    def __executeQueryConnection(self, query : str, parameters : any, prepared : bool, many : bool) -> tuple:
+        """
+        Tool to perform query with a connection of the backend or with the connection of the open transaction
+        """
+        transactionConnection : any = self.__getTransactionConnection()
+        connection : any = transactionConnection
+        if connection is None:
+            connection = self.__backend.getConnection()
+        try:
+            rows, lastRowId = self.__backend.execute(connection, query, parameters, prepared, many)
+            if transactionConnection is None:
+                connection.commit()
+        except Exception:
+            if transactionConnection is None:
+                self.__rollback(connection)
+            raise
+        finally:
+            if transactionConnection is None:
+                self.__backend.releaseConnection(connection)
+
+        return self.__fetchResults(rows), lastRowId
 
-        connection.commit()
-        cursor.close()
-        connection.close()
+    def __fetchResults(self, rows : list) -> list:
+        """
+        Tool to format the rows of a query, a single element per row for single column queries
+        """
+        results : list = list()
+        if rows is None:
+            return results
+
+        for queryResult in rows:
+            if len(queryResult) > 1:
+                elements : list = list()
+                for element in queryResult:
+                    elements.append(element)
+                results.append(
+                    elements
+                )
+            else:
+                results.append(
+                    queryResult[0]  
+                )
 
         return results
 
@@ -160,19 +402,49 @@ class InterfaceDatabase(BaseModule):
         """
         resultQuery : list
         while True:
-            resultQuery = self.__executeQuery(schemas.tables["frames"]["getFrameIdLastPersonPrediction"])
+            resultQuery = self.__executeQuery(self.__tables["frames"]["getFrameIdLastPersonPrediction"])
             if len(resultQuery) == 0:
-                time.sleep(self.__config["sleepDatabase"])
+                self.waitNewFrames()
+            else:
+                break
+
+        return int(resultQuery[0])
+
+    def claimNextEntriesPersonDetected(self, numberEntries : int, claimId : str, leaseSeconds : int) -> list:
+        """
+        Method to claim atomically the next entries pending of person detection, the entries already claimed
+        by other workers are skipped unless their lease has expired, several workers get disjoint entries
+        """
+        resultQuery : list
+        while True:
+            claimTimestamp : int = int(time.time())
+            self.__executeQuery(self.__tables["frames"]["claimFramesPersonPrediction"], (
+                claimId,
+                claimTimestamp,
+                claimTimestamp - leaseSeconds,
+                numberEntries,
+            ))
+            resultQuery = self.__executeQuery(self.__tables["frames"]["getFrameIdsFromClaimId"], (claimId,))
+            if len(resultQuery) == 0:
+                self.waitNewFrames()
             else:
                 break
 
+        return [int(frameId) for frameId in resultQuery]
+
+    def getPersonDetectionWatermark(self) -> int:
+        """
+        Method to get the first frame id not yet person detected, all previous frames are person detected
+        """
+        resultQuery : list = self.__executeQuery(self.__tables["frames"]["getFrameIdPersonDetectionWatermark"])
+
         return int(resultQuery[0])
     
     def getImageFromFrameId(self, frameId : int) -> str:
         """
         Method to get image path from frameId
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["frames"]["getImagePathFromFrameId"].format(frameId = str(frameId)))
+        resultQuery : list = self.__executeQueryCached(self.__tables["frames"]["getImagePathFromFrameId"], (frameId,))
 
         return str(resultQuery[0])
     
@@ -180,97 +452,113 @@ class InterfaceDatabase(BaseModule):
         """
         Method to get objects from person id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getObjectsIdFromPersonId"].format(personId = str(personId)))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getObjectsIdFromPersonId"], (personId,))
         return resultQuery
     
     def updateVideoPath(self, videoPath : str, personId : int):
         """
         Method to update video path by person id
         """
-        self.__executeQuery(schemas.tables["persons"]["updateVideoPathFromPersonId"].format(pathVideoPredict = videoPath, personId = personId))
+        self.__executeQuery(self.__tables["persons"]["updateVideoPathFromPersonId"], (videoPath, personId))
 
     def getObjectsIdFromFrameId(self, frameId: int) -> list:
         """
         Method to get objects from frame id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getObjectsIdFromFrameId"].format(frameId = str(frameId)))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getObjectsIdFromFrameId"], (frameId,))
         return resultQuery
     
+    def getObjectsCoordinatesFromFrameId(self, frameId : int) -> list:
+        """
+        Method to get objects with their coordinates from frame id, each row contains objectId, x_0, y_0, x_1, y_1
+        """
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getObjectsCoordinatesFromFrameId"], (frameId,))
+        return resultQuery
+
+    def getActivePersonsState(self) -> list:
+        """
+        Method to get the state of the active persons, each row contains personId, last box, last frameId,
+        last timestamp, number of frames and idle clasification
+        """
+        resultQuery : list = self.__executeQuery(self.__tables["persons"]["getActivePersonsState"])
+        return resultQuery
+
     def getActivePersons(self) -> list:
         """
         Method to get active persons
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["persons"]["getPersonsIdFromPersonCompleted"].format(personCompleted = 0))
+        resultQuery : list = self.__executeQuery(self.__tables["persons"]["getPersonsIdFromPersonCompleted"], (0,))
         return resultQuery
 
     def getCoordinatesByPersonId(self, personId : int) -> list:
         """
         Method to get coordinates by person id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getCoordinatesByPersonId"].format(personId = personId))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getCoordinatesByPersonId"], (personId,))
         return resultQuery
     
     def getCoordinatesByObjectId(self, objectId : int) -> list:
         """
         Method to get coordinates by person id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getCoordinatesByObjectId"].format(objectId = objectId))
+        resultQuery : list = self.__executeQueryCached(self.__tables["objects"]["getCoordinatesByObjectId"], (objectId,))
         return resultQuery
 
-    def createNewPerson(self):
+    def createNewPerson(self) -> int:
         """
-        Method to create a new person
+        Method to create a new person, return the person id
         """
-        self.__executeQuery(schemas.tables["persons"]["insertNewPerson"])
+        return self.__executeInsert(self.__tables["persons"]["insertNewPerson"], ())
 
     def getNewPerson(self) -> int:
         """
         Method to create a new person
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["persons"]["getNewPerson"])
+        resultQuery : list = self.__executeQuery(self.__tables["persons"]["getNewPerson"])
 
         return int(resultQuery[0])
+
     def updatePersonIdFromObjectId(self, objectId : int, personId : int):
         """
         Method to update person id from object id
         """
-        self.__executeQuery(schemas.tables["objects"]["updatePersonIdFromObjectId"].format(objectId = objectId, personId = personId))
+        self.__executeQuery(self.__tables["objects"]["updatePersonIdFromObjectId"], (personId, objectId))
 
     def updatePersonDetected(self, frameId : int):
         """
         Method to update new person detected in frames table
         """
-        self.__executeQuery(schemas.tables["frames"]["updatePersonDetectionFromFrameId"].format(personDetection = 1, frameId = str(frameId)))
+        self.__executeQuery(self.__tables["frames"]["updatePersonDetectionFromFrameId"], (1, frameId))
 
     def updateActionDetected(self, frameId : int):
         """
         Method to update new person detected in frames table
         """
-        self.__executeQuery(schemas.tables["frames"]["updateActionDetectionFromFrameId"].format(actionDetection = 1, frameId = str(frameId)))
+        self.__executeQuery(self.__tables["frames"]["updateActionDetectionFromFrameId"], (1, frameId))
 
     def setPersonAsCompleted(self, personId: int):
         """
         Method to set persons as updated
         """
-        self.__executeQuery(schemas.tables["persons"]["updatePersonCompletedFromPersonId"].format(personId = personId, personCompleted = 1))
+        self.__executeQuery(self.__tables["persons"]["updatePersonCompletedFromPersonId"], (1, personId))
 
     def setIdleClasification(self, personId: int):
         """
         Method to set persons as updated
         """
-        self.__executeQuery(schemas.tables["persons"]["updateIdleClasificationFromPersonId"].format(personId = personId, idleClasification = 1))
+        self.__executeQuery(self.__tables["persons"]["updateIdleClasificationFromPersonId"], (1, personId))
 
     def setAnnotatedImagePath(self, imagePath : str, frameId : int):
         """
         Method to update annotated image path by frame id
         """
-        self.__executeQuery(schemas.tables["frames"]["updateAnnotatedImagePathFromFrameId"].format(pathImagePredict = imagePath, frameId = str(frameId)))
+        self.__executeQuery(self.__tables["frames"]["updateAnnotatedImagePathFromFrameId"], (imagePath, frameId))
 
     def getTimestampFromFrameId(self, frameId : int) -> int:
         """
         Method to get timestamp from frame id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["frames"]["getTimestampFromFrameId"].format(frameId = frameId))
+        resultQuery : list = self.__executeQueryCached(self.__tables["frames"]["getTimestampFromFrameId"], (frameId,))
 
         return int(resultQuery[0])
 
@@ -278,51 +566,96 @@ class InterfaceDatabase(BaseModule):
         """
         Method to get frame id from object id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getFrameIdFromPersonId"].format(personId = personId))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getFrameIdFromPersonId"], (personId,))
         return int(resultQuery[0])
     
     def getPersonIdFromObjectId(self, objectId : int) -> int:
         """
         Method to get person id from object id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getPersonIdFromObjectId"].format(objectId = objectId))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getPersonIdFromObjectId"], (objectId,))
         return int(resultQuery[0])
     
     def getFramesFromPersonId(self, personId : int) -> list:
         """
         Method to get number of frames from person id
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["objects"]["getFramesFromPersonId"].format(personId = personId))
+        resultQuery : list = self.__executeQuery(self.__tables["objects"]["getFramesFromPersonId"], (personId,))
         return resultQuery
     
     def getNextVideo(self) -> list:
         """
         Method to get next video to store, return personId
         """
-        resultQuery : list = self.__executeQuery(schemas.tables["persons"]["getNextPersonIdVideoToStore"])
+        resultQuery : list = self.__executeQuery(self.__tables["persons"]["getNextPersonIdVideoToStore"])
         return resultQuery
 
     def storeNewObject(self, frameId : int, x_0 : int, y_0 : int, x_1 : int, y_1 : int):
         """
         Method to add new object detected in frame
         """
-        self.__executeQuery(schemas.tables["objects"]["insertNewObject"].format(
-            frameId = frameId,
-            x_0 = str(x_0),
-            y_0 = str(y_0),
-            x_1 = str(x_1),
-            y_1 = str(y_1),
+        self.__executeQuery(self.__tables["objects"]["insertNewObject"], (
+            int(frameId),
+            int(x_0),
+            int(y_0),
+            int(x_1),
+            int(y_1),
         ))
 
+    def storeNewObjects(self, frameId : int, boxes : list) -> list:
+        """
+        Method to add all the objects detected in a frame in a single insert, boxes is a list of
+        [x_0, y_0, x_1, y_1], return the object ids in the same order
+        """
+        if len(boxes) == 0:
+            return list()
+
+        firstObjectId : int = self.__executeInsert(self.__tables["objects"]["insertNewObject"], [
+            (int(frameId), int(box[0]), int(box[1]), int(box[2]), int(box[3])) for box in boxes
+        ], many = True)
+
+        return list(range(firstObjectId, firstObjectId + len(boxes)))
+
+    def getCameras(self) -> list:
+        """
+        Method to get the cameras with frames stored, None for the frames stored before the camera was recorded
+        """
+        return self.__executeQuery(self.__tables["frames"]["getCameras"])
+
+    def getExpiredFrames(self, camera : str, ttlSeconds : float, numberEntries : int) -> list:
+        """
+        Method to get the oldest frames of a camera captured more than ttlSeconds ago and already processed,
+        the frames of active persons or of idle persons whose video is not created yet are kept, each row
+        contains frameId, image path and annotated image path
+        """
+        timestampLimit : int = int(datetime.now().timestamp() - self.__timestampRef - ttlSeconds)
+        if camera is None:
+            return self.__executeQuery(self.__tables["frames"]["getExpiredFramesWithoutCamera"], (timestampLimit, numberEntries))
+
+        return self.__executeQuery(self.__tables["frames"]["getExpiredFramesFromCamera"], (camera, timestampLimit, numberEntries))
+
+    def deleteFrames(self, frameIds : list):
+        """
+        Method to delete frames and their objects in a single transaction, the completed persons left without
+        objects whose video is created or not needed are deleted
+        """
+        if len(frameIds) == 0:
+            return
+
+        with self.transaction():
+            self.__executeMany(self.__tables["objects"]["deleteObjectsFromFrameId"], [(frameId,) for frameId in frameIds])
+            self.__executeMany(self.__tables["frames"]["deleteFrameFromFrameId"], [(frameId,) for frameId in frameIds])
+            self.__executeQuery(self.__tables["persons"]["deleteCompletedPersonsWithoutObjects"])
+
     def getNextEntryActionDetected(self) -> int:
         """
         Method to obtain last entry of action detected in database
         """
         resultQuery : list
         while True:
-            resultQuery = self.__executeQuery(schemas.tables["frames"]["getFrameIdLastActionPrediction"])
+            resultQuery = self.__executeQuery(self.__tables["frames"]["getFrameIdLastActionPrediction"])
             if len(resultQuery) == 0:
-                time.sleep(self.__config["sleepDatabase"])
+                self.waitNewFrames()
             else:
                 break
 
@@ -0,0 +1,57 @@
+import collections
+import threading
+
+class LruCache(object):
+    """
+    Class to keep the last values read of the database which never change once written, bounded to maxSize
+    entries discarding the least recently used, a maxSize of 0 disables the cache
+    """
+    def __init__(self, maxSize : int):
+        self.__maxSize : int = maxSize
+        self.__entries : collections.OrderedDict = collections.OrderedDict()
+        self.__lock : threading.Lock = threading.Lock()
+        self.__stats : dict = {
+            "hits" : 0,
+            "misses" : 0,
+        }
+
+    def get(self, key : tuple, load : callable) -> any:
+        """
+        Method to get the value of a key, load is called on a miss and its value is stored unless it is None
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.__stats["hits"] += 1
+                return self.__entries[key]
+            self.__stats["misses"] += 1
+
+        value : any = load()
+        if value is None or self.__maxSize <= 0:
+            return value
+
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxSize:
+                self.__entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self):
+        """
+        Method to remove all the entries
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def getStats(self) -> dict:
+        """
+        Method to get the number of hits, misses and entries
+        """
+        with self.__lock:
+            return {
+                "hits" : self.__stats["hits"],
+                "misses" : self.__stats["misses"],
+                "entries" : len(self.__entries),
+            }
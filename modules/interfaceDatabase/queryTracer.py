@@ -0,0 +1,110 @@
+import collections
+import contextlib
+import threading
+
+class QueryTracer(object):
+    """
+    Class to record the number and the latency of the queries per query name and per stage, a stage is a
+    block of code of the caller, the queries are recorded in the innermost stage open in the thread, the
+    percentiles are computed over the last numberSamples latencies of each query or stage
+    """
+    def __init__(self, numberSamples : int):
+        self.__numberSamples : int = numberSamples
+        self.__lock : threading.Lock = threading.Lock()
+        self.__local : threading.local = threading.local()
+        self.__queries : dict = dict()
+        self.__stages : dict = dict()
+
+    def __newEntry(self) -> dict:
+        """
+        Tool to create the record of a query or a stage
+        """
+        return {
+            "calls" : 0,
+            "queries" : 0,
+            "totalMs" : 0.0,
+            "samples" : collections.deque(maxlen=self.__numberSamples),
+        }
+
+    def __getStages(self) -> list:
+        """
+        Tool to get the stack of stages open in the current thread
+        """
+        stages : list = getattr(self.__local, "stages", None)
+        if stages is None:
+            stages = list()
+            self.__local.stages = stages
+
+        return stages
+
+    @contextlib.contextmanager
+    def stage(self, name : str):
+        """
+        Method to record the queries of a block in the stage name
+        """
+        with self.__lock:
+            self.__stages.setdefault(name, self.__newEntry())["calls"] += 1
+        stages : list = self.__getStages()
+        stages.append(name)
+        try:
+            yield
+        finally:
+            stages.pop()
+
+    def record(self, name : str, latencyMs : float):
+        """
+        Method to record a query and its latency in milliseconds
+        """
+        stages : list = self.__getStages()
+        with self.__lock:
+            entries : list = [self.__queries.setdefault(name, self.__newEntry())]
+            if len(stages) > 0:
+                entries.append(self.__stages.setdefault(stages[-1], self.__newEntry()))
+            for entry in entries:
+                entry["queries"] += 1
+                entry["totalMs"] += latencyMs
+                entry["samples"].append(latencyMs)
+            entries[0]["calls"] += 1
+
+    def __percentile(self, samples : list, percentile : float) -> float:
+        """
+        Tool to get the percentile of sorted samples, nearest rank
+        """
+        if len(samples) == 0:
+            return 0.0
+
+        return samples[min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))]
+
+    def __summary(self, entry : dict) -> dict:
+        """
+        Tool to summarize the record of a query or a stage
+        """
+        samples : list = sorted(entry["samples"])
+
+        return {
+            "calls" : entry["calls"],
+            "queries" : entry["queries"],
+            "queriesPerCall" : entry["queries"] / entry["calls"] if entry["calls"] > 0 else 0.0,
+            "totalMs" : entry["totalMs"],
+            "p50Ms" : self.__percentile(samples, 50),
+            "p99Ms" : self.__percentile(samples, 99),
+        }
+
+    def getStats(self) -> dict:
+        """
+        Method to get the summary per query name and per stage, calls of a stage are the times the stage was
+        entered, queriesPerCall is the number of queries each time
+        """
+        with self.__lock:
+            return {
+                "queries" : {name : self.__summary(entry) for name, entry in self.__queries.items()},
+                "stages" : {name : self.__summary(entry) for name, entry in self.__stages.items()},
+            }
+
+    def reset(self):
+        """
+        Method to remove all the records
+        """
+        with self.__lock:
+            self.__queries = dict()
+            self.__stages = dict()
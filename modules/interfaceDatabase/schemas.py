@@ -15,28 +15,55 @@ CREATE TABLE frames (
 SHOW TABLES LIKE 'frames'
 """,
         "insertNewFrame" : """
-INSERT INTO frames (timestamp, timestampStrf, pathImage, personDetection, actionDetection) VALUES ({timestamp}, '{timestampStrf}', '{pathImage}', {personDetection}, {actionDetection});
+INSERT INTO frames (timestamp, timestampStrf, pathImage, camera, personDetection, actionDetection, frameReady) VALUES (%s, %s, %s, %s, %s, %s, %s);
 """,
         "getTimestampFromFrameId" : """
-SELECT timestamp FROM frames WHERE frameId = {frameId};
+SELECT timestamp FROM frames WHERE frameId = %s;
 """,
         "getFrameIdLastPersonPrediction" : """
 SELECT frameId FROM frames WHERE personDetection = 0 ORDER BY frameId LIMIT 1;
+""",
+        "claimFramesPersonPrediction" : """
+UPDATE frames SET claimId = %s, claimTimestamp = %s WHERE personDetection = 0 AND frameReady = 1 AND (claimId IS NULL OR claimTimestamp < %s) ORDER BY frameId LIMIT %s;
+""",
+        "getFrameIdsFromClaimId" : """
+SELECT frameId FROM frames WHERE claimId = %s AND personDetection = 0 ORDER BY frameId;
+""",
+        "getFrameIdPersonDetectionWatermark" : """
+SELECT COALESCE(MIN(CASE WHEN personDetection = 0 THEN frameId END), MAX(frameId) + 1, 1) FROM frames;
 """,
         "getFrameIdLastActionPrediction" : """
 SELECT frameId FROM frames WHERE actionDetection = 0 ORDER BY frameId LIMIT 1;
 """,
         "getImagePathFromFrameId" : """
-SELECT pathImage FROM frames WHERE frameId = {frameId};
+SELECT pathImage FROM frames WHERE frameId = %s;
 """,
         "updatePersonDetectionFromFrameId" : """
-UPDATE frames SET personDetection = {personDetection} WHERE frameId = {frameId};
+UPDATE frames SET personDetection = %s WHERE frameId = %s;
+""",
+        "updateFrameReadyFromFrameId" : """
+UPDATE frames SET frameReady = 1 WHERE frameId = %s;
+""",
+        "getFrameIdsNotReady" : """
+SELECT frameId FROM frames WHERE frameReady = 0;
 """,
         "updateActionDetectionFromFrameId" : """
-UPDATE frames SET actionDetection = {actionDetection} WHERE frameId = {frameId};
+UPDATE frames SET actionDetection = %s WHERE frameId = %s;
 """,
         "updateAnnotatedImagePathFromFrameId" : """
-UPDATE frames SET pathImagePredict = '{pathImagePredict}' WHERE frameId = {frameId};
+UPDATE frames SET pathImagePredict = %s WHERE frameId = %s;
+""",
+        "getCameras" : """
+SELECT DISTINCT camera FROM frames;
+""",
+        "getExpiredFramesFromCamera" : """
+SELECT frameId, pathImage, pathImagePredict FROM frames WHERE camera = %s AND timestamp < %s AND actionDetection = 1 AND NOT EXISTS (SELECT 1 FROM objects INNER JOIN persons ON persons.personId = objects.personId WHERE objects.frameId = frames.frameId AND (persons.personCompleted = 0 OR (persons.idleClasification = 1 AND persons.pathVideoPredict IS NULL))) ORDER BY frameId LIMIT %s;
+""",
+        "getExpiredFramesWithoutCamera" : """
+SELECT frameId, pathImage, pathImagePredict FROM frames WHERE camera IS NULL AND timestamp < %s AND actionDetection = 1 AND NOT EXISTS (SELECT 1 FROM objects INNER JOIN persons ON persons.personId = objects.personId WHERE objects.frameId = frames.frameId AND (persons.personCompleted = 0 OR (persons.idleClasification = 1 AND persons.pathVideoPredict IS NULL))) ORDER BY frameId LIMIT %s;
+""",
+        "deleteFrameFromFrameId" : """
+DELETE FROM frames WHERE frameId = %s;
 """,
     },
     "persons" : {
@@ -55,23 +82,34 @@ SHOW TABLES LIKE 'persons'
 INSERT INTO persons (personCompleted, idleClasification) VALUES (0, 0);
 """,
         "updatePersonCompletedFromPersonId" : """
-UPDATE persons SET personCompleted = {personCompleted} WHERE personId = {personId};
+UPDATE persons SET personCompleted = %s WHERE personId = %s;
 """,
         "updateVideoPathFromPersonId" : """
-UPDATE persons SET pathVideoPredict = '{pathVideoPredict}' WHERE personId = {personId};
+UPDATE persons SET pathVideoPredict = %s WHERE personId = %s;
 """,
         "updateIdleClasificationFromPersonId" : """
-UPDATE persons SET idleClasification = {idleClasification} WHERE personId = {personId};
+UPDATE persons SET idleClasification = %s WHERE personId = %s;
 """,
         "getPersonsIdFromPersonCompleted" : """
-SELECT personId FROM persons WHERE personCompleted = {personCompleted};
+SELECT personId FROM persons WHERE personCompleted = %s;
 """,
         "getNewPerson" : """
 SELECT personId FROM persons ORDER BY personId DESC LIMIT 1;
+""",
+        "deleteCompletedPersonsWithoutObjects" : """
+DELETE FROM persons WHERE personCompleted = 1 AND (idleClasification = 0 OR pathVideoPredict IS NOT NULL) AND NOT EXISTS (SELECT 1 FROM objects WHERE objects.personId = persons.personId);
 """,
         "getNextPersonIdVideoToStore" : """
 SELECT personId FROM persons WHERE idleClasification = 1 AND personCompleted = 1 AND pathVideoPredict IS NULL LIMIT 1;
-"""
+""",
+        "getActivePersonsState" : """
+SELECT personObjects.personId, lastObject.x_0, lastObject.y_0, lastObject.x_1, lastObject.y_1, lastObject.frameId, frames.timestamp, personObjects.numberFrames, persons.idleClasification
+FROM (SELECT personId, MAX(objectId) AS lastObjectId, COUNT(*) AS numberFrames FROM objects WHERE personId IS NOT NULL GROUP BY personId) AS personObjects
+INNER JOIN persons ON persons.personId = personObjects.personId
+INNER JOIN objects AS lastObject ON lastObject.objectId = personObjects.lastObjectId
+INNER JOIN frames ON frames.frameId = lastObject.frameId
+WHERE persons.personCompleted = 0;
+""",
     },
     "objects" : {
         "createTable" : """
@@ -91,36 +129,272 @@ CREATE TABLE objects (
 SHOW TABLES LIKE 'objects'
 """,
         "insertNewObject" : """
-INSERT INTO objects (frameId, x_0, y_0, x_1, y_1) VALUES ({frameId}, {x_0}, {y_0}, {x_1}, {y_1});
+INSERT INTO objects (frameId, x_0, y_0, x_1, y_1) VALUES (%s, %s, %s, %s, %s);
 """,
         "updatePersonIdFromObjectId" : """
-UPDATE objects SET personId = {personId} WHERE objectId = {objectId};
+UPDATE objects SET personId = %s WHERE objectId = %s;
 """,
         "getObjectsIdFromFrameId" : """
-SELECT objectId FROM objects WHERE frameId = {frameId};
+SELECT objectId FROM objects WHERE frameId = %s;
+""",
+        "getObjectsCoordinatesFromFrameId" : """
+SELECT objectId, x_0, y_0, x_1, y_1 FROM objects WHERE frameId = %s;
 """,
         "getPersonIdFromObjectId" : """
-SELECT personId FROM objects WHERE objectId = {objectId};
+SELECT personId FROM objects WHERE objectId = %s;
 """,
         "getFrameIdFromPersonId" : """
-SELECT frameId FROM objects WHERE personId = {personId} ORDER BY objectId DESC LIMIT 1;
+SELECT frameId FROM objects WHERE personId = %s ORDER BY objectId DESC LIMIT 1;
 """,
         "getCoordinatesByPersonId" : """
-SELECT x_0, y_0, x_1, y_1 FROM objects WHERE personId = {personId};
+SELECT x_0, y_0, x_1, y_1 FROM objects WHERE personId = %s;
 """,
         "getObjectsIdFromPersonId" : """
-SELECT x_0, y_0, x_1, y_1, frameId FROM objects WHERE personId = {personId};
+SELECT x_0, y_0, x_1, y_1, frameId FROM objects WHERE personId = %s;
 """,
         "getFramesFromPersonId" : """
-SELECT objectId FROM objects WHERE personId = {personId};
+SELECT objectId FROM objects WHERE personId = %s;
 """,
         "getCoordinatesByObjectId" : """
-SELECT x_0, y_0, x_1, y_1 FROM objects WHERE objectId = {objectId};
+SELECT x_0, y_0, x_1, y_1 FROM objects WHERE objectId = %s;
+""",
+        "deleteObjectsFromFrameId" : """
+DELETE FROM objects WHERE frameId = %s;
+""",
+    },
+    "schemaVersion" : {
+        "createTable" : """
+CREATE TABLE schemaVersion (
+    version INT NOT NULL
+);
+""",
+        "checkTable" : """
+SHOW TABLES LIKE 'schemaVersion'
+""",
+        "insertVersion" : """
+INSERT INTO schemaVersion (version) VALUES (0);
+""",
+        "getVersion" : """
+SELECT version FROM schemaVersion;
+""",
+        "updateVersion" : """
+UPDATE schemaVersion SET version = %s;
+""",
+        "checkColumn" : """
+SELECT COLUMN_NAME FROM information_schema.columns WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s;
+""",
+        "checkIndex" : """
+SELECT DISTINCT INDEX_NAME FROM information_schema.statistics WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s;
 """,
     },
 }
 
+# Migrations applied in order over the tables created by createTable, the version of the database is
+# stored in schemaVersion, every query of a migration names the column or the index it creates and is
+# skipped if it already exists, so a migration interrupted halfway, DDL is not transactional in MySQL,
+# is completed by the next start
+migrations = [
+    {
+        "version" : 1,
+        "queries" : [
+            {
+                "column" : ("frames", "claimId"),
+                "query" : """
+ALTER TABLE frames ADD COLUMN claimId VARCHAR(128), ADD COLUMN claimTimestamp BIGINT;
+""",
+            },
+        ],
+    },
+    {
+        "version" : 2,
+        "queries" : [
+            {
+                "index" : ("frames", "framesPersonDetection"),
+                "query" : """
+CREATE INDEX framesPersonDetection ON frames (personDetection, frameId);
+""",
+            },
+            {
+                "index" : ("frames", "framesActionDetection"),
+                "query" : """
+CREATE INDEX framesActionDetection ON frames (actionDetection, frameId);
+""",
+            },
+            {
+                "index" : ("frames", "framesClaimId"),
+                "query" : """
+CREATE INDEX framesClaimId ON frames (claimId);
+""",
+            },
+            {
+                "index" : ("objects", "objectsPersonId"),
+                "query" : """
+CREATE INDEX objectsPersonId ON objects (personId, objectId);
+""",
+            },
+            {
+                "index" : ("persons", "personsCompleted"),
+                "query" : """
+CREATE INDEX personsCompleted ON persons (personCompleted);
+""",
+            },
+            {
+                "index" : ("persons", "personsVideoToStore"),
+                "query" : """
+CREATE INDEX personsVideoToStore ON persons (idleClasification, personCompleted, pathVideoPredict);
+""",
+            },
+        ],
+    },
+    {
+        "version" : 3,
+        "queries" : [
+            {
+                "column" : ("frames", "camera"),
+                "query" : """
+ALTER TABLE frames ADD COLUMN camera VARCHAR(64);
+""",
+            },
+            {
+                "index" : ("frames", "framesCameraTimestamp"),
+                "query" : """
+CREATE INDEX framesCameraTimestamp ON frames (camera, timestamp);
+""",
+            },
+            {
+                "index" : ("objects", "objectsFrameId"),
+                "query" : """
+CREATE INDEX objectsFrameId ON objects (frameId);
+""",
+            },
+        ],
+    },
+    {
+        "version" : 4,
+        "queries" : [
+            {
+                "column" : ("frames", "frameReady"),
+                "query" : """
+ALTER TABLE frames ADD COLUMN frameReady BOOLEAN NOT NULL DEFAULT 1;
+""",
+            },
+        ],
+    },
+]
+
 database = {
     "createDatabase" : "CREATE DATABASE ",
     "checkDatabase" : "SHOW DATABASES",
-}
\ No newline at end of file
+    "lockMigration" : """
+SELECT GET_LOCK('schemaMigration', 60);
+""",
+    "unlockMigration" : """
+SELECT RELEASE_LOCK('schemaMigration');
+""",
+}
+
+# Queries of the SQLite backend different from MySQL, they replace the queries of tables and migrations
+# with the same key
+dialects = {
+    "sqlite" : {
+        "tables" : {
+            "frames" : {
+                "createTable" : """
+CREATE TABLE frames (
+    frameId INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INT NOT NULL,
+    timestampStrf VARCHAR(255) NOT NULL,
+    pathImage VARCHAR(255) NOT NULL,
+    pathImagePredict VARCHAR(255),
+    personDetection BOOLEAN,
+    actionDetection BOOLEAN
+);
+""",
+                "checkTable" : """
+SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'frames'
+""",
+                "claimFramesPersonPrediction" : """
+UPDATE frames SET claimId = %s, claimTimestamp = %s WHERE frameId IN (SELECT frameId FROM frames WHERE personDetection = 0 AND frameReady = 1 AND (claimId IS NULL OR claimTimestamp < %s) ORDER BY frameId LIMIT %s);
+""",
+            },
+            "persons" : {
+                "createTable" : """
+CREATE TABLE persons (
+    personId INTEGER PRIMARY KEY AUTOINCREMENT,
+    pathVideoPredict VARCHAR(255),
+    personCompleted BOOLEAN,
+    idleClasification BOOLEAN
+);
+""",
+                "checkTable" : """
+SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'persons'
+""",
+            },
+            "objects" : {
+                "createTable" : """
+CREATE TABLE objects (
+    objectId INTEGER PRIMARY KEY AUTOINCREMENT,
+    x_0 INT NOT NULL,
+    y_0 INT NOT NULL,
+    x_1 INT NOT NULL,
+    y_1 INT NOT NULL,
+    frameId INT NOT NULL,
+    personId INT,
+    FOREIGN KEY (personId) REFERENCES persons (personId),
+    FOREIGN KEY (frameId) REFERENCES frames (frameId)
+);
+""",
+                "checkTable" : """
+SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'objects'
+""",
+            },
+            "schemaVersion" : {
+                "checkTable" : """
+SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schemaVersion'
+""",
+                "checkColumn" : """
+SELECT name FROM pragma_table_info(%s) WHERE name = %s;
+""",
+                "checkIndex" : """
+SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s;
+""",
+            },
+        },
+        "migrations" : {
+            1 : {
+                "queries" : [
+                    {
+                        "column" : ("frames", "claimId"),
+                        "query" : """
+ALTER TABLE frames ADD COLUMN claimId VARCHAR(128);
+""",
+                    },
+                    {
+                        "column" : ("frames", "claimTimestamp"),
+                        "query" : """
+ALTER TABLE frames ADD COLUMN claimTimestamp BIGINT;
+""",
+                    },
+                ],
+            },
+        },
+    },
+}
+
+
+def getSchemas(backend : str) -> tuple:
+    """
+    Function to get the queries and migrations of a backend, the queries of the dialect of the backend
+    replace the ones of tables and migrations
+    """
+    dialect : dict = dialects.get(backend, {"tables" : {}, "migrations" : {}})
+    backendTables : dict = dict()
+    for table in list(tables.keys()):
+        backendTables.update({
+            table : dict(tables[table], **dialect["tables"].get(table, {})),
+        })
+    backendMigrations : list = [
+        dict(migration, **dialect["migrations"].get(migration["version"], {})) for migration in migrations
+    ]
+
+    return backendTables, backendMigrations
@@ -0,0 +1,59 @@
+import asyncio
+import copy
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.baseModule.baseModule import BaseModule
+from modules.interfaceDatabase.asyncInterfaceDatabase import AsyncInterfaceDatabase
+from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
+
+class AsyncInterfaceDatabaseTest(unittest.TestCase):
+    """
+    Async Interface Database Unit Tests, run on the SQLite backend so no MySQL server is needed
+    """
+    def setUp(self):
+        self.__folder : tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        baseModule : BaseModule = BaseModule()
+        self.__config : dict = copy.deepcopy(baseModule.getConfig())
+        self.__config["database"]["backend"] = "sqlite"
+        self.__config["database"]["sleepDatabase"] = 0
+        self.__paths : dict = copy.deepcopy(baseModule.getPaths())
+        self.__paths["files"]["sqliteDatabase"] = os.path.join(self.__folder.name, "predictions.db")
+        self.__patches : list = list()
+        for moduleClass in [InterfaceDatabase, AsyncInterfaceDatabase]:
+            self.__patches.append(patch.object(moduleClass, "getConfig", return_value=self.__config))
+            self.__patches.append(patch.object(moduleClass, "getPaths", return_value=self.__paths))
+        for patchObject in self.__patches:
+            patchObject.start()
+
+    def tearDown(self):
+        for patchObject in self.__patches:
+            patchObject.stop()
+        self.__folder.cleanup()
+
+    def test_queries(self):
+        """
+        Test the queries of AsyncInterfaceDatabase read the rows written by InterfaceDatabase
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        frameId : int = interfaceDatabase.storeNewFrame("/camera1/01-01-2024_00:00:00.000000.png")
+        objectIds : list = interfaceDatabase.storeNewObjects(frameId, [[1, 2, 3, 4]])
+        personId : int = interfaceDatabase.createNewPerson()
+        interfaceDatabase.updatePersonIdFromObjectId(objectIds[0], personId)
+        asyncInterfaceDatabase : AsyncInterfaceDatabase = AsyncInterfaceDatabase()
+
+        async def queries() -> list:
+            return await asyncio.gather(
+                asyncInterfaceDatabase.getCameras(),
+                asyncInterfaceDatabase.getPersonDetectionWatermark(),
+                asyncInterfaceDatabase.getCoordinatesByPersonId(personId),
+            )
+        cameras, watermark, coordinates = asyncio.run(queries())
+
+        self.assertEqual(cameras, ["camera1"])
+        self.assertEqual(watermark, frameId)
+        self.assertEqual(coordinates, [[1, 2, 3, 4]])
+
+if __name__ == '__main__':
+    unittest.main()
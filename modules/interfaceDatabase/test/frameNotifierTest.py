@@ -0,0 +1,25 @@
+import tempfile
+import unittest
+from modules.interfaceDatabase.frameNotifier import FrameNotifier
+
+class FrameNotifierTest(unittest.TestCase):
+    """
+    Frame Notifier Unit Tests
+    """
+    def test_wait(self):
+        """
+        Test wait Method
+        """
+        with tempfile.TemporaryDirectory() as registryFolder:
+            subscriber : FrameNotifier = FrameNotifier(registryFolder, refreshInterval=0)
+            publisher : FrameNotifier = FrameNotifier(registryFolder, refreshInterval=0)
+
+            self.assertFalse(subscriber.wait(0.01))
+            publisher.publish(1)
+            publisher.publish(2)
+
+            self.assertTrue(subscriber.wait(1))
+            self.assertFalse(subscriber.wait(0.01))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import copy
+import os
+import signal
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from modules.baseModule.baseModule import BaseModule
+from modules.interfaceDatabase import schemas
+from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
+
+class InterfaceDatabaseTest(unittest.TestCase):
+    """
+    Interface Database Unit Tests, run on the SQLite backend so no MySQL server is needed
+    """
+    def setUp(self):
+        self.__folder : tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        baseModule : BaseModule = BaseModule()
+        self.__config : dict = copy.deepcopy(baseModule.getConfig())
+        self.__config["database"]["backend"] = "sqlite"
+        self.__config["database"]["sleepDatabase"] = 0
+        self.__paths : dict = copy.deepcopy(baseModule.getPaths())
+        self.__paths["files"]["sqliteDatabase"] = os.path.join(self.__folder.name, "predictions.db")
+        self.__patches : list = [
+            patch.object(InterfaceDatabase, "getConfig", return_value=self.__config),
+            patch.object(InterfaceDatabase, "getPaths", return_value=self.__paths),
+        ]
+        for patchObject in self.__patches:
+            patchObject.start()
+
+    def tearDown(self):
+        for patchObject in self.__patches:
+            patchObject.stop()
+        self.__folder.cleanup()
+
+    def __storeFrames(self, interfaceDatabase : InterfaceDatabase, numberFrames : int):
+        """
+        Tool to store frames with consecutive timestamps
+        """
+        for index in range(numberFrames):
+            interfaceDatabase.storeNewFrame("/camera1/01-01-2024_00:00:0" + str(index) + ".000000.png")
+
+    def test_migrations(self):
+        """
+        Test the tables are created and migrated to the last version
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        InterfaceDatabase()
+
+        self.__storeFrames(interfaceDatabase, 1)
+
+        self.assertEqual(interfaceDatabase.getNextEntryPersonDetected(), 1)
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(1, "worker-1", 60), [1])
+
+    def test_migrationsInterrupted(self):
+        """
+        Test a migration interrupted after some of its queries is completed by the next start
+        """
+        InterfaceDatabase()
+        connection : sqlite3.Connection = sqlite3.connect(self.__paths["files"]["sqliteDatabase"])
+        connection.execute("DROP INDEX framesClaimId;")
+        connection.execute("DROP INDEX objectsFrameId;")
+        connection.execute("UPDATE schemaVersion SET version = 1;")
+        connection.commit()
+
+        InterfaceDatabase()
+
+        indexes : list = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index';")]
+        version : int = connection.execute("SELECT version FROM schemaVersion;").fetchone()[0]
+        connection.close()
+        self.assertIn("framesClaimId", indexes)
+        self.assertIn("objectsFrameId", indexes)
+        self.assertEqual(version, schemas.migrations[-1]["version"])
+
+    def test_claimNextEntriesPersonDetected(self):
+        """
+        Test claimNextEntriesPersonDetected Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        self.__storeFrames(interfaceDatabase, 3)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-1", 60), [1, 2])
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-2", 60), [3])
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-3", -1), [1, 2])
+
+    def test_getPersonDetectionWatermarkPersistenceFailed(self):
+        """
+        Test the watermark stays at the first frame of a batch whose persistence failed while the next batches
+        are detected, and the frame is detected again once its lease expires
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        self.__storeFrames(interfaceDatabase, 4)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(3, "worker-1", 60), [1, 2, 3])
+        interfaceDatabase.updatePersonDetected(1)
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(3, "worker-2", 60), [4])
+        interfaceDatabase.updatePersonDetected(4)
+
+        self.assertEqual(interfaceDatabase.getPersonDetectionWatermark(), 2)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(3, "worker-3", -1), [2, 3])
+        interfaceDatabase.updatePersonDetected(2)
+        interfaceDatabase.updatePersonDetected(3)
+
+        self.assertEqual(interfaceDatabase.getPersonDetectionWatermark(), 5)
+
+    def test_setFrameReady(self):
+        """
+        Test a frame inserted not ready is not claimed until setFrameReady, and the frames after it are not
+        action detected before it
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        frameId : int = interfaceDatabase.storeNewFrame("/camera1/01-01-2024_00:00:00.000000.jpg", ready=False)
+        self.__storeFrames(interfaceDatabase, 1)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-1", 60), [2])
+        interfaceDatabase.updatePersonDetected(2)
+        self.assertEqual(interfaceDatabase.getPersonDetectionWatermark(), frameId)
+
+        interfaceDatabase.setFrameReady(frameId)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-2", 60), [frameId])
+
+    def test_getNextEntryPersonDetectedNotReady(self):
+        """
+        Test the next entry of person detected stays at a frame not ready while a later frame is detected
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        frameId : int = interfaceDatabase.storeNewFrame("/camera1/01-01-2024_00:00:00.000000.jpg", ready=False)
+        self.__storeFrames(interfaceDatabase, 1)
+
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-1", 60), [2])
+        interfaceDatabase.updatePersonDetected(2)
+
+        self.assertEqual(interfaceDatabase.getNextEntryPersonDetected(), frameId)
+        self.assertEqual(interfaceDatabase.getPersonDetectionWatermark(), frameId)
+
+    def test_deleteFramesNotReady(self):
+        """
+        Test deleteFramesNotReady Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        interfaceDatabase.storeNewFrame("/camera1/01-01-2024_00:00:00.000000.jpg", ready=False)
+        self.__storeFrames(interfaceDatabase, 1)
+
+        interfaceDatabase.deleteFramesNotReady()
+        interfaceDatabase.deleteFramesNotReady()
+
+        self.assertEqual(interfaceDatabase.getCameras(), ["camera1"])
+        self.assertEqual(interfaceDatabase.claimNextEntriesPersonDetected(2, "worker-1", 60), [2])
+
+    def test_storeNewObjects(self):
+        """
+        Test storeNewObjects Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        self.__storeFrames(interfaceDatabase, 1)
+
+        objectIds : list = interfaceDatabase.storeNewObjects(1, [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+        self.assertEqual(objectIds, [1, 2])
+        self.assertEqual(interfaceDatabase.getObjectsCoordinatesFromFrameId(1), [[1, 1, 2, 3, 4], [2, 5, 6, 7, 8]])
+        self.assertEqual(interfaceDatabase.storeNewObjects(1, []), [])
+
+    def test_transaction(self):
+        """
+        Test transaction Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+
+        with interfaceDatabase.transaction():
+            personId : int = interfaceDatabase.createNewPerson()
+        with self.assertRaises(ValueError):
+            with interfaceDatabase.transaction():
+                interfaceDatabase.createNewPerson()
+                raise ValueError()
+
+        self.assertEqual(interfaceDatabase.getActivePersons(), [personId])
+
+    def test_queryTrace(self):
+        """
+        Test the queries per stage of getQueryTrace Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        interfaceDatabase.resetQueryTrace()
+
+        with interfaceDatabase.traceStage("saveImage"):
+            self.__storeFrames(interfaceDatabase, 2)
+        with interfaceDatabase.traceStage("storeObjects"):
+            interfaceDatabase.storeNewObjects(1, [[1, 2, 3, 4], [5, 6, 7, 8]])
+        queryTrace : dict = interfaceDatabase.getQueryTrace()
+
+        self.assertEqual(queryTrace["stages"]["saveImage"]["calls"], 1)
+        self.assertEqual(queryTrace["stages"]["saveImage"]["queries"], 2)
+        self.assertEqual(queryTrace["stages"]["storeObjects"]["queriesPerCall"], 1)
+        self.assertEqual(queryTrace["queries"]["frames.insertNewFrame"]["calls"], 2)
+        self.assertGreaterEqual(queryTrace["queries"]["frames.insertNewFrame"]["p99Ms"], 0)
+
+    def test_registerTraceSignal(self):
+        """
+        Test the handler of SIGUSR1 is only installed by registerTraceSignal and dumps the query trace
+        """
+        self.__paths["folders"]["logs"] = self.__folder.name
+        previousHandler : any = signal.getsignal(signal.SIGUSR1)
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+
+        self.assertIs(signal.getsignal(signal.SIGUSR1), previousHandler)
+
+        try:
+            interfaceDatabase.registerTraceSignal()
+            os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previousHandler)
+
+        self.assertTrue(os.path.exists(os.path.join(self.__folder.name, "queryTrace." + str(os.getpid()) + ".yaml")))
+
+    def test_dialects(self):
+        """
+        Test the queries of the dialects replace existing queries
+        """
+        for dialect in list(schemas.dialects.values()):
+            for table in list(dialect["tables"].keys()):
+                for name in list(dialect["tables"][table].keys()):
+                    self.assertIn(name, schemas.tables[table])
+            versions : list = [migration["version"] for migration in schemas.migrations]
+            for version in list(dialect["migrations"].keys()):
+                self.assertIn(version, versions)
+
+if __name__ == '__main__':
+    unittest.main()
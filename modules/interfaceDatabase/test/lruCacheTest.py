@@ -0,0 +1,38 @@
+import unittest
+from modules.interfaceDatabase.lruCache import LruCache
+
+class LruCacheTest(unittest.TestCase):
+    """
+    LRU Cache Unit Tests
+    """
+    def test_get(self):
+        """
+        Test get Method
+        """
+        cache : LruCache = LruCache(2)
+        loads : list = list()
+        load : callable = lambda key: lambda: loads.append(key) or [key]
+
+        self.assertEqual(cache.get(("a",), load("a")), ["a"])
+        self.assertEqual(cache.get(("b",), load("b")), ["b"])
+        self.assertEqual(cache.get(("a",), load("a")), ["a"])
+        self.assertEqual(cache.get(("c",), load("c")), ["c"])
+        self.assertEqual(cache.get(("b",), load("b")), ["b"])
+
+        self.assertEqual(loads, ["a", "b", "c", "b"])
+        self.assertEqual(cache.getStats(), {"hits" : 1, "misses" : 4, "entries" : 2})
+
+    def test_invalidate(self):
+        """
+        Test invalidate Method, None values are not cached
+        """
+        cache : LruCache = LruCache(2)
+        cache.get(("a",), lambda: None)
+        cache.get(("b",), lambda: ["b"])
+        cache.invalidate()
+
+        self.assertEqual(cache.getStats()["entries"], 0)
+        self.assertEqual(cache.get(("b",), lambda: ["c"]), ["c"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from modules.interfaceDatabase.queryTracer import QueryTracer
+
+class QueryTracerTest(unittest.TestCase):
+    """
+    Query Tracer Unit Tests
+    """
+    def test_record(self):
+        """
+        Test record Method, the queries are recorded in the innermost stage
+        """
+        queryTracer : QueryTracer = QueryTracer(100)
+
+        queryTracer.record("frames.getFrames", 1.0)
+        with queryTracer.stage("predictPerson"):
+            queryTracer.record("frames.getFrames", 3.0)
+            with queryTracer.stage("persist"):
+                queryTracer.record("objects.insertNewObject", 2.0)
+                queryTracer.record("objects.insertNewObject", 4.0)
+        with queryTracer.stage("predictPerson"):
+            queryTracer.record("frames.getFrames", 5.0)
+        stats : dict = queryTracer.getStats()
+
+        self.assertEqual(stats["queries"]["frames.getFrames"]["calls"], 3)
+        self.assertEqual(stats["queries"]["frames.getFrames"]["p50Ms"], 3.0)
+        self.assertEqual(stats["queries"]["frames.getFrames"]["p99Ms"], 5.0)
+        self.assertEqual(stats["stages"]["predictPerson"]["calls"], 2)
+        self.assertEqual(stats["stages"]["predictPerson"]["queriesPerCall"], 1.0)
+        self.assertEqual(stats["stages"]["persist"]["queries"], 2)
+        self.assertEqual(stats["stages"]["persist"]["totalMs"], 6.0)
+
+    def test_reset(self):
+        """
+        Test reset Method, only the last numberSamples latencies are kept
+        """
+        queryTracer : QueryTracer = QueryTracer(2)
+        for latencyMs in [10.0, 1.0, 1.0]:
+            queryTracer.record("frames.getFrames", latencyMs)
+
+        self.assertEqual(queryTracer.getStats()["queries"]["frames.getFrames"]["p99Ms"], 1.0)
+
+        queryTracer.reset()
+
+        self.assertEqual(queryTracer.getStats(), {"queries" : {}, "stages" : {}})
+
+if __name__ == '__main__':
+    unittest.main()
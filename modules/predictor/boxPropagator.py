@@ -0,0 +1,166 @@
+import cv2
+import numpy as np
+
+class BoxPropagator(object):
+    """
+    Class to propagate the boxes of the persons between detections, every box is followed by a constant velocity
+    Kalman filter corrected by the median optical flow of the points inside the box, the confidence of a box is
+    the fraction of its points tracked forward and backward consistently
+    """
+    def __init__(self, interval : int, minConfidence : float, scale : float):
+        self.__interval : int = interval
+        self.__minConfidence : float = minConfidence
+        self.__scale : float = scale
+        self.__cameras : dict = dict()
+
+    def prepareImage(self, imageNumpy : np.ndarray) -> np.ndarray:
+        """
+        Method to convert a frame to the scaled grayscale image used by the optical flow
+        """
+        gray : np.ndarray = imageNumpy
+        if len(imageNumpy.shape) == 3:
+            gray = cv2.cvtColor(imageNumpy[:, :, :3], cv2.COLOR_RGB2GRAY)
+        if self.__scale != 1:
+            gray = cv2.resize(gray, None, fx=self.__scale, fy=self.__scale, interpolation=cv2.INTER_AREA)
+
+        return gray
+
+    def scheduleDetections(self, cameras : list) -> list:
+        """
+        Method to decide which of the next frames, given by their camera, need the detector, one every interval
+        frames per camera, the propagator state is not modified
+        """
+        framesSinceDetection : dict = {camera : self.__cameras[camera]["framesSinceDetection"] for camera in self.__cameras}
+        detections : list = list()
+        for camera in cameras:
+            if camera not in framesSinceDetection or framesSinceDetection[camera] + 1 >= self.__interval:
+                framesSinceDetection[camera] = 0
+                detections.append(True)
+            else:
+                framesSinceDetection[camera] += 1
+                detections.append(False)
+
+        return detections
+
+    def __createKalmanFilter(self, box : np.ndarray) -> cv2.KalmanFilter:
+        """
+        Tool to create the Kalman filter of a box, state cx, cy, w, h and their velocities
+        """
+        kalmanFilter : cv2.KalmanFilter = cv2.KalmanFilter(8, 4)
+        kalmanFilter.transitionMatrix = np.eye(8, dtype=np.float32)
+        for index in range(4):
+            kalmanFilter.transitionMatrix[index, index + 4] = 1
+        kalmanFilter.measurementMatrix = np.eye(4, 8, dtype=np.float32)
+        kalmanFilter.processNoiseCov = np.eye(8, dtype=np.float32) * 1e-2
+        kalmanFilter.measurementNoiseCov = np.eye(4, dtype=np.float32) * 1e-1
+        kalmanFilter.errorCovPost = np.eye(8, dtype=np.float32)
+        kalmanFilter.statePost = np.array([
+            (box[0] + box[2]) / 2,
+            (box[1] + box[3]) / 2,
+            box[2] - box[0],
+            box[3] - box[1],
+            0, 0, 0, 0,
+        ], dtype=np.float32).reshape(8, 1)
+
+        return kalmanFilter
+
+    def reset(self, camera : str, image : np.ndarray, boxes : list):
+        """
+        Method to restart the tracks of a camera with the boxes of a detection, boxes in full frame coordinates
+        """
+        tracks : list = list()
+        for box in boxes:
+            scaledBox : np.ndarray = np.asarray(box, dtype=np.float32) * self.__scale
+            tracks.append({
+                "box" : scaledBox,
+                "kalmanFilter" : self.__createKalmanFilter(scaledBox),
+            })
+
+        self.__cameras[camera] = {
+            "image" : image,
+            "tracks" : tracks,
+            "framesSinceDetection" : 0,
+        }
+
+    def __trackPoints(self, previousImage : np.ndarray, image : np.ndarray, box : np.ndarray) -> tuple:
+        """
+        Tool to track the points inside a box, return the median displacement, the scale change and the confidence
+        """
+        height, width = previousImage.shape[:2]
+        x0, y0 = int(max(0, box[0])), int(max(0, box[1]))
+        x1, y1 = int(min(width, box[2])), int(min(height, box[3]))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None, 1.0, 0.0
+
+        mask : np.ndarray = np.zeros(previousImage.shape[:2], dtype=np.uint8)
+        mask[y0:y1, x0:x1] = 255
+        points : np.ndarray = cv2.goodFeaturesToTrack(previousImage, maxCorners=30, qualityLevel=0.01, minDistance=3, mask=mask)
+        if points is None or len(points) < 4:
+            gridX, gridY = np.meshgrid(np.linspace(x0, x1 - 1, 5), np.linspace(y0, y1 - 1, 5))
+            points = np.stack([gridX.ravel(), gridY.ravel()], axis=1).reshape(-1, 1, 2)
+        points = points.astype(np.float32)
+
+        nextPoints, status, error = cv2.calcOpticalFlowPyrLK(previousImage, image, points, None, winSize=(15, 15), maxLevel=2)
+        backPoints, backStatus, backError = cv2.calcOpticalFlowPyrLK(image, previousImage, nextPoints, None, winSize=(15, 15), maxLevel=2)
+        forwardBackwardError : np.ndarray = np.linalg.norm((points - backPoints).reshape(-1, 2), axis=1)
+        good : np.ndarray = (status.ravel() == 1) & (backStatus.ravel() == 1) & (forwardBackwardError < 1.0)
+
+        confidence : float = float(np.mean(good))
+        if good.sum() < 2:
+            return None, 1.0, confidence
+
+        previousGood : np.ndarray = points.reshape(-1, 2)[good]
+        nextGood : np.ndarray = nextPoints.reshape(-1, 2)[good]
+        displacement : np.ndarray = np.median(nextGood - previousGood, axis=0)
+        previousSpread : float = float(np.std(previousGood))
+        scaleChange : float = float(np.std(nextGood)) / previousSpread if previousSpread > 0 else 1.0
+
+        return displacement, scaleChange, confidence
+
+    def propagate(self, camera : str, image : np.ndarray) -> tuple:
+        """
+        Method to propagate the boxes of a camera to a new frame, return the boxes in full frame coordinates and
+        the lowest confidence of the boxes, a confidence below minConfidence means the detector is needed
+        """
+        state : dict = self.__cameras[camera]
+        boxes : list = list()
+        confidence : float = 1.0
+        for track in state["tracks"]:
+            kalmanFilter : cv2.KalmanFilter = track["kalmanFilter"]
+            kalmanFilter.predict()
+            displacement, scaleChange, trackConfidence = self.__trackPoints(state["image"], image, track["box"])
+            confidence = min(confidence, trackConfidence)
+
+            if displacement is not None:
+                box : np.ndarray = track["box"]
+                width : float = (box[2] - box[0]) * scaleChange
+                height : float = (box[3] - box[1]) * scaleChange
+                kalmanFilter.correct(np.array([
+                    (box[0] + box[2]) / 2 + displacement[0],
+                    (box[1] + box[3]) / 2 + displacement[1],
+                    width,
+                    height,
+                ], dtype=np.float32).reshape(4, 1))
+                estimate : np.ndarray = kalmanFilter.statePost.ravel()
+            else:
+                estimate = kalmanFilter.statePre.ravel()
+                kalmanFilter.statePost = kalmanFilter.statePre.copy()
+
+            track["box"] = np.array([
+                estimate[0] - estimate[2] / 2,
+                estimate[1] - estimate[3] / 2,
+                estimate[0] + estimate[2] / 2,
+                estimate[1] + estimate[3] / 2,
+            ], dtype=np.float32)
+            boxes.append((track["box"] / self.__scale).round().tolist())
+
+        state["image"] = image
+        state["framesSinceDetection"] += 1
+
+        return boxes, confidence
+
+    def isConfident(self, confidence : float) -> bool:
+        """
+        Method to check if the confidence of a propagation is enough to skip the detector
+        """
+        return confidence >= self.__minConfidence
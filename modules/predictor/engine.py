@@ -0,0 +1,112 @@
+import os
+from abc import ABC, abstractmethod
+import numpy as np
+import torch
+from yolov6.layers.common import DetectBackend, RepVGGBlock
+
+class InferenceEngine(ABC):
+    """
+    Class interface of the person detection engines, an engine receives the batch of letterboxed images
+    and returns the raw predictions of YOLO, ready for the non max suppression
+    """
+    stride : int = 32
+
+    @abstractmethod
+    def __call__(self, imagesTensor : torch.Tensor) -> torch.Tensor:
+        """
+        Method to run the forward pass
+        """
+
+class TorchEngine(InferenceEngine):
+    """
+    Class to run the person detection with the eager PyTorch model
+    """
+    def __init__(self, weightsPath : str, device : torch.device, half : bool, imgSize : list):
+        self.__model : DetectBackend = DetectBackend(weightsPath, device=device)
+
+        if half and (device.type != 'cpu'):
+            self.__model = self.__model.half()
+        else:
+            self.__model = self.__model.float()
+
+        if device.type != 'cpu':
+            self.__model(
+                torch.zeros(1, 3, *imgSize).to(device).type_as(next(self.__model.parameters()))
+            ) # warm up
+
+        self.stride = self.__model.stride
+
+    def __call__(self, imagesTensor : torch.Tensor) -> torch.Tensor:
+        """
+        Method to run the forward pass
+        """
+        return self.__model(imagesTensor)
+
+class OnnxRuntimeEngine(InferenceEngine):
+    """
+    Class to run the person detection with ONNX Runtime on CPU, the checkpoint is exported once to ONNX
+    and cached next to the checkpoint
+    """
+    def __init__(self, weightsPath : str, onnxPath : str, imgSize : list, threads : int):
+        import onnxruntime
+
+        if not os.path.exists(onnxPath):
+            OnnxRuntimeEngine.exportOnnx(weightsPath, onnxPath, imgSize)
+
+        sessionOptions : onnxruntime.SessionOptions = onnxruntime.SessionOptions()
+        sessionOptions.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            sessionOptions.intra_op_num_threads = threads
+
+        self.__session : onnxruntime.InferenceSession = onnxruntime.InferenceSession(
+            onnxPath,
+            sess_options=sessionOptions,
+            providers=["CPUExecutionProvider"],
+        )
+        self.__inputName : str = self.__session.get_inputs()[0].name
+        self.stride = int(self.__session.get_modelmeta().custom_metadata_map["stride"])
+
+    def exportOnnx(weightsPath : str, onnxPath : str, imgSize : list):
+        """
+        Static method to export the YOLOv6 checkpoint to ONNX with dynamic batch size, the stride is stored
+        in the model metadata
+        """
+        import onnx
+
+        detectBackend : DetectBackend = DetectBackend(weightsPath, device=torch.device("cpu"))
+        model : torch.nn.Module = detectBackend.model.float().eval()
+        for layer in model.modules():
+            if isinstance(layer, RepVGGBlock):
+                layer.switch_to_deploy()
+
+        onnxPathTmp : str = onnxPath + ".tmp"
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                torch.zeros(1, 3, *imgSize),
+                onnxPathTmp,
+                opset_version=13,
+                do_constant_folding=True,
+                input_names=["images"],
+                output_names=["outputs"],
+                dynamic_axes={
+                    "images" : {0 : "batch"},
+                    "outputs" : {0 : "batch"},
+                },
+            )
+
+        onnxModel : onnx.ModelProto = onnx.load(onnxPathTmp)
+        metadata : onnx.StringStringEntryProto = onnxModel.metadata_props.add()
+        metadata.key = "stride"
+        metadata.value = str(int(detectBackend.stride))
+        onnx.save(onnxModel, onnxPathTmp)
+        os.replace(onnxPathTmp, onnxPath)
+
+    def __call__(self, imagesTensor : torch.Tensor) -> torch.Tensor:
+        """
+        Method to run the forward pass
+        """
+        imagesNumpy : np.ndarray = np.ascontiguousarray(imagesTensor.detach().cpu().float().numpy())
+        prediction : np.ndarray = self.__session.run(None, {self.__inputName : imagesNumpy})[0]
+
+        return torch.from_numpy(prediction).to(imagesTensor.device)
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+class Matcher(object):
+    """
+    Class to associate the boxes of the active persons with the boxes of the objects of a frame
+
+    The cost matrix persons x objects is the root mean square distance between boxes, pairs where any
+    coordinate differs more than the box tolerance are gated, the assignment is solved globally
+    """
+    def __init__(self, boxTolerance : float):
+        self.__boxTolerance : float = boxTolerance
+
+    def computeCostMatrix(self, personsCoordinates : np.ndarray, objectsCoordinates : np.ndarray) -> tuple:
+        """
+        Method to compute the cost matrix persons x objects and the matrix of the pairs inside the tolerance
+        """
+        persons : np.ndarray = personsCoordinates.astype(np.float64)[:, None, :]
+        objects : np.ndarray = objectsCoordinates.astype(np.float64)[None, :, :]
+
+        tolerated : np.ndarray = np.all(
+            (objects <= (1 + self.__boxTolerance) * persons) & (objects >= (1 - self.__boxTolerance) * persons),
+            axis=2,
+        )
+        distances : np.ndarray = np.sqrt(np.mean((objects - persons) ** 2, axis=2))
+
+        return distances, tolerated
+
+    def match(self, personsCoordinates : list, objectsCoordinates : list) -> list:
+        """
+        Method to match persons and objects, return list of pairs (personIndex, objectIndex)
+        """
+        if len(personsCoordinates) == 0 or len(objectsCoordinates) == 0:
+            return list()
+
+        distances, tolerated = self.computeCostMatrix(
+            np.asarray(personsCoordinates).reshape(-1, 4),
+            np.asarray(objectsCoordinates).reshape(-1, 4),
+        )
+        if not tolerated.any():
+            return list()
+
+        costs : np.ndarray = np.where(tolerated, distances, distances[tolerated].max() * distances.size + 1)
+        personsIndexes, objectsIndexes = linear_sum_assignment(costs)
+
+        return [
+            (int(personIndex), int(objectIndex))
+            for personIndex, objectIndex in zip(personsIndexes, objectsIndexes)
+            if tolerated[personIndex, objectIndex]
+        ]
@@ -0,0 +1,73 @@
+import numpy as np
+
+class DetectionMetrics(object):
+    """
+    Class with the metrics to compare the detections of two models
+    """
+    def boxIou(boxes1 : np.ndarray, boxes2 : np.ndarray) -> np.ndarray:
+        """
+        Static method to compute the intersection over union matrix between two sets of boxes x_0, y_0, x_1, y_1
+        """
+        boxes1 = np.asarray(boxes1, dtype=np.float64).reshape(-1, 4)
+        boxes2 = np.asarray(boxes2, dtype=np.float64).reshape(-1, 4)
+
+        x0 : np.ndarray = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+        y0 : np.ndarray = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+        x1 : np.ndarray = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+        y1 : np.ndarray = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+        intersection : np.ndarray = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+
+        area1 : np.ndarray = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+        area2 : np.ndarray = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+        union : np.ndarray = area1[:, None] + area2[None, :] - intersection
+
+        return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+    def averagePrecision(references : list, predictions : list, iouThreshold : float) -> float:
+        """
+        Static method to compute the average precision of the predictions taking the references as ground truth,
+        references contains per frame an array of boxes and predictions per frame an array of boxes with score
+        """
+        numberReferences : int = sum([len(reference) for reference in references])
+        detections : list = list()
+        for frameIndex in range(len(predictions)):
+            for prediction in np.asarray(predictions[frameIndex]).reshape(-1, 5):
+                detections.append((float(prediction[4]), frameIndex, prediction[:4]))
+
+        if numberReferences == 0:
+            return 1.0 if len(detections) == 0 else 0.0
+
+        detections.sort(key=lambda detection: detection[0], reverse=True)
+        matched : list = [np.zeros(len(reference), dtype=bool) for reference in references]
+        truePositives : np.ndarray = np.zeros(len(detections))
+        for detectionIndex, (score, frameIndex, box) in enumerate(detections):
+            reference : np.ndarray = np.asarray(references[frameIndex]).reshape(-1, 4)
+            if len(reference) == 0:
+                continue
+            ious : np.ndarray = DetectionMetrics.boxIou(box, reference)[0]
+            ious[matched[frameIndex]] = -1
+            bestReference : int = int(np.argmax(ious))
+            if ious[bestReference] >= iouThreshold:
+                matched[frameIndex][bestReference] = True
+                truePositives[detectionIndex] = 1
+
+        cumulativeTruePositives : np.ndarray = np.cumsum(truePositives)
+        recall : np.ndarray = np.concatenate([[0.0], cumulativeTruePositives / numberReferences, [1.0]])
+        precision : np.ndarray = np.concatenate([[1.0], cumulativeTruePositives / np.arange(1, len(detections) + 1), [0.0]])
+        precision = np.maximum.accumulate(precision[::-1])[::-1]
+
+        return float(np.sum((recall[1:] - recall[:-1]) * precision[1:]))
+
+    def meanAveragePrecision(references : list, predictions : list) -> dict:
+        """
+        Static method to compute the mean average precision at iou 0.5 and averaged over iou 0.5:0.95
+        """
+        iouThresholds : np.ndarray = np.linspace(0.5, 0.95, 10)
+        averagePrecisions : list = [
+            DetectionMetrics.averagePrecision(references, predictions, float(iouThreshold)) for iouThreshold in iouThresholds
+        ]
+
+        return {
+            "mAP50" : averagePrecisions[0],
+            "mAP50_95" : float(np.mean(averagePrecisions)),
+        }
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+class MotionGate(object):
+    """
+    Class to detect static frames of a camera, a downscaled grayscale version of the frame is compared against
+    the last frame of the same camera that went through the detector, comparing against that reference instead
+    of the previous frame avoids slow changes accumulating without being detected
+    """
+    def __init__(self, threshold : float, downscaleWidth : int, maxConsecutiveGated : int):
+        self.__threshold : float = threshold
+        self.__downscaleWidth : int = downscaleWidth
+        self.__maxConsecutiveGated : int = maxConsecutiveGated
+        self.__references : dict = dict()
+        self.__consecutiveGated : dict = dict()
+        self.__stats : dict = {
+            "frames" : 0,
+            "gated" : 0,
+        }
+
+    def downscale(self, imageNumpy : np.ndarray) -> np.ndarray:
+        """
+        Method to convert a frame to the downscaled grayscale image used to compare frames
+        """
+        gray : np.ndarray = imageNumpy
+        if len(imageNumpy.shape) == 3:
+            gray = cv2.cvtColor(imageNumpy[:, :, :3], cv2.COLOR_RGB2GRAY)
+        height : int = max(1, int(round(gray.shape[0] * self.__downscaleWidth / gray.shape[1])))
+
+        return cv2.resize(gray, (self.__downscaleWidth, height), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def isStatic(self, camera : str, downscaled : np.ndarray) -> bool:
+        """
+        Method to decide if a frame is static, if not it becomes the reference of its camera
+        """
+        self.__stats["frames"] += 1
+        reference : np.ndarray = self.__references.get(camera)
+        consecutiveGated : int = self.__consecutiveGated.get(camera, 0)
+
+        if reference is not None and reference.shape == downscaled.shape and consecutiveGated < self.__maxConsecutiveGated:
+            if float(np.mean(np.abs(downscaled - reference))) / 255 < self.__threshold:
+                self.__stats["gated"] += 1
+                self.__consecutiveGated[camera] = consecutiveGated + 1
+                return True
+
+        self.__references[camera] = downscaled
+        self.__consecutiveGated[camera] = 0
+
+        return False
+
+    def getStats(self) -> dict:
+        """
+        Method to get the number of frames evaluated and gated
+        """
+        return dict(self.__stats)
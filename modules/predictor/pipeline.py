@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules.baseModule.baseModule import BaseModule
+
+class Pipeline(BaseModule):
+    """
+    Class to run the predictor as a staged pipeline connected by bounded queues
+
+    fetch + decode (worker threads) -> inference (calling thread) -> persistence (worker thread)
+
+    an item whose decoding fails is replaced by the decoded item built by decodeFailed, so it is still persisted
+    """
+    def __init__(self, source : callable, decode : callable, infer : callable, persist : callable, decodeFailed : callable):
+        super().__init__()
+        self.__pipelineConfig : dict = self.getConfig()["prediction"]["pipeline"]
+        self.__batchSize : int = self.getConfig()["prediction"]["batchSize"]
+        self.__source : callable = source
+        self.__decode : callable = decode
+        self.__infer : callable = infer
+        self.__persist : callable = persist
+        self.__decodeFailed : callable = decodeFailed
+        self.__decodeExecutor : ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.__pipelineConfig["decodeWorkers"],
+            thread_name_prefix="pipelineDecode",
+        )
+        self.__decodeQueue : queue.Queue = queue.Queue(maxsize=self.__pipelineConfig["queueSize"])
+        self.__persistenceQueue : queue.Queue = queue.Queue(maxsize=self.__pipelineConfig["queueSize"])
+        self.__stats : dict = {
+            "framesDecoded" : 0,
+            "framesInferred" : 0,
+            "framesPersisted" : 0,
+            "secondsInference" : 0.0,
+            "secondsPersistence" : 0.0,
+        }
+        self.__statsLock : threading.Lock = threading.Lock()
+
+    def __updateStats(self, key : str, value : float):
+        """
+        Tool to increase a pipeline counter
+        """
+        with self.__statsLock:
+            self.__stats[key] += value
+
+    def __decodeTask(self, item : any) -> any:
+        """
+        Tool to decode an item inside the decode worker threads
+        """
+        decoded : any = self.__decode(item)
+        self.__updateStats("framesDecoded", 1)
+
+        return decoded
+
+    def __fetchLoop(self):
+        """
+        Tool to fetch the next items from the source and submit them to the decode workers, the
+        futures are queued in order so the inference stage keeps the order of the source
+        """
+        while True:
+            try:
+                items : list = self.__source()
+            except Exception as e:
+                self.writeLog("Pipeline source failed, " + str(e), "ERROR")
+                time.sleep(self.getConfig()["prediction"]["sleepPrediction"])
+                continue
+
+            for item in items:
+                self.__decodeQueue.put((item, self.__decodeExecutor.submit(self.__decodeTask, item)))
+
+    def __persistenceLoop(self):
+        """
+        Tool to persist the inference results in order
+        """
+        while True:
+            decodedItems, results = self.__persistenceQueue.get()
+            timeStart : float = time.perf_counter()
+            try:
+                self.__persist(decodedItems, results)
+            except Exception as e:
+                self.writeLog("Pipeline persistence failed, " + str(e), "ERROR")
+            self.__updateStats("secondsPersistence", time.perf_counter() - timeStart)
+            self.__updateStats("framesPersisted", len(decodedItems))
+
+    def __nextBatch(self) -> list:
+        """
+        Tool to take the next batch of decoded items, it waits for the first one and takes the rest
+        only if they are already queued, so inference is never delayed to fill a batch, an item whose decoding
+        failed is replaced by its decodeFailed item
+        """
+        futures : list = [self.__decodeQueue.get()]
+        while len(futures) < self.__batchSize:
+            try:
+                futures.append(self.__decodeQueue.get_nowait())
+            except queue.Empty:
+                break
+
+        decodedItems : list = list()
+        for item, future in futures:
+            try:
+                decodedItems.append(future.result())
+            except Exception as e:
+                self.writeLog("Pipeline decode failed, " + str(e), "ERROR")
+                decodedItems.append(self.__decodeFailed(item))
+
+        return decodedItems
+
+    def getQueueDepths(self) -> dict:
+        """
+        Method to get the current depth of each stage queue
+        """
+        return {
+            "decode" : self.__decodeQueue.qsize(),
+            "persistence" : self.__persistenceQueue.qsize(),
+        }
+
+    def getStats(self) -> dict:
+        """
+        Method to get the pipeline counters together with the queue depths
+        """
+        with self.__statsLock:
+            stats : dict = dict(self.__stats)
+        stats.update(self.getQueueDepths())
+
+        return stats
+
+    def __logStats(self, elapsed : float):
+        """
+        Tool to log the pipeline stats, a full decode queue means inference is the bottleneck, a full
+        persistence queue means persistence is the bottleneck, both empty means decode is the bottleneck
+        """
+        stats : dict = self.getStats()
+        self.writeLog(
+            "Pipeline queue depths decode: " + str(stats["decode"]) + "/" + str(self.__pipelineConfig["queueSize"]) +
+            " persistence: " + str(stats["persistence"]) + "/" + str(self.__pipelineConfig["queueSize"]) +
+            " frames decoded: " + str(stats["framesDecoded"]) +
+            " inferred: " + str(stats["framesInferred"]) +
+            " persisted: " + str(stats["framesPersisted"]) +
+            " inference fps: " + str(round(stats["framesInferred"] / elapsed, 2)) +
+            " seconds inference: " + str(round(stats["secondsInference"], 2)) +
+            " seconds persistence: " + str(round(stats["secondsPersistence"], 2)),
+            "INFO",
+        )
+
+    def run(self):
+        """
+        Method to run the pipeline, the inference stage runs in the calling thread
+        """
+        threading.Thread(target=self.__fetchLoop, name="pipelineFetch", daemon=True).start()
+        threading.Thread(target=self.__persistenceLoop, name="pipelinePersistence", daemon=True).start()
+
+        timeStartPipeline : float = time.perf_counter()
+        timeLastStats : float = timeStartPipeline
+        while True:
+            decodedItems : list = self.__nextBatch()
+            if len(decodedItems) == 0:
+                continue
+
+            timeStart : float = time.perf_counter()
+            results : list = self.__infer(decodedItems)
+            timeEnd : float = time.perf_counter()
+            self.__updateStats("secondsInference", timeEnd - timeStart)
+            self.__updateStats("framesInferred", len(decodedItems))
+
+            self.__persistenceQueue.put((decodedItems, results))
+
+            if timeEnd - timeLastStats >= self.__pipelineConfig["statsInterval"]:
+                self.__logStats(timeEnd - timeStartPipeline)
+                timeLastStats = timeEnd
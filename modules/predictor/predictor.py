@@ -1,49 +1,124 @@
+import os
+import socket
 import numpy as np
 import time
 import torch
-from yolov6.layers.common import DetectBackend
+import torchvision
 from yolov6.utils.nms import non_max_suppression
 from yolov6.core.inferer import Inferer
 from modules.baseModule.baseModule import BaseModule
+from modules.frameRing.frameRing import FrameRing
 from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
+from modules.predictor.boxPropagator import BoxPropagator
+from modules.predictor.engine import InferenceEngine, OnnxRuntimeEngine, TorchEngine
+from modules.predictor.matcher import Matcher
+from modules.predictor.motionGate import MotionGate
+from modules.predictor.pipeline import Pipeline
+from modules.predictor.tracker import Tracker
 from modules.videoProcessing.videoProcessing import VideoProcessing
 
 class Predictor(BaseModule):
     """
     Class to predict persons and actions
+
+    The role selects the loop run by the process: all detects persons and predicts actions, detector only
+    detects persons, several detectors can run in parallel in one or more hosts claiming disjoint frames,
+    association only predicts actions, in frame order, for the frames already detected
     """
-    def __init__(self):
+    def __init__(self, role : str = "all"):
         super().__init__()
+        self.__role : str = role
         self.__yoloConfig = self.getConfig()["yolo"]
         self.__actionsConfig = self.getConfig()["actions"]
         self.__predictionConfig = self.getConfig()["prediction"]
         self.__yoloWeightsPath : str = self.__initYoloWeights()
         self.__interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
         self.__nextEntryPersonDetected, self.__nextEntryActionDetected = self.__initParamsDetectionIndex()
+        self.__tracker : Tracker = None
+        if self.__role != "detector":
+            self.__tracker = self.__initTracker()
+        self.__matcher : Matcher = Matcher(self.__actionsConfig["boxTolerance"])
         self.__videoProcessing : VideoProcessing = VideoProcessing()
         self.__device : torch.Tensor = self.__setupHardware()
-        self.__modelPersonDetection : DetectBackend = self.__setupModelPersonDetection()
+        self.__modelPersonDetection : InferenceEngine = None
+        if self.__role != "association":
+            self.__modelPersonDetection = self.__setupModelPersonDetection()
+        self.__workerId : str = socket.gethostname() + "-" + str(os.getpid())
+        self.__numberClaims : int = 0
+        self.__motionGateConfig : dict = self.__predictionConfig["motionGate"]
+        self.__motionGate : MotionGate = MotionGate(
+            threshold=self.__motionGateConfig["threshold"],
+            downscaleWidth=self.__motionGateConfig["downscaleWidth"],
+            maxConsecutiveGated=self.__motionGateConfig["maxConsecutiveGated"],
+        )
+        self.__keyFramesConfig : dict = self.__predictionConfig["keyFrames"]
+        self.__boxPropagator : BoxPropagator = BoxPropagator(
+            interval=self.__keyFramesConfig["interval"],
+            minConfidence=self.__keyFramesConfig["minTrackConfidence"],
+            scale=self.__keyFramesConfig["scale"],
+        )
+        self.__cameraRois : dict = self.__initCameraRois()
+        self.__frameRing : FrameRing = None
+        if self.getConfig()["frameRing"]["enabled"]:
+            self.__frameRing = FrameRing(
+                self.getConfig()["frameRing"]["name"],
+                self.getConfig()["frameRing"]["slots"],
+                self.getConfig()["frameRing"]["maxWidth"],
+                self.getConfig()["frameRing"]["maxHeight"],
+            )
+        self.__lastCoordinates : dict = dict()
+        self.__predictionStats : dict = {
+            "frames" : 0,
+            "propagated" : 0,
+            "redetected" : 0,
+        }
+        self.__timeLastPredictionStats : float = time.time()
 
     def __initParamsDetectionIndex(self) -> tuple:
         """
         Tool to init params related to database
         """
-        nextEntryPersonDetected = self.__interfaceDatabase.getNextEntryPersonDetected()
+        nextEntryPersonDetected = self.__interfaceDatabase.getPersonDetectionWatermark()
         nextEntryActionDetected = self.__interfaceDatabase.getNextEntryActionDetected()
 
         return nextEntryPersonDetected, nextEntryActionDetected
     
+    def __initTracker(self) -> Tracker:
+        """
+        Tool to rebuild the tracker of active persons from the database
+        """
+        tracker : Tracker = Tracker()
+        tracker.rebuild(self.__interfaceDatabase.getActivePersonsState())
+
+        return tracker
+
+    def __initCameraRois(self) -> dict:
+        """
+        Tool to get the regions of interest of the cameras, a camera can be configured as an url or as a
+        dictionary with url and roi, a list of rectangles [x_0, y_0, x_1, y_1] or polygons [[x, y], ...]
+        """
+        cameraRois : dict = dict()
+        for camera, cameraConfig in self.getConfig()["cameras"].items():
+            if isinstance(cameraConfig, dict) and cameraConfig.get("roi"):
+                cameraRois.update({
+                    camera : cameraConfig["roi"],
+                })
+
+        return cameraRois
+
     def __updateNextEntryPersonDetected(self):
         """
-        Tool to update next entry of person detected
+        Tool to update next entry of person detected to the person detection watermark, the frames claimed
+        later than an undetected frame, because it was not ready or its persistence failed, are detected
+        before it but their actions are not predicted until it is detected
         """
         while True:
             try:
-                nextEntryPersonDetected : int = self.__interfaceDatabase.getNextEntryPersonDetected()
+                nextEntryPersonDetected : int = self.__interfaceDatabase.getPersonDetectionWatermark()
                 self.__nextEntryPersonDetected = nextEntryPersonDetected
                 break
             except Exception as e:
-                self.writeLog("Could not update new entry, " + e, "WARNING")
+                self.writeLog("Could not update new entry, " + str(e), "WARNING")
                 time.sleep(self.__predictionConfig["sleepPrediction"])
 
     def __updateNextEntryActionDetected(self):
@@ -80,108 +155,295 @@ class Predictor(BaseModule):
 
         return torch.device(device)
 
-    def __setupModelPersonDetection(self):
+    def __setupModelPersonDetection(self) -> InferenceEngine:
         """
-        Tool to setup model person detection
+        Tool to setup model person detection with the engine selected in yolo.engine
         """
-        modelPersonDetection : DetectBackend = DetectBackend(
-            self.__yoloWeightsPath,
-            device=self.__device,
-        )
+        modelPersonDetection : InferenceEngine
+        if self.__yoloConfig["engine"] == "onnxruntime":
+            onnxPath : str = self.getPaths()["files"]["yoloOnnx"]
+            quantizationMode : str = self.getConfig()["quantization"]["mode"]
+            if quantizationMode != "none":
+                from modules.predictor.quantization import Quantization
 
-        if self.__yoloConfig["half"] and (self.__device.type != 'cpu'):
-            modelPersonDetection = modelPersonDetection.half()
+                onnxPath = Quantization().getQuantizedModel(quantizationMode)
+            modelPersonDetection = OnnxRuntimeEngine(
+                self.__yoloWeightsPath,
+                onnxPath,
+                imgSize=self.__yoloConfig["imgSize"],
+                threads=self.__yoloConfig["onnxThreads"],
+            )
         else:
-            modelPersonDetection = modelPersonDetection.float()
+            if self.getConfig()["quantization"]["mode"] != "none":
+                self.writeLog("Quantization is only supported with yolo.engine onnxruntime, running the torch model", "WARNING")
+            modelPersonDetection = TorchEngine(
+                self.__yoloWeightsPath,
+                device=self.__device,
+                half=self.__yoloConfig["half"],
+                imgSize=self.__yoloConfig["imgSize"],
+            )
 
-        if self.__device.type != 'cpu':
-             modelPersonDetection(
-                 torch.zeros(1, 3, *self.__yoloConfig["imgSize"]).to(self.__device).type_as(next(modelPersonDetection.parameters()))
-            ) # warm up
-             
         return modelPersonDetection
 
-    def __getNextImage(self) -> str:
-        """
-        Tool to get next image
-        """
-        return str(self.__interfaceDatabase.getImageFromFrameId(self.__nextEntryPersonDetected))
-    
     def __getImageCurrentActionPrediction(self) -> str:
         """
         Tool to get image of current action prediction index
         """
         return str(self.__interfaceDatabase.getImageFromFrameId(self.__nextEntryActionDetected))
     
-    def __getObjectsNextFrame(self) -> list:
-        """
-        Tool to get objects next image
-        """
-        return self.__interfaceDatabase.getObjectsIdFromFrameId(self.__nextEntryActionDetected)
-    
-    def __getActivePersons(self) -> list:
-        """
-        Tool to get persons that are still active
-        """
-        return self.__interfaceDatabase.getActivePersons()
-    
-    def __getCoordinates(self, personId : int = None, objectId : int = None) -> list:
+    def __getObjectsNextFrame(self) -> dict:
         """
-        Tool to get object 
+        Tool to get objects next image with their coordinates
         """
-        if personId is not None:
-            return self.__interfaceDatabase.getCoordinatesByPersonId(personId)
-        elif objectId is not None:
-            return self.__interfaceDatabase.getCoordinatesByObjectId(objectId)
-        
-    def __getNumberFramesFromObjectId(self, objectId : int) -> int:
-        """
-        Tool to get number frames from object
-        """
-        personId : int = self.__interfaceDatabase.getPersonIdFromObjectId(objectId)
-        frames : list = self.__interfaceDatabase.getFramesFromPersonId(personId)
+        objects : dict = dict()
+        for object in self.__interfaceDatabase.getObjectsCoordinatesFromFrameId(self.__nextEntryActionDetected):
+            objects.update({
+                int(object[0]) : [int(coordinate) for coordinate in object[1:5]],
+            })
 
-        return len(frames)
+        return objects
 
-    def __predict(self, img : torch.Tensor, imageNumpy: np.ndarray) -> torch.Tensor:
+    def __predict(self, img : torch.Tensor, imagesShape : list) -> list:
         """
-        Tool to predict from an image
+        Tool to predict from a batch of images, one detection tensor is returned per image scaled to its shape
         """
         prediction : torch.Tensor = self.__modelPersonDetection(img).clone().detach()
-        det : any = non_max_suppression(
+        detections : list = non_max_suppression(
             prediction=prediction,
             conf_thres=self.__yoloConfig["conf_thres"],
             iou_thres=self.__yoloConfig["iou_thres"],
             classes=None,
             agnostic=self.__yoloConfig["agnostic_nms"],
             max_det=self.__yoloConfig["max_det"],
-        )[0]
+        )
 
-        if len(det):
-            det[:, :4] = Inferer.rescale(img.shape[2:], det[:, :4], imageNumpy.shape).round()
+        for det, imageShape in zip(detections, imagesShape):
+            if len(det):
+                det[:, :4] = Inferer.rescale(img.shape[2:], det[:, :4], imageShape).round()
 
-        return det
-    
-    def __addNewPerson(self, objectId : int):
+        return detections
+
+    def __loadFrame(self, frameId : int) -> dict:
+        """
+        Tool to load the image of a frame and convert it to tensor, from the frame ring if the frame is still
+        there, otherwise from disk
+        """
+        imagePath : str = str(self.__interfaceDatabase.getImageFromFrameId(frameId))
+        camera : str = os.path.basename(os.path.dirname(imagePath))
+        imageTensor : torch.Tensor = None
+        imageNumpy : np.ndarray = None
+        if self.__frameRing is not None:
+            imageNumpy = self.__frameRing.read(frameId)
+        crops : list = None
+        motionImage : np.ndarray = None
+        trackingImage : np.ndarray = None
+        try:
+            if camera in self.__cameraRois:
+                imageTensor, imageNumpy, crops = self.__videoProcessing.processImageRoisToTensorPersonDetection(
+                    imagePath,
+                    rois = self.__cameraRois[camera],
+                    imgSize = self.__yoloConfig["imgSize"],
+                    stride = self.__modelPersonDetection.stride,
+                    half = self.__yoloConfig["half"],
+                    device = self.__device,
+                    imageNumpy = imageNumpy,
+                )
+            else:
+                imageTensor, imageNumpy = self.__videoProcessing.processImageToTensorPersonDetection(
+                    imagePath,
+                    imgSize = self.__yoloConfig["imgSize"],
+                    stride = self.__modelPersonDetection.stride,
+                    half = self.__yoloConfig["half"],
+                    device = self.__device,
+                    imageNumpy = imageNumpy,
+                )
+                crops = [{
+                    "offset" : [0, 0],
+                    "shape" : imageNumpy.shape,
+                }]
+            if self.__motionGateConfig["enabled"]:
+                motionImage = self.__motionGate.downscale(imageNumpy)
+            if self.__keyFramesConfig["enabled"]:
+                trackingImage = self.__boxPropagator.prepareImage(imageNumpy)
+        except Exception as e:
+            self.writeLog("Image " + imagePath + " could not be processed" + str(e), "ERROR")
+
+        return {
+            "frameId" : frameId,
+            "imagePath" : imagePath,
+            "camera" : camera,
+            "imageTensor" : imageTensor,
+            "imageNumpy" : imageNumpy,
+            "crops" : crops,
+            "motionImage" : motionImage,
+            "trackingImage" : trackingImage,
+        }
+
+    def __emptyFrame(self, frameId : int) -> dict:
+        """
+        Tool to get a frame without image, the frame is not predicted and it is persisted without persons
+        """
+        return {
+            "frameId" : frameId,
+            "imagePath" : None,
+            "camera" : None,
+            "imageTensor" : None,
+            "imageNumpy" : None,
+            "crops" : None,
+            "motionImage" : None,
+            "trackingImage" : None,
+        }
+
+    def __mergeCrops(self, predictions : list, crops : list) -> torch.Tensor:
+        """
+        Tool to map the detections of the regions of interest of a frame to full frame coordinates and merge them,
+        the persons detected twice in overlapping regions are removed with non max suppression
+        """
+        if len(predictions) == 1 and crops[0]["offset"] == [0, 0]:
+            return predictions[0]
+
+        for prediction, crop in zip(predictions, crops):
+            prediction[:, [0, 2]] += crop["offset"][0]
+            prediction[:, [1, 3]] += crop["offset"][1]
+        prediction : torch.Tensor = torch.cat(predictions, dim=0)
+        if len(predictions) > 1 and len(prediction) > 0:
+            keep : torch.Tensor = torchvision.ops.nms(prediction[:, :4], prediction[:, 4], self.__yoloConfig["iou_thres"])
+            prediction = prediction[keep]
+
+        return prediction
+
+    def __detectFrames(self, frames : list, indexes : list, coordinatesFrames : list):
+        """
+        Tool to run the detector over several frames stacked in a single forward pass, the regions of interest
+        of all the frames are part of the same batch
+        """
+        if len(indexes) == 0:
+            return
+
+        imagesTensor : torch.Tensor = torch.cat([frames[index]["imageTensor"] for index in indexes], dim=0)
+        predictions : list = self.__predict(imagesTensor, [crop["shape"] for index in indexes for crop in frames[index]["crops"]])
+
+        position : int = 0
+        for index in indexes:
+            numberCrops : int = len(frames[index]["crops"])
+            prediction : torch.Tensor = self.__mergeCrops(predictions[position:position + numberCrops], frames[index]["crops"])
+            position += numberCrops
+            coordinatesFrames[index] = self.__getCoordinatesPersons(prediction, frames[index]["imageTensor"])
+
+    def __coordinatesToBoxes(self, coordinates : dict) -> list:
         """
-        Tool to add new person in database
+        Tool to convert the coordinates of the persons of a frame to a list of boxes
         """
-        self.__interfaceDatabase.createNewPerson()
-        personId : int = self.__interfaceDatabase.getNewPerson()
-        self.__interfaceDatabase.updatePersonIdFromObjectId(objectId, personId)
+        return [
+            [float(coordinates[index]["x_0"]), float(coordinates[index]["y_0"]), float(coordinates[index]["x_1"]), float(coordinates[index]["y_1"])]
+            for index in list(coordinates.keys())
+        ]
 
-    def __updatePersonsAsCompleted(self, personId : int):
+    def __boxesToCoordinates(self, boxes : list) -> dict:
         """
-        Tool to update person as completed
+        Tool to convert a list of boxes to the coordinates of the persons of a frame
         """
-        self.__interfaceDatabase.setPersonAsCompleted(personId)
+        coordinates : dict = dict()
+        for index in range(len(boxes)):
+            coordinates.update({
+                index : {
+                    "x_0" : boxes[index][0],
+                    "y_0" : boxes[index][1],
+                    "x_1" : boxes[index][2],
+                    "y_1" : boxes[index][3],
+                }
+            })
+
+        return coordinates
 
-    def __updatePersonAsIdle(self, objectId : int):
+    def __predictFrames(self, frames : list) -> list:
+        """
+        Tool to predict persons from several frames stacked in a single forward pass, static frames are gated
+        by the motion gate and receive the persons detected in the last frame predicted of the same camera, if
+        prediction.keyFrames.enabled the detector only runs every prediction.keyFrames.interval frames per camera
+        and the boxes are propagated by the box propagator in between
+        """
+        coordinatesFrames : list = [dict() for frame in frames]
+        indexes : list = list()
+        gatedIndexes : set = set()
+        for index in range(len(frames)):
+            if frames[index]["imageTensor"] is None:
+                continue
+            if frames[index]["motionImage"] is not None and self.__motionGate.isStatic(frames[index]["camera"], frames[index]["motionImage"]):
+                gatedIndexes.add(index)
+            else:
+                indexes.append(index)
+
+        detectionIndexes : list = indexes
+        if self.__keyFramesConfig["enabled"]:
+            detections : list = self.__boxPropagator.scheduleDetections([frames[index]["camera"] for index in indexes])
+            detectionIndexes = [index for index, detection in zip(indexes, detections) if detection]
+
+        self.__detectFrames(frames, detectionIndexes, coordinatesFrames)
+
+        detectionIndexes = set(detectionIndexes)
+        for index in range(len(frames)):
+            camera : str = frames[index]["camera"]
+            if index in gatedIndexes:
+                coordinatesFrames[index] = dict(self.__lastCoordinates.get(camera, dict()))
+            elif frames[index]["imageTensor"] is not None:
+                if self.__keyFramesConfig["enabled"]:
+                    if index not in detectionIndexes:
+                        boxes, confidence = self.__boxPropagator.propagate(camera, frames[index]["trackingImage"])
+                        if self.__boxPropagator.isConfident(confidence):
+                            coordinatesFrames[index] = self.__boxesToCoordinates(boxes)
+                            self.__predictionStats["propagated"] += 1
+                        else:
+                            self.__detectFrames(frames, [index], coordinatesFrames)
+                            detectionIndexes.add(index)
+                            self.__predictionStats["redetected"] += 1
+                    if index in detectionIndexes:
+                        self.__boxPropagator.reset(camera, frames[index]["trackingImage"], self.__coordinatesToBoxes(coordinatesFrames[index]))
+                self.__lastCoordinates[camera] = coordinatesFrames[index]
+
+        self.__predictionStats["frames"] += len(frames)
+        self.__logPredictionStats()
+
+        return coordinatesFrames
+
+    def __logPredictionStats(self):
+        """
+        Tool to log every prediction.statsInterval seconds how many frames skipped the detector, gated by the motion
+        gate or propagated by the box propagator, and how many propagations were redetected for low confidence
+        """
+        timeNow : float = time.time()
+        if timeNow - self.__timeLastPredictionStats >= self.__predictionConfig["statsInterval"]:
+            self.writeLog(
+                "Prediction stats frames: " + str(self.__predictionStats["frames"]) +
+                " gated by motion gate: " + str(self.__motionGate.getStats()["gated"]) +
+                " propagated: " + str(self.__predictionStats["propagated"]) +
+                " redetected: " + str(self.__predictionStats["redetected"]) +
+                " database cache: " + str(self.__interfaceDatabase.getCacheStats()) +
+                " frame ring: " + str(self.__frameRing.getStats() if self.__frameRing is not None else None),
+                "INFO",
+            )
+            self.__timeLastPredictionStats = timeNow
+
+    def __addNewPerson(self, objectId : int, coordinates : list, timestamp : int) -> int:
+        """
+        Tool to add new person in database and in the tracker
+        """
+        personId : int = self.__interfaceDatabase.createNewPerson()
+        self.__tracker.addPerson(personId, objectId, coordinates, self.__nextEntryActionDetected, timestamp)
+
+        return personId
+
+    def __flushTracker(self):
         """
-        Tool to classify person as idle
+        Tool to write the pending changes of the tracker in database
         """
-        personId : int = self.__interfaceDatabase.getPersonIdFromObjectId(objectId)
-        self.__interfaceDatabase.setIdleClasification(personId)
+        pendingChanges : dict = self.__tracker.popPendingChanges()
+        for objectId, personId in pendingChanges["objects"]:
+            self.__interfaceDatabase.updatePersonIdFromObjectId(objectId, personId)
+        for personId in pendingChanges["idle"]:
+            self.__interfaceDatabase.setIdleClasification(personId)
+        for personId in pendingChanges["completed"]:
+            self.__interfaceDatabase.setPersonAsCompleted(personId)
 
     def __getCurrenTimestamp(self) -> int:
         """
@@ -195,13 +457,6 @@ class Predictor(BaseModule):
         """
         self.__interfaceDatabase.setAnnotatedImagePath(imagePath, self.__nextEntryActionDetected)
 
-    def __getPersonTimestamp(self, personId : int) -> int:
-        """
-        Tool to get object timestamp
-        """
-        frameId : int = self.__interfaceDatabase.getFrameIdFromPersonId(personId)
-        return self.__interfaceDatabase.getTimestampFromFrameId(frameId)
-    
     def __getImagesFromPersonId(self, personId) -> dict:
         """
         Tool to get images from Person Id
@@ -256,93 +511,104 @@ class Predictor(BaseModule):
 
         return coordinates
 
-    def __updateDatabasePerson(self, coordinates : dict):
+    def __updateDatabasePerson(self, frameId : int, coordinates : dict):
         """
-        Tool to update new persons detected
+        Tool to update new persons detected, the objects of the frame and the frame as person detected are
+        written in a single transaction
         """
-        self.__interfaceDatabase.updatePersonDetected(self.__nextEntryPersonDetected)
-        for index in list(coordinates.keys()):
-            self.__interfaceDatabase.storeNewObject(
-                self.__nextEntryPersonDetected,
-                int(coordinates[index]["x_0"]),
-                int(coordinates[index]["y_0"]),
-                int(coordinates[index]["x_1"]),
-                int(coordinates[index]["y_1"]),
-            )
-        self.__updateNextEntryPersonDetected()
+        with self.__interfaceDatabase.transaction():
+            self.__interfaceDatabase.storeNewObjects(frameId, self.__coordinatesToBoxes(coordinates))
+            self.__interfaceDatabase.updatePersonDetected(frameId)
+        self.__interfaceDatabase.publishFrame(frameId)
 
-    def __compareCoordinates(self, coordinates1 : list, coordinates2 : list) -> tuple:
+    def __createImagePrediction(self, objects : dict, objectsPerson : dict) -> str:
         """
-        Tool to compare coordinates according to the configured tolerance
-        """
-        tolerance : float = self.__actionsConfig["boxTolerance"]
-        tolerated : bool = True
-        if int(coordinates1[0]) > (1 + tolerance) * int(coordinates2[0]) or int(coordinates1[0]) < (1 - tolerance) * int(coordinates2[0]):
-            tolerated = False
-        if int(coordinates1[1]) > (1 + tolerance) * int(coordinates2[1]) or int(coordinates1[1]) < (1 - tolerance) * int(coordinates2[1]):
-            tolerated = False
-        if int(coordinates1[2]) > (1 + tolerance) * int(coordinates2[2]) or int(coordinates1[2]) < (1 - tolerance) * int(coordinates2[2]):
-            tolerated = False
-        if int(coordinates1[3]) > (1 + tolerance) * int(coordinates2[3]) or int(coordinates1[3]) < (1 - tolerance) * int(coordinates2[3]):
-            tolerated = False
-
-        distance : float = ((((coordinates1[0] - coordinates2[0])**2) + ((coordinates1[1] - coordinates2[1])**2) + ((coordinates1[2] - coordinates2[2])**2) + ((coordinates1[3] - coordinates2[3])**2)) / len(coordinates1)) ** (1/2)
-
-        return tolerated, distance
-    
-    def __createImagePrediction(self, objects : list):
-        """
-        Tool to create image prediction
+        Tool to create image prediction, return the path of the annotated image, the objects without person in
+        objectsPerson start a new person so they are not idle
         """
         imagePath : str = self.__getImageCurrentActionPrediction()
 
         coordinatesDict : dict = dict()
 
-        for object in objects:
-            numberFrames : int = self.__getNumberFramesFromObjectId(object)
+        for object in list(objects.keys()):
             annotationIdle : bool = False
 
-            if numberFrames > self.__actionsConfig["idleFrames"]:
+            if object in objectsPerson and self.__tracker.getPerson(objectsPerson[object])["numberFrames"] > self.__actionsConfig["idleFrames"]:
                 annotationIdle = True
-                self.__updatePersonAsIdle(object)
+                self.__tracker.setPersonIdle(objectsPerson[object])
             coordinatesDict.update({
                 object : {
-                    "coordinates" : self.__getCoordinates(objectId=object)[0],
+                    "coordinates" : objects[object],
                     "annotation" : annotationIdle,
                 }
             })
 
-        annotatedImagePath : str = self.__videoProcessing.annotateImage(imagePath, coordinatesDict)
+        imageNumpy : np.ndarray = None
+        if self.__frameRing is not None:
+            imageNumpy = self.__frameRing.read(self.__nextEntryActionDetected)
 
-        self.__updateAnnotatedImagePath(annotatedImagePath)
+        return self.__videoProcessing.annotateImage(imagePath, coordinatesDict, imageNumpy)
 
     def predictPerson(self):
         """
-        Tool to perform prediction of a person
+        Method to perform prediction of persons, the queries are traced as the stage predictPerson
         """
-        imagePath : str = self.__getNextImage()
-        try:
-            imageTensor, imageNumpy = self.__videoProcessing.processImageToTensorPersonDetection(
-                imagePath,
-                imgSize = self.__yoloConfig["imgSize"],
-                stride = self.__modelPersonDetection.stride,
-                half = self.__yoloConfig["half"],
-                device = self.__device,
-            )
-        except Exception as e:
-            self.writeLog("Image " + imagePath + " could not be processed" + str(e), "ERROR")
-            self.__updateDatabasePerson(dict())
-            return
+        with self.__interfaceDatabase.traceStage("predictPerson"):
+            self.__predictPerson()
+
+    def __predictPerson(self):
+        """
+        Tool to perform prediction of persons, the next frames pending of detection are predicted
+        in batches of prediction.batchSize frames
+        """
+        frameIds : list = self.__claimNextFrames()
+        frames : list = [self.__loadFrame(frameId) for frameId in frameIds]
+
+        coordinatesFrames : list = self.__predictFrames(frames)
 
-        prediction : torch.Tensor = self.__predict(imageTensor, imageNumpy)
+        for frame, coordinates in zip(frames, coordinatesFrames):
+            self.__updateDatabasePerson(frame["frameId"], coordinates)
+        self.__updateNextEntryPersonDetected()
 
-        coordinates : dict = self.__getCoordinatesPersons(prediction, imageTensor)
+    def __claimNextFrames(self) -> list:
+        """
+        Tool to claim the next frames pending of person detection, each claim has its own id so the frames
+        already claimed by this worker and still in process are not returned again
+        """
+        self.__numberClaims += 1
+
+        return self.__interfaceDatabase.claimNextEntriesPersonDetected(
+            self.__predictionConfig["batchSize"],
+            self.__workerId + "-" + str(self.__numberClaims),
+            self.__predictionConfig["workers"]["leaseSeconds"],
+        )
 
-        self.__updateDatabasePerson(coordinates)
+    def __persistFrames(self, frames : list, coordinatesFrames : list):
+        """
+        Tool to persist the persons detected in several frames and predict the actions they made available
+        """
+        for frame, coordinates in zip(frames, coordinatesFrames):
+            self.__updateDatabasePerson(frame["frameId"], coordinates)
+
+        if self.__role != "all":
+            return
+
+        self.__updateNextEntryPersonDetected()
+
+        while self.__nextEntryActionDetected < self.__nextEntryPersonDetected:
+            self.predictAction()
+            self.createPredictionVideo()
 
     def createPredictionVideo(self):
         """
-        Method to create videos if exists new clasification
+        Method to create videos if exists new clasification, the queries are traced as the stage createPredictionVideo
+        """
+        with self.__interfaceDatabase.traceStage("createPredictionVideo"):
+            self.__createPredictionVideo()
+
+    def __createPredictionVideo(self):
+        """
+        Tool to create videos if exists new clasification
         """
         nextPerson : list = self.__interfaceDatabase.getNextVideo()
         if len(nextPerson) == 0:
@@ -357,75 +623,126 @@ class Predictor(BaseModule):
 
     def predictAction(self):
         """
-        Method to predict actions
+        Method to predict actions, the queries are traced as the stage predictAction
+        """
+        with self.__interfaceDatabase.traceStage("predictAction"):
+            self.__predictAction()
+
+    def __predictAction(self):
+        """
+        Tool to predict actions, the objects of the frame are associated with the active persons kept in the tracker
         """
         if self.__nextEntryActionDetected >= self.__nextEntryPersonDetected:
             self.writeLog("The Action detection frame has reached Person detection frame", "WARNING")
             return
-        objects : list = self.__getObjectsNextFrame()
-        persons : list = self.__getActivePersons()
-
-        currentObjectsCoordinates : dict = dict()
-        activePersonsCoordinates : dict = dict()
-
-        for object in objects:
-            currentObjectsCoordinates.update({
-                object : self.__getCoordinates(objectId=object),
-            })
-
-        for person in persons:
-            activePersonsCoordinates.update({
-                person : self.__getCoordinates(personId=person),
-            })
+        objects : dict = self.__getObjectsNextFrame()
+        persons : list = self.__tracker.getActivePersons()
+        currentTimestamp : int = self.__getCurrenTimestamp()
 
-        if len(objects) != 0 and len(persons) == 0:
-            for object in objects:
-                self.__addNewPerson(object)
+        currentObjectsCoordinates : dict = dict(objects)
+        objectsPerson : dict = dict()
 
-        if len(objects) == 0 and len(persons) != 0:
+        if len(objects) == 0:
             for person in persons:
-                self.__updatePersonsAsCompleted(person)
+                self.__tracker.completePerson(person)
 
         if len(objects) != 0 and len(persons) != 0:
-            currentTimestamp : int = self.__getCurrenTimestamp()
+            personsToMatch : list = list()
             for person in persons:
-                personTimestamp : int = self.__getPersonTimestamp(person)
-
-                if personTimestamp - currentTimestamp > self.__actionsConfig["maxTimestampDifference"]:
-                    self.__updatePersonsAsCompleted(person)
+                if self.__tracker.getPerson(person)["timestamp"] - currentTimestamp > self.__actionsConfig["maxTimestampDifference"]:
+                    self.__tracker.completePerson(person)
                 else:
-                    distances : dict = dict()
-                    for object in list(currentObjectsCoordinates.keys()):
-                        comparison, distance = self.__compareCoordinates(
-                            currentObjectsCoordinates[object][0],
-                            activePersonsCoordinates[person][0],
-                        )
-
-                        if comparison:
-                            distances.update({
-                                object : distance,
-                            })
-
-                    if len(distances) > 0:
-                        minDistanceObject : float = min(distances, key=lambda k: distances[k])
-                        currentObjectsCoordinates.pop(minDistanceObject)
-                        self.__interfaceDatabase.updatePersonIdFromObjectId(minDistanceObject, person)
-                    else:
-                        self.__updatePersonsAsCompleted(person)
+                    personsToMatch.append(person)
+
+            objectsToMatch : list = list(currentObjectsCoordinates.keys())
+            matches : list = self.__matcher.match(
+                [self.__tracker.getPerson(person)["lastCoordinates"] for person in personsToMatch],
+                [currentObjectsCoordinates[object] for object in objectsToMatch],
+            )
+
+            matchedPersons : set = set()
+            for personIndex, objectIndex in matches:
+                person : int = personsToMatch[personIndex]
+                object : int = objectsToMatch[objectIndex]
+                self.__tracker.updatePerson(
+                    person,
+                    object,
+                    currentObjectsCoordinates.pop(object),
+                    self.__nextEntryActionDetected,
+                    currentTimestamp,
+                )
+                objectsPerson.update({
+                    object : person,
+                })
+                matchedPersons.add(person)
+
+            for person in personsToMatch:
+                if person not in matchedPersons:
+                    self.__tracker.completePerson(person)
 
+        annotatedImagePath : str = self.__createImagePrediction(objects, objectsPerson)
+
+        with self.__interfaceDatabase.transaction():
             for object in list(currentObjectsCoordinates.keys()):
-                self.__addNewPerson(object)
+                objectsPerson.update({
+                    object : self.__addNewPerson(object, currentObjectsCoordinates[object], currentTimestamp),
+                })
 
-        self.__createImagePrediction(objects)
+            self.__updateAnnotatedImagePath(annotatedImagePath)
+            self.__flushTracker()
 
-        self.__interfaceDatabase.updateActionDetected(self.__nextEntryActionDetected)
+            self.__interfaceDatabase.updateActionDetected(self.__nextEntryActionDetected)
         self.__updateNextEntryActionDetected()
 
+    def __traceStagePredictPerson(self, function : callable, stage : str) -> callable:
+        """
+        Tool to trace the queries of a stage of the pipeline as the stage predictPerson.<stage>, every pipeline
+        stage has its own calls since the source and the persistence run once per batch and the decoding once per frame
+        """
+        def tracedFunction(*args):
+            with self.__interfaceDatabase.traceStage("predictPerson." + stage):
+                return function(*args)
+
+        return tracedFunction
+
+    def __associationLoop(self):
+        """
+        Tool to predict actions of the frames already person detected by the detector workers
+        """
+        while True:
+            self.__nextEntryPersonDetected = self.__interfaceDatabase.getPersonDetectionWatermark()
+            if self.__nextEntryActionDetected < self.__nextEntryPersonDetected:
+                self.predictAction()
+                self.createPredictionVideo()
+            else:
+                self.__interfaceDatabase.waitNewFrames()
+
+    def registerTraceSignal(self):
+        """
+        Method to dump the query trace of the process when it receives SIGUSR1
+        """
+        self.__interfaceDatabase.registerTraceSignal()
+
     def predictLoop(self):
         """
-        Method to run predict loop
+        Method to run predict loop, if prediction.pipeline.enabled the decoding, inference and persistence
+        run as concurrent stages
         """
+        if self.__role == "association":
+            self.__associationLoop()
+
+        if self.__predictionConfig["pipeline"]["enabled"]:
+            pipeline : Pipeline = Pipeline(
+                source=self.__traceStagePredictPerson(self.__claimNextFrames, "source"),
+                decode=self.__traceStagePredictPerson(self.__loadFrame, "decode"),
+                infer=self.__predictFrames,
+                persist=self.__traceStagePredictPerson(self.__persistFrames, "persist"),
+                decodeFailed=self.__emptyFrame,
+            )
+            pipeline.run()
+
         while True:
             self.predictPerson()
-            self.predictAction()
-            self.createPredictionVideo()
+            while self.__role == "all" and self.__nextEntryActionDetected < self.__nextEntryPersonDetected:
+                self.predictAction()
+                self.createPredictionVideo()
@@ -0,0 +1,247 @@
+import os
+import shutil
+import time
+import numpy as np
+import onnx
+import torch
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+from yolov6.utils.nms import non_max_suppression
+from modules.baseModule.baseModule import BaseModule
+from modules.predictor.engine import OnnxRuntimeEngine
+from modules.predictor.metrics import DetectionMetrics
+from modules.videoProcessing.videoProcessing import VideoProcessing
+
+class CalibrationReader(CalibrationDataReader):
+    """
+    Class to feed the calibration frames to the static quantization
+    """
+    def __init__(self, inputName : str, loadImage : callable, imagePaths : list):
+        self.__inputName : str = inputName
+        self.__loadImage : callable = loadImage
+        self.__imagePaths : iter = iter(imagePaths)
+
+    def get_next(self) -> dict:
+        """
+        Method to get the next calibration input, None when there are no more frames
+        """
+        imagePath : str = next(self.__imagePaths, None)
+        if imagePath is None:
+            return None
+
+        return {
+            self.__inputName : self.__loadImage(imagePath).numpy(),
+        }
+
+class Quantization(BaseModule):
+    """
+    Class to quantize the person detection model to INT8 and compare it against the FP32 model
+    """
+    def __init__(self):
+        super().__init__()
+        self.__yoloConfig : dict = self.getConfig()["yolo"]
+        self.__quantizationConfig : dict = self.getConfig()["quantization"]
+        self.__paths : dict = self.getPaths()
+        self.__videoProcessing : VideoProcessing = VideoProcessing()
+        self.__stride : int = None
+
+    def __getFramePaths(self, numberFrames : int) -> list:
+        """
+        Tool to get frames already captured in data/imagesDatabase, evenly sampled across all cameras
+        """
+        framePaths : list = list()
+        imagesFolder : str = self.__paths["folders"]["imagesDatabase"]
+        for root, folders, files in os.walk(imagesFolder):
+            for file in files:
+                if "Annotated" not in file:
+                    framePaths.append(os.path.join(root, file))
+        framePaths.sort()
+
+        if len(framePaths) > numberFrames:
+            indexes : np.ndarray = np.linspace(0, len(framePaths) - 1, numberFrames).astype(int)
+            framePaths = [framePaths[index] for index in indexes]
+
+        return framePaths
+
+    def __loadImage(self, imagePath : str) -> torch.Tensor:
+        """
+        Tool to load an image with the same preprocessing used by the predictor
+        """
+        imageTensor, imageNumpy = self.__videoProcessing.processImageToTensorPersonDetection(
+            imagePath,
+            imgSize = self.__yoloConfig["imgSize"],
+            stride = self.__getStride(),
+            half = False,
+            device = "cpu",
+        )
+
+        return imageTensor
+
+    def __getStride(self) -> int:
+        """
+        Tool to get the stride stored in the FP32 ONNX model
+        """
+        if self.__stride is None:
+            onnxModel : onnx.ModelProto = onnx.load(self.__getFp32Model())
+            metadata : dict = {entry.key : entry.value for entry in onnxModel.metadata_props}
+            self.__stride = int(metadata["stride"])
+
+        return self.__stride
+
+    def __getFp32Model(self) -> str:
+        """
+        Tool to get the FP32 ONNX model, exported from the checkpoint if does not exist
+        """
+        onnxPath : str = self.__paths["files"]["yoloOnnx"]
+        if not os.path.exists(onnxPath):
+            OnnxRuntimeEngine.exportOnnx(self.__paths["files"]["yoloWeights"], onnxPath, self.__yoloConfig["imgSize"])
+
+        return onnxPath
+
+    def __getInt8Path(self, mode : str) -> str:
+        """
+        Tool to get the path of the INT8 model of a quantization mode, cached next to the FP32 model
+        """
+        return os.path.splitext(self.__paths["files"]["yoloOnnx"])[0] + "." + mode + ".int8.onnx"
+
+    def getQuantizedModel(self, mode : str) -> str:
+        """
+        Method to get the INT8 model of a quantization mode, quantized if does not exist
+        """
+        int8Path : str = self.__getInt8Path(mode)
+        if not os.path.exists(int8Path):
+            int8Path = self.quantizeModel(mode)
+
+        return int8Path
+
+    def quantizeModel(self, mode : str) -> str:
+        """
+        Method to quantize the FP32 ONNX model to INT8, dynamic quantizes the weights only, static also
+        calibrates the activations with the frames already captured
+        """
+        fp32Path : str = self.__getFp32Model()
+        int8Path : str = self.__getInt8Path(mode)
+        int8PathTmp : str = int8Path + ".tmp"
+
+        if mode == "dynamic":
+            quantize_dynamic(fp32Path, int8PathTmp, weight_type=QuantType.QUInt8)
+        elif mode == "static":
+            framePaths : list = self.__getFramePaths(self.__quantizationConfig["calibrationFrames"])
+            if len(framePaths) == 0:
+                raise Exception("No frames in " + self.__paths["folders"]["imagesDatabase"] + " to calibrate the static quantization")
+            quantize_static(
+                fp32Path,
+                int8PathTmp,
+                CalibrationReader(onnx.load(fp32Path).graph.input[0].name, self.__loadImage, framePaths),
+                quant_format=QuantFormat.QDQ,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+            )
+        else:
+            raise Exception("Quantization mode " + str(mode) + " is not supported")
+
+        fp32Model : onnx.ModelProto = onnx.load(fp32Path)
+        int8Model : onnx.ModelProto = onnx.load(int8PathTmp)
+        del int8Model.metadata_props[:]
+        int8Model.metadata_props.extend(fp32Model.metadata_props)
+        onnx.save(int8Model, int8PathTmp)
+        shutil.move(int8PathTmp, int8Path)
+        self.writeLog("Person detection model quantized to " + int8Path + " with mode " + mode, "INFO")
+
+        return int8Path
+
+    def __runModel(self, engine : OnnxRuntimeEngine, imagesTensors : list) -> tuple:
+        """
+        Tool to run a model over the frames, return the persons detected per frame and the latency per frame in ms
+        """
+        detections : list = list()
+        latencies : list = list()
+        for imageTensor in imagesTensors:
+            timeStart : float = time.perf_counter()
+            prediction : torch.Tensor = engine(imageTensor)
+            latencies.append((time.perf_counter() - timeStart) * 1000)
+
+            det : torch.Tensor = non_max_suppression(
+                prediction=prediction,
+                conf_thres=self.__yoloConfig["conf_thres"],
+                iou_thres=self.__yoloConfig["iou_thres"],
+                classes=[0],
+                agnostic=self.__yoloConfig["agnostic_nms"],
+                max_det=self.__yoloConfig["max_det"],
+            )[0]
+            detections.append(det[:, :5].numpy())
+
+        return detections, latencies
+
+    def __latencyReport(self, latencies : list) -> dict:
+        """
+        Tool to summarize the latencies of a model
+        """
+        return {
+            "meanMs" : float(np.mean(latencies)),
+            "p50Ms" : float(np.percentile(latencies, 50)),
+            "p99Ms" : float(np.percentile(latencies, 99)),
+        }
+
+    def compareModels(self, mode : str) -> dict:
+        """
+        Method to run the FP32 and INT8 models over the same frames, the FP32 detections are the reference
+        to measure the mAP drift of the INT8 model, the report is written in data/logs
+        """
+        framePaths : list = self.__getFramePaths(self.__quantizationConfig["reportFrames"])
+        if len(framePaths) == 0:
+            raise Exception("No frames in " + self.__paths["folders"]["imagesDatabase"] + " to compare the models")
+        imagesTensors : list = [self.__loadImage(framePath) for framePath in framePaths]
+
+        fp32Engine : OnnxRuntimeEngine = OnnxRuntimeEngine(
+            self.__paths["files"]["yoloWeights"],
+            self.__getFp32Model(),
+            imgSize=self.__yoloConfig["imgSize"],
+            threads=self.__yoloConfig["onnxThreads"],
+        )
+        int8Engine : OnnxRuntimeEngine = OnnxRuntimeEngine(
+            self.__paths["files"]["yoloWeights"],
+            self.getQuantizedModel(mode),
+            imgSize=self.__yoloConfig["imgSize"],
+            threads=self.__yoloConfig["onnxThreads"],
+        )
+
+        fp32Detections, fp32Latencies = self.__runModel(fp32Engine, imagesTensors)
+        int8Detections, int8Latencies = self.__runModel(int8Engine, imagesTensors)
+
+        meanAveragePrecision : dict = DetectionMetrics.meanAveragePrecision(
+            [detection[:, :4] for detection in fp32Detections],
+            int8Detections,
+        )
+        fp32Latency : dict = self.__latencyReport(fp32Latencies)
+        int8Latency : dict = self.__latencyReport(int8Latencies)
+
+        report : dict = {
+            "mode" : mode,
+            "frames" : len(framePaths),
+            "mAP50" : meanAveragePrecision["mAP50"],
+            "mAP50_95" : meanAveragePrecision["mAP50_95"],
+            "mapDrift" : 1 - meanAveragePrecision["mAP50"],
+            "acceptable" : (1 - meanAveragePrecision["mAP50"]) <= self.__quantizationConfig["maxMapDrift"],
+            "fp32Latency" : fp32Latency,
+            "int8Latency" : int8Latency,
+            "speedUp" : fp32Latency["meanMs"] / int8Latency["meanMs"],
+            "latencyPerFrameMs" : [
+                {
+                    "frame" : framePath,
+                    "fp32" : float(fp32LatencyFrame),
+                    "int8" : float(int8LatencyFrame),
+                }
+                for framePath, fp32LatencyFrame, int8LatencyFrame in zip(framePaths, fp32Latencies, int8Latencies)
+            ],
+        }
+        BaseModule.writeYaml(self.__paths["files"]["quantizationReport"], report)
+        self.writeLog(
+            "Quantization report mAP50: " + str(round(report["mAP50"], 4)) +
+            " drift: " + str(round(report["mapDrift"], 4)) +
+            " acceptable: " + str(report["acceptable"]) +
+            " speed up: " + str(round(report["speedUp"], 2)),
+            "INFO",
+        )
+
+        return report
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from modules.predictor.boxPropagator import BoxPropagator
+
+class BoxPropagatorTest(unittest.TestCase):
+    """
+    Box Propagator Unit Tests
+    """
+    def test_scheduleDetections(self):
+        """
+        Test scheduleDetections Method
+        """
+        boxPropagator : BoxPropagator = BoxPropagator(interval=3, minConfidence=0.5, scale=1)
+
+        detections : list = boxPropagator.scheduleDetections(["camera1", "camera2", "camera1", "camera1", "camera1"])
+
+        self.assertEqual(detections, [True, True, False, False, True])
+
+    def test_propagate(self):
+        """
+        Test propagate Method follows a moving box
+        """
+        random : np.random.Generator = np.random.default_rng(0)
+        background : np.ndarray = random.integers(0, 60, (240, 320)).astype(np.uint8)
+        person : np.ndarray = random.integers(100, 255, (80, 40)).astype(np.uint8)
+
+        def createFrame(x : int) -> np.ndarray:
+            frame : np.ndarray = background.copy()
+            frame[60:140, x:x + 40] = person
+            return frame
+
+        boxPropagator : BoxPropagator = BoxPropagator(interval=5, minConfidence=0.5, scale=1)
+        boxPropagator.reset("camera1", boxPropagator.prepareImage(createFrame(100)), [[100, 60, 140, 140]])
+
+        boxes : list
+        confidence : float
+        for x in [103, 106, 109]:
+            boxes, confidence = boxPropagator.propagate("camera1", boxPropagator.prepareImage(createFrame(x)))
+
+        self.assertTrue(boxPropagator.isConfident(confidence))
+        self.assertGreater(boxes[0][0], 103)
+        self.assertLess(abs((boxes[0][1] + boxes[0][3]) / 2 - 100), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from modules.predictor.matcher import Matcher
+
+class MatcherTest(unittest.TestCase):
+    """
+    Matcher Unit Tests
+    """
+    def test_match(self):
+        """
+        Test match Method
+        """
+        matcher : Matcher = Matcher(0.02)
+        persons : list = [
+            [100, 100, 200, 300],
+            [400, 100, 500, 300],
+            [700, 100, 800, 300],
+        ]
+        objects : list = [
+            [401, 101, 501, 301],
+            [100, 100, 201, 300],
+            [10, 10, 20, 30],
+        ]
+
+        matches : list = matcher.match(persons, objects)
+
+        self.assertEqual(sorted(matches), [(0, 1), (1, 0)])
+
+    def test_matchGlobalAssignment(self):
+        """
+        Test match Method prefers the assignment matching most persons over the greedy closest pair
+        """
+        matcher : Matcher = Matcher(0.05)
+        persons : list = [
+            [100, 100, 200, 200],
+            [104, 104, 204, 204],
+        ]
+        objects : list = [
+            [103, 103, 203, 203],
+            [99, 99, 199, 199],
+        ]
+
+        matches : list = matcher.match(persons, objects)
+
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(sorted(matches), [(0, 1), (1, 0)])
+
+    def test_matchEmpty(self):
+        """
+        Test match Method without persons
+        """
+        matcher : Matcher = Matcher(0.02)
+
+        self.assertEqual(matcher.match([], [[1, 1, 2, 2]]), [])
+
+if __name__ == '__main__':
+    unittest.main()
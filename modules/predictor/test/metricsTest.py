@@ -0,0 +1,33 @@
+import unittest
+import numpy as np
+from modules.predictor.metrics import DetectionMetrics
+
+class DetectionMetricsTest(unittest.TestCase):
+    """
+    Detection Metrics Unit Tests
+    """
+    def test_meanAveragePrecisionIdentical(self):
+        """
+        Test meanAveragePrecision Method with identical detections
+        """
+        references : list = [np.array([[0, 0, 10, 10], [20, 20, 40, 40]]), np.zeros((0, 4))]
+        predictions : list = [np.array([[0, 0, 10, 10, 0.9], [20, 20, 40, 40, 0.8]]), np.zeros((0, 5))]
+
+        meanAveragePrecision : dict = DetectionMetrics.meanAveragePrecision(references, predictions)
+
+        self.assertAlmostEqual(meanAveragePrecision["mAP50"], 1.0)
+        self.assertAlmostEqual(meanAveragePrecision["mAP50_95"], 1.0)
+
+    def test_averagePrecisionDrift(self):
+        """
+        Test averagePrecision Method with a missed box and false positives
+        """
+        references : list = [np.array([[0, 0, 10, 10], [20, 20, 40, 40]]), np.zeros((0, 4))]
+        predictions : list = [np.array([[0, 0, 10, 10, 0.9], [50, 50, 60, 60, 0.95]]), np.array([[1, 1, 5, 5, 0.3]])]
+
+        averagePrecision : float = DetectionMetrics.averagePrecision(references, predictions, 0.5)
+
+        self.assertAlmostEqual(averagePrecision, 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+import numpy as np
+from modules.predictor.motionGate import MotionGate
+
+class MotionGateTest(unittest.TestCase):
+    """
+    Motion Gate Unit Tests
+    """
+    def test_isStatic(self):
+        """
+        Test isStatic Method
+        """
+        motionGate : MotionGate = MotionGate(threshold=0.01, downscaleWidth=32, maxConsecutiveGated=2)
+        frame : np.ndarray = np.full((480, 640, 3), 100, dtype=np.uint8)
+        frameMoved : np.ndarray = frame.copy()
+        frameMoved[100:300, 200:400] = 255
+
+        self.assertFalse(motionGate.isStatic("camera1", motionGate.downscale(frame)))
+        self.assertTrue(motionGate.isStatic("camera1", motionGate.downscale(frame)))
+        self.assertFalse(motionGate.isStatic("camera2", motionGate.downscale(frame)))
+        self.assertFalse(motionGate.isStatic("camera1", motionGate.downscale(frameMoved)))
+        self.assertTrue(motionGate.isStatic("camera1", motionGate.downscale(frameMoved)))
+        self.assertTrue(motionGate.isStatic("camera1", motionGate.downscale(frameMoved)))
+        self.assertFalse(motionGate.isStatic("camera1", motionGate.downscale(frameMoved)))
+
+        self.assertEqual(motionGate.getStats(), {"frames" : 7, "gated" : 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+from modules.predictor.pipeline import Pipeline
+
+class PipelineTest(unittest.TestCase):
+    """
+    Pipeline Unit Tests
+    """
+    def __runPipeline(self, items : list, decode : callable, persist : callable, waits : dict = None) -> Pipeline:
+        """
+        Tool to run a pipeline in a daemon thread over the items given one by one by its source, an item of
+        waits is not given until its event is set, the source blocks once all the items are given
+        """
+        sourceItems : list = list(items)
+        waits = waits or dict()
+        blocked : threading.Event = threading.Event()
+
+        def source() -> list:
+            if len(sourceItems) == 0:
+                blocked.wait()
+            if sourceItems[0] in waits:
+                waits[sourceItems[0]].wait()
+            return [sourceItems.pop(0)]
+
+        pipeline : Pipeline = Pipeline(
+            source=source,
+            decode=decode,
+            infer=lambda decodedItems : [None for decodedItem in decodedItems],
+            persist=persist,
+            decodeFailed=lambda item : {"item" : item, "decoded" : False},
+        )
+        threading.Thread(target=pipeline.run, daemon=True).start()
+
+        return pipeline
+
+    def test_decodeFailed(self):
+        """
+        Test an item whose decoding fails is persisted as its decodeFailed item
+        """
+        persisted : list = list()
+        finished : threading.Event = threading.Event()
+
+        def decode(item : int) -> dict:
+            if item == 2:
+                raise ValueError("decode failed")
+            return {"item" : item, "decoded" : True}
+
+        def persist(decodedItems : list, results : list):
+            persisted.extend(decodedItems)
+            if len(persisted) == 3:
+                finished.set()
+
+        self.__runPipeline([1, 2, 3], decode, persist)
+
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(persisted, [
+            {"item" : 1, "decoded" : True},
+            {"item" : 2, "decoded" : False},
+            {"item" : 3, "decoded" : True},
+        ])
+
+    def test_persistenceFailed(self):
+        """
+        Test a persistence failure does not stop the persistence of the next batches
+        """
+        persisted : list = list()
+        failed : threading.Event = threading.Event()
+        finished : threading.Event = threading.Event()
+
+        def persist(decodedItems : list, results : list):
+            if decodedItems == [1]:
+                failed.set()
+                raise ValueError("persistence failed")
+            persisted.extend(decodedItems)
+            if persisted[-1] == 3:
+                finished.set()
+
+        pipeline : Pipeline = self.__runPipeline([1, 2, 3], lambda item : item, persist, waits={2 : failed})
+
+        self.assertTrue(finished.wait(5))
+        self.assertEqual(persisted, [2, 3])
+        self.assertEqual(pipeline.getStats()["framesInferred"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from modules.predictor.tracker import Tracker
+
+class TrackerTest(unittest.TestCase):
+    """
+    Tracker Unit Tests
+    """
+    def test_rebuild(self):
+        """
+        Test rebuild Method
+        """
+        tracker : Tracker = Tracker()
+        tracker.rebuild([
+            [3, 12, 11, 52, 91, 40, 120, 4, 0],
+        ])
+
+        self.assertEqual(tracker.getActivePersons(), [3])
+        self.assertEqual(tracker.getPerson(3)["lastCoordinates"], [12, 11, 52, 91])
+        self.assertEqual(tracker.getPerson(3)["numberFrames"], 4)
+        self.assertEqual(tracker.popPendingChanges()["objects"], [])
+
+    def test_pendingChanges(self):
+        """
+        Test popPendingChanges Method
+        """
+        tracker : Tracker = Tracker()
+        tracker.addPerson(1, 7, [10, 10, 50, 90], 40, 120)
+        tracker.updatePerson(1, 8, [11, 10, 51, 90], 41, 121)
+        tracker.setPersonIdle(1)
+        tracker.setPersonIdle(1)
+        tracker.completePerson(1)
+
+        pendingChanges : dict = tracker.popPendingChanges()
+
+        self.assertEqual(pendingChanges["objects"], [(7, 1), (8, 1)])
+        self.assertEqual(pendingChanges["idle"], [1])
+        self.assertEqual(pendingChanges["completed"], [1])
+        self.assertEqual(tracker.getActivePersons(), [])
+        self.assertEqual(tracker.popPendingChanges()["idle"], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+class Tracker(object):
+    """
+    Class to keep in memory the state of the active persons, the database is used as write behind
+    storage, the changes are accumulated and written once per frame
+    """
+    def __init__(self):
+        self.__persons : dict = dict()
+        self.__pendingChanges : dict = self.__emptyChanges()
+
+    def __emptyChanges(self) -> dict:
+        """
+        Tool to create an empty set of pending changes
+        """
+        return {
+            "objects" : list(),
+            "completed" : list(),
+            "idle" : list(),
+        }
+
+    def rebuild(self, personsState : list):
+        """
+        Method to rebuild the tracker from the database state of the active persons, each row contains
+        personId, last box, last frameId, last timestamp, number of frames and idle clasification
+        """
+        self.__persons = dict()
+        self.__pendingChanges = self.__emptyChanges()
+        for personState in personsState:
+            self.__persons.update({
+                int(personState[0]) : {
+                    "lastCoordinates" : [int(coordinate) for coordinate in personState[1:5]],
+                    "frameId" : int(personState[5]),
+                    "timestamp" : int(personState[6]),
+                    "numberFrames" : int(personState[7]),
+                    "idle" : bool(personState[8]),
+                }
+            })
+
+    def getActivePersons(self) -> list:
+        """
+        Method to get the active persons
+        """
+        return list(self.__persons.keys())
+
+    def getPerson(self, personId : int) -> dict:
+        """
+        Method to get the state of an active person
+        """
+        return self.__persons[personId]
+
+    def addPerson(self, personId : int, objectId : int, coordinates : list, frameId : int, timestamp : int):
+        """
+        Method to add a new active person from its first object
+        """
+        self.__persons.update({
+            personId : {
+                "lastCoordinates" : list(coordinates),
+                "frameId" : frameId,
+                "timestamp" : timestamp,
+                "numberFrames" : 1,
+                "idle" : False,
+            }
+        })
+        self.__pendingChanges["objects"].append((objectId, personId))
+
+    def updatePerson(self, personId : int, objectId : int, coordinates : list, frameId : int, timestamp : int):
+        """
+        Method to assign a new object to an active person
+        """
+        person : dict = self.__persons[personId]
+        person["lastCoordinates"] = list(coordinates)
+        person["frameId"] = frameId
+        person["timestamp"] = timestamp
+        person["numberFrames"] += 1
+        self.__pendingChanges["objects"].append((objectId, personId))
+
+    def setPersonIdle(self, personId : int):
+        """
+        Method to classify an active person as idle, the change is stored only once per person
+        """
+        person : dict = self.__persons[personId]
+        if person["idle"] is False:
+            person["idle"] = True
+            self.__pendingChanges["idle"].append(personId)
+
+    def completePerson(self, personId : int):
+        """
+        Method to remove a person from the active persons
+        """
+        self.__persons.pop(personId)
+        self.__pendingChanges["completed"].append(personId)
+
+    def popPendingChanges(self) -> dict:
+        """
+        Method to get the changes not yet written to the database and clear them
+        """
+        pendingChanges : dict = self.__pendingChanges
+        self.__pendingChanges = self.__emptyChanges()
+
+        return pendingChanges
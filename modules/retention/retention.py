@@ -0,0 +1,88 @@
+import os
+import queue
+import threading
+import time
+from modules.baseModule.baseModule import BaseModule
+from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
+
+class Retention(BaseModule):
+    """
+    Class to delete the frames, objects and images older than the time to live of their camera, the frames
+    are deleted in small batches so every transaction holds its locks a short time, and the image files of
+    the frames deleted are removed by a background thread
+    """
+    def __init__(self):
+        super().__init__()
+        self.__retentionConfig : dict = self.getConfig()["retention"]
+        self.__cameraConfig : dict = self.getConfig()["cameras"]
+        self.__interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        self.__filesQueue : queue.Queue = queue.Queue()
+        self.__filesThread : threading.Thread = threading.Thread(target=self.__deleteFilesLoop, daemon=True)
+        self.__filesThread.start()
+
+    def __getTtlHours(self, camera : str) -> float:
+        """
+        Tool to get the time to live of a camera, cameras.cameraN.ttlHours or retention.ttlHours by default
+        """
+        cameraConfig : any = self.__cameraConfig.get(camera)
+        if isinstance(cameraConfig, dict) and cameraConfig.get("ttlHours") is not None:
+            return cameraConfig["ttlHours"]
+
+        return self.__retentionConfig["ttlHours"]
+
+    def __deleteFilesLoop(self):
+        """
+        Tool to remove the files of the frames deleted
+        """
+        while True:
+            filePaths : list = self.__filesQueue.get()
+            for filePath in filePaths:
+                if filePath is None:
+                    continue
+                try:
+                    os.remove(filePath)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.writeLog("File " + filePath + " could not be deleted: " + str(e), "WARNING")
+            self.__filesQueue.task_done()
+
+    def applyRetention(self) -> int:
+        """
+        Method to delete the expired frames of every camera, return the number of frames deleted, the files
+        are deleted after their rows so a frame never points to a missing image
+        """
+        numberFrames : int = 0
+        for camera in self.__interfaceDatabase.getCameras():
+            ttlHours : float = self.__getTtlHours(camera)
+            if ttlHours <= 0:
+                continue
+
+            while True:
+                frames : list = self.__interfaceDatabase.getExpiredFrames(camera, ttlHours * 3600, self.__retentionConfig["batchSize"])
+                if len(frames) == 0:
+                    break
+
+                self.__interfaceDatabase.deleteFrames([frame[0] for frame in frames])
+                self.__filesQueue.put([frame[1] for frame in frames] + [frame[2] for frame in frames])
+                numberFrames += len(frames)
+                time.sleep(self.__retentionConfig["sleepBatch"])
+
+        if numberFrames > 0:
+            self.writeLog("Retention deleted " + str(numberFrames) + " frames", "INFO")
+
+        return numberFrames
+
+    def waitFilesDeleted(self):
+        """
+        Method to wait until the files of the frames deleted are removed
+        """
+        self.__filesQueue.join()
+
+    def retentionLoop(self):
+        """
+        Method to apply the retention every retention.interval seconds
+        """
+        while True:
+            self.applyRetention()
+            time.sleep(self.__retentionConfig["interval"])
@@ -0,0 +1,120 @@
+import copy
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from modules.baseModule.baseModule import BaseModule
+from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
+from modules.retention.retention import Retention
+
+class RetentionTest(unittest.TestCase):
+    """
+    Retention Unit Tests, run on the SQLite backend so no MySQL server is needed
+    """
+    def setUp(self):
+        self.__folder : tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        baseModule : BaseModule = BaseModule()
+        self.__config : dict = copy.deepcopy(baseModule.getConfig())
+        self.__config["database"]["backend"] = "sqlite"
+        self.__config["retention"]["ttlHours"] = 1
+        self.__config["retention"]["sleepBatch"] = 0
+        self.__config["retention"]["batchSize"] = 2
+        self.__config["cameras"] = {
+            "camera2" : {
+                "url" : "http://localhost:5000/video",
+                "ttlHours" : 0,
+            },
+        }
+        self.__paths : dict = copy.deepcopy(baseModule.getPaths())
+        self.__paths["files"]["sqliteDatabase"] = os.path.join(self.__folder.name, "predictions.db")
+        self.__patches : list = [
+            patch.object(InterfaceDatabase, "getConfig", return_value=self.__config),
+            patch.object(InterfaceDatabase, "getPaths", return_value=self.__paths),
+            patch.object(Retention, "getConfig", return_value=self.__config),
+        ]
+        for patchObject in self.__patches:
+            patchObject.start()
+
+    def tearDown(self):
+        for patchObject in self.__patches:
+            patchObject.stop()
+        self.__folder.cleanup()
+
+    def __storeFrame(self, interfaceDatabase : InterfaceDatabase, camera : str, timestamp : datetime, personId : int = None) -> str:
+        """
+        Tool to store a processed frame with its image, the object of the frame belongs to personId if given
+        """
+        os.makedirs(os.path.join(self.__folder.name, camera), exist_ok=True)
+        imagePath : str = os.path.join(
+            self.__folder.name,
+            camera,
+            timestamp.strftime(self.__config["interfaceCamera"]["dateTimeFormat"]) + ".png",
+        )
+        open(imagePath, "w").close()
+        frameId : int = interfaceDatabase.storeNewFrame(imagePath)
+        objectIds : list = interfaceDatabase.storeNewObjects(frameId, [[1, 2, 3, 4]])
+        if personId is not None:
+            interfaceDatabase.updatePersonIdFromObjectId(objectIds[0], personId)
+        interfaceDatabase.updateActionDetected(frameId)
+
+        return imagePath
+
+    def test_applyRetention(self):
+        """
+        Test applyRetention Method
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        expiredPaths : list = [
+            self.__storeFrame(interfaceDatabase, "camera1", datetime(2020, 1, 1, 0, 0, second)) for second in range(3)
+        ]
+        keptPaths : list = [
+            self.__storeFrame(interfaceDatabase, "camera1", datetime.now()),
+            self.__storeFrame(interfaceDatabase, "camera2", datetime(2020, 1, 1)),
+        ]
+
+        retention : Retention = Retention()
+        numberFrames : int = retention.applyRetention()
+        retention.waitFilesDeleted()
+
+        self.assertEqual(numberFrames, 3)
+        self.assertEqual([os.path.exists(path) for path in expiredPaths], [False, False, False])
+        self.assertEqual([os.path.exists(path) for path in keptPaths], [True, True])
+        self.assertEqual(interfaceDatabase.getObjectsIdFromFrameId(1), [])
+        self.assertEqual(interfaceDatabase.getObjectsIdFromFrameId(4), [4])
+        self.assertEqual(retention.applyRetention(), 0)
+
+    def test_applyRetentionPersons(self):
+        """
+        Test applyRetention Method keeps the frames of active persons and of idle persons whose video is not
+        created, the completed persons left without frames are deleted
+        """
+        interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        activePersonId : int = interfaceDatabase.createNewPerson()
+        idlePersonId : int = interfaceDatabase.createNewPerson()
+        interfaceDatabase.setIdleClasification(idlePersonId)
+        interfaceDatabase.setPersonAsCompleted(idlePersonId)
+        completedPersonId : int = interfaceDatabase.createNewPerson()
+        interfaceDatabase.setPersonAsCompleted(completedPersonId)
+        for second, personId in enumerate([activePersonId, idlePersonId, completedPersonId]):
+            self.__storeFrame(interfaceDatabase, "camera1", datetime(2020, 1, 1, 0, 0, second), personId)
+
+        retention : Retention = Retention()
+        numberFrames : int = retention.applyRetention()
+        retention.waitFilesDeleted()
+
+        self.assertEqual(numberFrames, 1)
+        self.assertEqual(interfaceDatabase.getFramesFromPersonId(activePersonId), [1])
+        self.assertEqual(interfaceDatabase.getFramesFromPersonId(idlePersonId), [2])
+        self.assertEqual(interfaceDatabase.getNextVideo(), [idlePersonId])
+        with sqlite3.connect(self.__paths["files"]["sqliteDatabase"]) as connection:
+            personIds : list = [row[0] for row in connection.execute("SELECT personId FROM persons ORDER BY personId")]
+        self.assertEqual(personIds, [activePersonId, idlePersonId])
+
+        interfaceDatabase.updateVideoPath("/videos/2.mp4", idlePersonId)
+
+        self.assertEqual(retention.applyRetention(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,10 @@ import os
 import numpy as np
 import cv2
 import torch
-from PIL import Image
 import torchvision
 from yolov6.data.data_augment import letterbox
 from yolov6.core.inferer import Inferer
+from modules.imageCodec.imageCodec import ImageCodec
 from modules.interfaceDatabase.interfaceDatabase import InterfaceDatabase
 from modules.baseModule.baseModule import BaseModule
 
@@ -16,6 +16,10 @@ class VideoProcessing(BaseModule):
     def __init__(self):
         super().__init__()
         self.__interfaceDatabase : InterfaceDatabase = InterfaceDatabase()
+        self.__imageCodec : ImageCodec = ImageCodec(
+            self.getConfig()["interfaceCamera"]["imageCodec"],
+            self.getConfig()["interfaceCamera"]["imageQuality"],
+        )
 
     def __imageToTensor(self, imageNumpy : np.ndarray, imgSize : list, stride : int, half : bool, device : str) -> tuple:
         """
@@ -37,15 +41,42 @@ class VideoProcessing(BaseModule):
 
         return imageTorch, imageNumpy
 
-    def processImageToTensorPersonDetection(self, path : str, imgSize : int, stride : int, half : bool, device : str) -> tuple:
+    def __readImage(self, path : str) -> np.ndarray:
         """
-        Method to convert image to tensor
+        Tool to read an image as numpy array, in any of the formats of ImageCodec
         """
-        imageNumpy : np.ndarray = np.asarray(
-            Image.open(
-                open(path, "rb")
-            )
-        )
+        return self.__imageCodec.read(path)
+
+    def __cropRoi(self, imageNumpy : np.ndarray, roi : list) -> tuple:
+        """
+        Tool to crop a region of interest, a rectangle [x_0, y_0, x_1, y_1] or a polygon [[x, y], ...], the pixels
+        of the crop outside a polygon are filled with the letterbox color, return the crop and its offset
+        """
+        height, width = imageNumpy.shape[:2]
+        points : np.ndarray = np.asarray(roi, dtype=np.int32)
+        isPolygon : bool = len(points.shape) == 2
+        if isPolygon:
+            x0, y0 = points.min(axis=0)
+            x1, y1 = points.max(axis=0)
+        else:
+            x0, y0, x1, y1 = points
+        x0, y0 = int(max(0, x0)), int(max(0, y0))
+        x1, y1 = int(min(width, x1)), int(min(height, y1))
+
+        crop : np.ndarray = imageNumpy[y0:y1, x0:x1].copy()
+        if isPolygon:
+            mask : np.ndarray = np.zeros(crop.shape[:2], dtype=np.uint8)
+            cv2.fillPoly(mask, [points - np.array([x0, y0], dtype=np.int32)], 255)
+            crop[mask == 0] = 114
+
+        return crop, [x0, y0]
+
+    def processImageToTensorPersonDetection(self, path : str, imgSize : int, stride : int, half : bool, device : str, imageNumpy : np.ndarray = None) -> tuple:
+        """
+        Method to convert image to tensor, imageNumpy is the RGB image if already in memory, otherwise it is read from path
+        """
+        if imageNumpy is None:
+            imageNumpy = self.__readImage(path)
 
         return self.__imageToTensor(
             imageNumpy=imageNumpy,
@@ -55,19 +86,51 @@ class VideoProcessing(BaseModule):
             device=device,
         )
 
-    def annotateImage(self, imagePath : str, coordinatesDict : dict) -> str:
+    def processImageRoisToTensorPersonDetection(self, path : str, rois : list, imgSize : int, stride : int, half : bool, device : str, imageNumpy : np.ndarray = None) -> tuple:
         """
-        Method to annotate image
+        Method to convert the regions of interest of an image to a batch of tensors, one per region, return the
+        batch, the full image and per region its offset and shape to map the boxes back to the full image,
+        imageNumpy is the RGB image if already in memory, otherwise it is read from path
+        """
+        if imageNumpy is None:
+            imageNumpy = self.__readImage(path)
+
+        cropsTensor : list = list()
+        crops : list = list()
+        for roi in rois:
+            crop, offset = self.__cropRoi(imageNumpy, roi)
+            if crop.shape[0] == 0 or crop.shape[1] == 0:
+                continue
+            cropTensor, cropNumpy = self.__imageToTensor(
+                imageNumpy=crop,
+                imgSize=imgSize,
+                stride=stride,
+                half=half,
+                device=device,
+            )
+            cropsTensor.append(cropTensor)
+            crops.append({
+                "offset" : offset,
+                "shape" : crop.shape,
+            })
+
+        if len(cropsTensor) == 0:
+            raise Exception("No region of interest inside image " + path)
+
+        return torch.cat(cropsTensor, dim=0), imageNumpy, crops
+
+    def annotateImage(self, imagePath : str, coordinatesDict : dict, imageNumpy : np.ndarray = None) -> str:
+        """
+        Method to annotate image, the annotated image is written in the format of the image, imageNumpy is the
+        RGB image if already in memory, otherwise it is read from imagePath
         """
         folderImages : str = os.path.dirname(imagePath)
-        imageName : str = os.path.basename(imagePath)
+        imageName, extension = os.path.splitext(os.path.basename(imagePath))
         annotatedImagePath : str = os.path.join(
             folderImages,
-            imageName.split(".png")[0] + "Annotated.png",
-        )
-        imgNumpy : np.ndarray = np.asarray(
-            Image.open(imagePath)
+            imageName + "Annotated" + extension,
         )
+        imgNumpy : np.ndarray = imageNumpy if imageNumpy is not None else self.__readImage(imagePath)
         color : int = 0
         for objectKey in list(coordinatesDict.keys()):
             coordinates : list = coordinatesDict[objectKey]["coordinates"]
@@ -80,7 +143,7 @@ class VideoProcessing(BaseModule):
             Inferer.plot_box_and_label(imgNumpy, max(round(sum(imgNumpy.shape) / 2 * 0.003), 2), coordinates, label, color=Inferer.generate_colors(color, True))
             color += 1
 
-        Image.fromarray(imgNumpy).save(annotatedImagePath)
+        self.__imageCodec.write(annotatedImagePath, imgNumpy)
 
         return annotatedImagePath
     
@@ -90,8 +153,7 @@ class VideoProcessing(BaseModule):
         """
         fps : int = self.getConfig()["interfaceCamera"]["framesPerSecond"]
 
-        imagePil : Image = Image.open(images[0]["framePath"])
-        width, height = imagePil.size
+        height, width = self.__readImage(images[0]["framePath"]).shape[:2]
 
         videosFolder : str = self.getPaths()["folders"]["videosPersonsIdle"]
         videoFile : str = os.path.join(videosFolder, str(index) + ".mp4")
@@ -99,9 +161,7 @@ class VideoProcessing(BaseModule):
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         videoWriter = cv2.VideoWriter(videoFile, fourcc, fps, (width, height))
         for imageIndex in list(images.keys()):
-            imgNumpy : np.ndarray = np.asarray(
-                Image.open(images[imageIndex]["framePath"])
-            )
+            imgNumpy : np.ndarray = self.__readImage(images[imageIndex]["framePath"])
 
             coordinates : list = [images[imageIndex]["x0"], images[imageIndex]["y0"], images[imageIndex]["x1"], images[imageIndex]["y1"]]
 
@@ -1,4 +1,8 @@
+import sys
 from modules.predictor.predictor import Predictor
 
-predictor : Predictor = Predictor()
+role : str = sys.argv[1] if len(sys.argv) > 1 else "all"
+
+predictor : Predictor = Predictor(role)
+predictor.registerTraceSignal()
 predictor.predictLoop()
\ No newline at end of file
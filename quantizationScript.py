@@ -0,0 +1,8 @@
+import sys
+from modules.predictor.quantization import Quantization
+
+mode : str = sys.argv[1] if len(sys.argv) > 1 else Quantization().getConfig()["quantization"]["mode"]
+
+quantization : Quantization = Quantization()
+quantization.quantizeModel(mode)
+quantization.compareModels(mode)
\ No newline at end of file
@@ -0,0 +1,4 @@
+from modules.retention.retention import Retention
+
+retention : Retention = Retention()
+retention.retentionLoop()
\ No newline at end of file